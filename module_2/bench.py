@@ -0,0 +1,325 @@
+# module_2/bench.py
+# Offline micro-benchmarks for the scraper's hot paths (no network needed).
+#
+#   python bench.py parse [page.html ...]   detail-page parse time per backend
+#   python bench.py gre [--check-only]      GRE extraction records/s vs the old regex chain
+#   python bench.py decode [file]           JSON decode time: stdlib vs orjson / msgspec
+#   python bench.py compress [file]         JSONL size and read/write MB/s: plain vs .gz / .zst
+#   python bench.py clean [file]            clean.py rows/s: serial vs --workers 2..N
+
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from os import cpu_count
+
+from bs4 import BeautifulSoup
+
+import clean
+import scrape
+import jsonl_io
+
+HERE = Path(__file__).resolve().parent
+# a real detail page, the same page with repeated 'Added on' pairs, and a
+# list page (no dt/dd pairs, so it takes the page-text fallback)
+FIXTURE_PAGES = [HERE / "fixtures" / name for name in
+                 ("detail_page.html", "detail_page_added_on.html", "list_page.html")]
+GRE_CORPUS = HERE / "fixtures" / "gre_notes.jsonl"
+APPLICANT_DATA = HERE / "llm_extend_applicant_data.json"
+
+# the fields module_5's load_data.build_payload() reads
+APPLICANT_FIELDS = ("program", "comments", "date_added", "url", "status", "term",
+                    "US/International", "GPA", "GRE", "GRE V", "GRE AW", "Degree",
+                    "llm-generated-program", "llm-generated-university")
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _per_call(fn, items, rounds: int = 5, min_time: float = 0.2) -> float:
+    """Best-of-`rounds` seconds per item for fn(item) over `items`."""
+    loops = 1
+    while True:  # grow the loop count until one round takes min_time
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            for it in items:
+                fn(it)
+        if time.perf_counter() - t0 >= min_time:
+            break
+        loops *= 2
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            for it in items:
+                fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best / (loops * len(items))
+
+# ---------------------------------------------------------------------------
+# parse: detail-page extraction
+# ---------------------------------------------------------------------------
+
+def _legacy_parse(html: str):
+    """The original path: html.parser soup, an 'Added on' walk, then a dt/dd walk."""
+    dsoup = BeautifulSoup(html, "html.parser")
+    added = None
+    for dt in dsoup.find_all("dt"):
+        label = (dt.get_text(" ", strip=True) or "").strip().lower().rstrip(":")
+        if label == "added on":
+            dd = dt.find_next_sibling("dd")
+            if dd and dd.get_text(" ", strip=True):
+                added = dd.get_text(" ", strip=True)
+                break
+    if added is None:
+        text = dsoup.get_text(" ", strip=True)
+        m = re.search(r"\bAdded on\s+([A-Za-z]+\s+\d{1,2},\s*\d{4})\b", text, flags=re.I)
+        added = m.group(1) if m else None
+    data = {}
+    for dt in dsoup.find_all("dt"):
+        dd = dt.find_next_sibling("dd")
+        if not dd:
+            continue
+        label = scrape._norm_label(scrape._text(dt) or "")
+        value = scrape._text(dd)
+        if label and value is not None:
+            data[label] = value
+    if "added on" in data:
+        data["added on"] = added  # what the record was dated by: the first one, above
+    return added, data
+
+def _new_parse(backend: str):
+    def run(html: str):
+        pairs, page_text = scrape.extract_detail(html, backend)
+        return scrape.find_added_on_detail(pairs, page_text), pairs
+    return run
+
+def bench_parse(args) -> None:
+    paths = [Path(p) for p in args.pages] or FIXTURE_PAGES
+    pages = [p.read_text(encoding="utf-8", errors="replace") for p in paths]
+    print(f"{len(pages)} fixture page(s), {sum(map(len, pages)) / len(pages) / 1024:.1f} KiB avg")
+
+    expected = [_legacy_parse(h) for h in pages]
+    base = _per_call(_legacy_parse, pages)
+    print(f"{'legacy (html.parser, 2 walks)':32s} {base * 1e3:8.3f} ms/page")
+    for backend in scrape.available_backends():
+        fn = _new_parse(backend)
+        same = all(fn(h) == exp for h, exp in zip(pages, expected))
+        t = _per_call(fn, pages)
+        print(f"{backend + ' (1 walk)':32s} {t * 1e3:8.3f} ms/page  "
+              f"{base / t:5.1f}x  {'same output' if same else 'OUTPUT DIFFERS'}")
+
+# ---------------------------------------------------------------------------
+# gre: GRE score extraction
+# ---------------------------------------------------------------------------
+
+def _legacy_extract_gre(raw_text: str):
+    """The original extract_gre(): up to nine separate re.search calls."""
+    if not raw_text:
+        return (None, None, None)
+    t = " ".join(raw_text.split())
+    qm = re.search(r'\bQ\s*[:=]?\s*(\d{2,3})\b', t, flags=re.I)
+    vm = re.search(r'\bV\s*[:=]?\s*(\d{2,3})\b', t, flags=re.I)
+    awm = re.search(r'\b(?:AW|A\.?W\.?|W(?:riting)?)\s*[:=]?\s*([0-6](?:\.\d)?)\b', t, flags=re.I)
+    q = scrape._to_float(qm.group(1)) if qm else None
+    v = scrape._to_float(vm.group(1)) if vm else None
+    aw = scrape._to_float(awm.group(1)) if awm else None
+    if q or v or aw:
+        return (q, v, aw)
+    m = re.search(r'\(Q/V/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)', t, flags=re.I)
+    if m:
+        return (scrape._to_float(m.group(1)), scrape._to_float(m.group(2)), scrape._to_float(m.group(3)))
+    m = re.search(r'\(V/Q/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)', t, flags=re.I)
+    if m:
+        return (scrape._to_float(m.group(2)), scrape._to_float(m.group(1)), scrape._to_float(m.group(3)))
+    qm = re.search(r'(\d{2,3})\s*Q\b', t, flags=re.I)
+    vm = re.search(r'(\d{2,3})\s*V\b', t, flags=re.I)
+    awm = re.search(r'([0-6](?:\.\d)?)\s*(?:AW|W)\b', t, flags=re.I)
+    if qm or vm or awm:
+        return (scrape._to_float(qm.group(1)) if qm else None,
+                scrape._to_float(vm.group(1)) if vm else None,
+                scrape._to_float(awm.group(1)) if awm else None)
+    return (None, None, None)
+
+def load_gre_corpus(path: Path = GRE_CORPUS) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def bench_gre(args) -> int:
+    corpus = load_gre_corpus(Path(args.corpus))
+    texts = [c["text"] for c in corpus]
+    expected = [tuple(c["expected"]) for c in corpus]
+    with_scores = sum(1 for e in expected if e != (None, None, None))
+    print(f"{len(texts)} note strings ({with_scores} with GRE scores) from {args.corpus}")
+
+    bad = [(t, e, got) for t, e, got in zip(texts, expected, map(scrape.extract_gre, texts)) if got != e]
+    bad += [(t, e, got) for t, e, got in zip(texts, expected, scrape.extract_gre_batch(texts)) if got != e]
+    for t, e, got in bad[:10]:
+        print(f"  MISMATCH {t[:60]!r}: expected {e}, got {got}")
+    print("all outputs match the corpus" if not bad else f"{len(bad)} mismatches")
+    if args.check_only:
+        return 1 if bad else 0
+
+    base = _per_call(_legacy_extract_gre, texts)
+    print(f"{'legacy (9 x re.search)':24s} {1 / base:12,.0f} records/s")
+    new = _per_call(scrape.extract_gre, texts)
+    print(f"{'extract_gre (1 scan)':24s} {1 / new:12,.0f} records/s  {base / new:5.1f}x")
+    batch = _per_call(lambda chunk: scrape.extract_gre_batch(chunk), [texts]) / len(texts)
+    print(f"{'extract_gre_batch':24s} {1 / batch:12,.0f} records/s  {base / batch:5.1f}x")
+    return 1 if bad else 0
+
+# ---------------------------------------------------------------------------
+# decode: JSON / JSONL decoding of applicant records
+# ---------------------------------------------------------------------------
+
+def _decoders() -> dict:
+    """name -> fn(bytes) for the stdlib and whichever fast decoders are installed."""
+    found = {"json (stdlib)": json.loads}
+    try:
+        import orjson
+        found["orjson"] = orjson.loads
+    except ImportError:
+        print("orjson not installed (pip install orjson)")
+    try:
+        import msgspec
+        from typing import Any, TypedDict
+        record = TypedDict("ApplicantRecord", {f: Any for f in APPLICANT_FIELDS}, total=False)
+        found["msgspec (typed)"] = msgspec.json.Decoder(record).decode
+    except ImportError:
+        print("msgspec not installed (pip install msgspec)")
+    return found
+
+def _project(rec: dict) -> dict:
+    return {f: rec[f] for f in APPLICANT_FIELDS if f in rec}
+
+def bench_decode(args) -> int:
+    raw = Path(args.file).read_bytes()
+    is_array = raw.lstrip().startswith(b"[")
+    lines = [] if is_array else [ln for ln in raw.splitlines() if ln.strip()]
+    print(f"{args.file}: {len(raw) / 1e6:.1f} MB, "
+          f"{'JSON array' if is_array else f'{len(lines)} JSONL lines'}")
+
+    expected = None
+    base = None
+    for name, decode in _decoders().items():
+        if is_array:
+            if name.startswith("msgspec"):
+                continue  # the typed decoder is per record
+            rows = decode(raw)
+            t = _per_call(decode, [raw], rounds=3)
+        else:
+            rows = [decode(ln) for ln in lines]
+            t = _per_call(decode, lines, rounds=3) * len(lines)
+        same = expected is None or [_project(r) for r in rows] == expected
+        expected = expected or [_project(r) for r in rows]
+        base = base or t
+        print(f"{name:18s} {t * 1e3:9.1f} ms/file  {len(rows) / t:12,.0f} records/s  "
+              f"{base / t:5.1f}x  {'same fields' if same else 'OUTPUT DIFFERS'}")
+    return 0
+
+# ---------------------------------------------------------------------------
+# compress: compressed JSONL output / input
+# ---------------------------------------------------------------------------
+
+def _codecs() -> list[tuple[str, str, int | None]]:
+    """(label, suffix, level) for plain text and every installed codec."""
+    found = [("plain", ".jsonl", None)]
+    found += [(f"gzip -{lvl}", ".jsonl.gz", lvl) for lvl in (1, jsonl_io.GZIP_LEVEL, 9)]
+    if jsonl_io.zstandard is None:
+        print("zstandard not installed (pip install zstandard)")
+    else:
+        found += [(f"zstd -{lvl}", ".jsonl.zst", lvl) for lvl in (1, jsonl_io.ZSTD_LEVEL, 9)]
+    return found
+
+def bench_compress(args) -> int:
+    with open(args.file, "r", encoding="utf-8") as f:
+        lines = [ln if ln.endswith("\n") else ln + "\n" for ln in f if ln.strip()]
+    raw_mb = sum(len(ln.encode("utf-8")) for ln in lines) / 1e6
+    print(f"{args.file}: {len(lines)} lines, {raw_mb:.1f} MB; "
+          f"flush every {args.flush_every} lines (scraper checkpoint cadence)")
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_compress_"))
+    try:
+        for label, suffix, level in _codecs():
+            path = tmp / f"out{suffix}"
+            path.unlink(missing_ok=True)
+            t0 = time.perf_counter()
+            for start in range(0, len(lines), args.append_every):  # one open per scraper run
+                with jsonl_io.open_jsonl(path, "a", level=level) as f:
+                    for i, ln in enumerate(lines[start:start + args.append_every], 1):
+                        f.write(ln)
+                        if i % args.flush_every == 0:
+                            f.flush()
+            write_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            with jsonl_io.open_jsonl(path) as f:
+                same = sum(1 for _ in f) == len(lines)
+            read_s = time.perf_counter() - t0
+            size = path.stat().st_size / 1e6
+            print(f"{label:9s} {size:8.2f} MB  {raw_mb / size:5.1f}x smaller  "
+                  f"write {raw_mb / write_s:7.1f} MB/s  read {raw_mb / read_s:7.1f} MB/s  "
+                  f"{len(lines) / read_s:10,.0f} lines/s  {'ok' if same else 'LINE COUNT DIFFERS'}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+# ---------------------------------------------------------------------------
+# clean: clean.py throughput vs worker processes
+# ---------------------------------------------------------------------------
+
+def bench_clean(args) -> int:
+    with open(args.file, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        f.seek(0)
+        rows = json.load(f) if head == "[" else [json.loads(ln) for ln in f if ln.strip()]
+    rows = (rows * (args.rows // max(len(rows), 1) + 1))[:args.rows]
+    cores = cpu_count() or 1
+    print(f"{len(rows)} rows from {args.file}; {cores} CPU core(s), {clean.BATCH_ROWS}-row batches")
+
+    t0 = time.perf_counter()
+    expected = b"".join(blob for _, blob, _ in clean.clean_batches(((r, 0) for r in rows), 1))
+    base = time.perf_counter() - t0
+    print(f"{'serial':12s} {len(rows) / base:10,.0f} rows/s")
+    for workers in sorted({2, 4, cores, *args.workers} - {0, 1}):
+        t0 = time.perf_counter()
+        got = b"".join(blob for _, blob, _ in clean.clean_batches(((r, 0) for r in rows), workers))
+        t = time.perf_counter() - t0
+        print(f"{f'{workers} worker(s)':12s} {len(rows) / t:10,.0f} rows/s  {base / t:5.2f}x  "
+              f"{'same output' if got == expected else 'OUTPUT DIFFERS'}")
+    return 0
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraper micro-benchmarks.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_parse = sub.add_parser("parse", help="Detail-page parse time per backend")
+    p_parse.add_argument("pages", nargs="*", help="Saved pages (default: the fixtures/*.html pages)")
+    p_parse.set_defaults(func=bench_parse)
+    p_gre = sub.add_parser("gre", help="GRE extraction records/s vs the old regex chain")
+    p_gre.add_argument("--corpus", default=str(GRE_CORPUS), help="JSONL of {text, expected} note strings")
+    p_gre.add_argument("--check-only", action="store_true", help="Only verify outputs against the corpus")
+    p_gre.set_defaults(func=bench_gre)
+    p_dec = sub.add_parser("decode", help="JSON decode time: stdlib vs orjson / msgspec")
+    p_dec.add_argument("file", nargs="?", default=str(APPLICANT_DATA),
+                       help="JSON array or JSONL of applicant records")
+    p_dec.set_defaults(func=bench_decode)
+    p_cmp = sub.add_parser("compress", help="JSONL size and read/write MB/s: plain vs .gz / .zst")
+    p_cmp.add_argument("file", nargs="?", default=str(APPLICANT_DATA), help="JSONL of applicant records")
+    p_cmp.add_argument("--flush-every", type=int, default=50, help="Lines between flushes")
+    p_cmp.add_argument("--append-every", type=int, default=5000, help="Lines per append session")
+    p_cmp.set_defaults(func=bench_compress)
+    p_cln = sub.add_parser("clean", help="clean.py rows/s: serial vs --workers 2..N")
+    p_cln.add_argument("file", nargs="?", default=str(APPLICANT_DATA), help="JSON array or JSONL of raw rows")
+    p_cln.add_argument("--rows", type=int, default=100_000, help="Rows to clean (input is repeated to reach it)")
+    p_cln.add_argument("--workers", type=int, nargs="*", default=[], help="Extra worker counts to try")
+    p_cln.set_defaults(func=bench_clean)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
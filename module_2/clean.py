@@ -1,9 +1,18 @@
 import json
 import os
 import re
+import sys
+import codecs
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 IN_PATH = "applicant_data.json"      # input from scrape.py (JSON array)
 OUT_PATH = "applicant_data_clean.json"     # new cleaned data (JSON array)
+STREAM_OUT_PATH = "applicant_data_clean.jsonl"  # --stream output (JSONL)
+READ_BYTES = 1 << 20                 # --stream reads the input 1 MiB at a time
+BATCH_ROWS = 2000                    # rows per batch handed to a --workers process
 
 # regex helpers
 TAG_RE = re.compile(r"<[^>]+>")      # remove any leftover HTML tags
@@ -33,42 +42,45 @@ def load_data(path: str = IN_PATH):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def clean_data(rows):
+def clean_record(r):
     """
-    Light normalization:
+    Light normalization of one row:
     - strip HTML + extra spaces
     - normalize empties to None
     - leave `program` untouched (LLM will split later)
     - extract acceptance/rejection date from `status` if present
     """
-    out = []
+    rec = {}
+    for k in FIELDS:
+        rec[k] = _clean_text(r.get(k))
 
-    cleaned_files = len(rows)
-    for i, r in enumerate(rows, 1):
-        rec = {}
-        for k in FIELDS:
-            rec[k] = _clean_text(r.get(k))
+    status = rec.get("status") or ""
+    status_l = status.lower()
 
-        status = rec.get("status") or ""
-        status_l = status.lower()
+    acceptance_date = None
+    rejection_date  = None
 
-        acceptance_date = None
-        rejection_date  = None
+    m = DATE_FROM_STATUS_RE_NUM.search(status) or DATE_FROM_STATUS_RE_TEXT.search(status)
 
-        m = DATE_FROM_STATUS_RE_NUM.search(status) or DATE_FROM_STATUS_RE_TEXT.search(status)
+    if "accepted" in status_l and m:
+        acceptance_date = m.group(1)
+    elif "rejected" in status_l and m:
+        rejection_date = m.group(1)
 
-        if "accepted" in status_l and m:
-            acceptance_date = m.group(1)
-        elif "rejected" in status_l and m:
-            rejection_date = m.group(1)
+    rec["acceptance_date"] = acceptance_date
+    rec["rejection_date"]  = rejection_date
+    return rec
 
-        rec["acceptance_date"] = acceptance_date
-        rec["rejection_date"]  = rejection_date
+def clean_data(rows):
+    """Clean every row of an in-memory list (see clean_record)."""
+    out = []
 
+    cleaned_files = len(rows)
+    for i, r in enumerate(rows, 1):
         if i % 500 == 0 or i ==1 or i == cleaned_files:
             print(f"Total cleaned files = {i/cleaned_files:0.1%}.")
 
-        out.append(rec)
+        out.append(clean_record(r))
         
     return out
 
@@ -76,13 +88,194 @@ def save_data(rows, path: str = OUT_PATH):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(rows, f, ensure_ascii=False, indent=2)
 
-def main():
-    rows = load_data()
-    cleaned = clean_data(rows)
-    save_data(cleaned)
-    print(f"Wrote {len(cleaned)} rows → {OUT_PATH}")
+# ---------------------------------------------------------------------------
+# Streaming mode: constant memory, JSONL out
+# ---------------------------------------------------------------------------
+
+def _iter_array(f):
+    """
+    Yield (row, bytes read) from a binary file holding a JSON array, decoding
+    one element at a time with raw_decode over a small rolling text buffer.
+    """
+    decode = json.JSONDecoder().raw_decode
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, done, eof = "", 0, 0, False
+    started = False
+
+    def more():
+        nonlocal buf, pos, done, eof
+        chunk = f.read(READ_BYTES)
+        done += len(chunk)
+        eof = not chunk
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+
+    while True:
+        # skip whitespace / separators (and the opening bracket once)
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ",")):
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            more()
+        if not started:
+            if buf[pos:pos + 1] != "[":
+                raise ValueError("expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if pos >= len(buf):
+            raise ValueError("unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        try:
+            row, end = decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more()  # element runs past the buffer: read on and retry
+            continue
+        if end == len(buf) and not eof:
+            more()  # a number could still continue in the next chunk
+            continue
+        pos = end
+        yield row, done
+
+def _iter_jsonl(f):
+    """Yield (row, bytes read) from a binary JSONL file; blank lines skipped."""
+    done = 0
+    for line in f:
+        done += len(line)
+        if line.strip():
+            yield json.loads(line), done
+
+def iter_rows(f):
+    """Yield (row, bytes read) from a binary file holding a JSON array or JSONL."""
+    first = f.read(1)
+    while first.isspace():
+        first = f.read(1)
+    f.seek(0)
+    if first == b"[":
+        return _iter_array(f)
+    return _iter_jsonl(f)
+
+# ---------------------------------------------------------------------------
+# --workers: batches cleaned in a process pool
+# ---------------------------------------------------------------------------
+
+def clean_batch(rows, indent=None):
+    """
+    Clean a batch of rows into (row count, UTF-8 bytes). One flat buffer
+    pickles back from a worker far cheaper than a list of dicts, and is
+    written out as-is: JSONL lines by default, or with `indent` the batch's
+    elements of save_data()'s indented array, joined by ",\n".
+    """
+    recs = [clean_record(r) for r in rows]
+    if indent is None:
+        text = "".join(json.dumps(rec, ensure_ascii=False) + "\n" for rec in recs)
+    else:
+        # json.dumps escapes newlines inside strings, so each "\n" is layout
+        pad = " " * indent
+        text = ",\n".join(pad + json.dumps(rec, ensure_ascii=False, indent=indent).replace("\n", "\n" + pad)
+                          for rec in recs)
+    return len(recs), text.encode("utf-8")
+
+def _chunks(pairs, size: int):
+    """Group (row, bytes read) pairs into ([rows], bytes read after the last)."""
+    pairs = iter(pairs)
+    while True:
+        chunk = list(islice(pairs, size))
+        if not chunk:
+            return
+        yield [row for row, _ in chunk], chunk[-1][1]
+
+def clean_batches(pairs, workers: int = 1, batch_rows: int | None = None, indent=None):
+    """
+    Yield (row count, bytes, bytes read) per batch, in input order (see
+    clean_batch for `indent`). With workers > 1 the batches are cleaned in
+    a process pool with 2 x workers of them in flight, so input is only
+    read as fast as the pool keeps up and memory stays bounded.
+    """
+    chunks = _chunks(pairs, batch_rows or BATCH_ROWS)
+    if workers <= 1:
+        for rows, done in chunks:
+            yield (*clean_batch(rows, indent), done)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque((pool.submit(clean_batch, rows, indent), done)
+                        for rows, done in islice(chunks, 2 * workers))
+        while pending:
+            future, done = pending.popleft()
+            for rows, next_done in islice(chunks, 1):
+                pending.append((pool.submit(clean_batch, rows, indent), next_done))
+            yield (*future.result(), done)
+
+def save_data_parallel(rows, workers: int, path: str = OUT_PATH) -> int:
+    """
+    clean_data() + save_data() for an in-memory list, cleaned in `workers`
+    processes. The batches come back already formatted, so they are written
+    straight out: the file matches the serial one byte for byte.
+    """
+    n = 0
+    with open(path, "wb") as f:
+        f.write(b"[")
+        for count, blob, _ in clean_batches(((r, 0) for r in rows), workers, indent=2):
+            f.write((b",\n" if n else b"\n") + blob)
+            n += count
+        f.write(b"\n]" if n else b"]")
+    print(f"Total cleaned files = {n} rows with {workers} workers.")
+    return n
+
+def stream_clean(in_path: str = IN_PATH, out_path: str = STREAM_OUT_PATH, progress: bool = True,
+                 workers: int = 1) -> int:
+    """
+    Clean `in_path` (JSON array or JSONL) into `out_path` as JSONL, a batch
+    of rows at a time, so memory stays flat whatever the input size.
+    Progress is reported every 5% of input bytes.
+    """
+    if not os.path.exists(in_path):
+        raise FileNotFoundError(f"Input not found: {in_path}")
+    total = os.path.getsize(in_path) or 1
+    n, next_report = 0, 0.0
+    with open(in_path, "rb") as f_in, open(out_path, "wb") as f_out:
+        for count, blob, done in clean_batches(iter_rows(f_in), workers):
+            f_out.write(blob)
+            n += count
+            if progress and done / total >= next_report:
+                print(f"Cleaned {n} rows, {done / total:0.1%} of {total / 1e6:.1f} MB read.")
+                next_report = done / total + 0.05
+    if progress:
+        print(f"Cleaned {n} rows, 100.0% of {total / 1e6:.1f} MB read.")
+    return n
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Light cleaning of scraped applicant rows.")
+    parser.add_argument("--in", dest="in_path", default=IN_PATH, help="JSON array (or JSONL with --stream)")
+    parser.add_argument("--out", dest="out_path", default=None,
+                        help=f"Output path (default: {OUT_PATH}, or {STREAM_OUT_PATH} with --stream)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Constant memory: read incrementally and write JSONL as rows are cleaned")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"Clean {BATCH_ROWS}-row batches in N processes (output order is kept)")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        out_path = args.out_path or STREAM_OUT_PATH
+        n = stream_clean(args.in_path, out_path, workers=args.workers)
+        print(f"Wrote {n} rows → {out_path}")
+        return 0
+    out_path = args.out_path or OUT_PATH
+    rows = load_data(args.in_path)
+    if args.workers > 1:
+        n = save_data_parallel(rows, args.workers, out_path)
+    else:
+        cleaned = clean_data(rows)
+        save_data(cleaned, out_path)
+        n = len(cleaned)
+    print(f"Wrote {n} rows → {out_path}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
 
@@ -0,0 +1,142 @@
+# module_2/compact.py
+# Compacts the scrape archive: one line per URL (the newest, i.e. the last one
+# appended), sorted by GradCafe result ID, written atomically over the original.
+#
+# Memory stays bounded: lines are read in chunks of --chunk-lines, each chunk
+# is sorted and spilled to a run file, and the runs are k-way merged
+# (heapq.merge) straight into the output. Run lines start with a sort key
+#   "<result id, 15 digits> <url>\t<15-digit reverse sequence>\t<json line>"
+# so plain string order is (ID, URL, newest first) and duplicates are adjacent.
+# Lines without a URL (or that don't parse) can't be deduplicated; they are
+# kept, after the sorted records, in their original order.
+#
+#   python compact.py [archive.jsonl] [--chunk-lines N] [--index]
+
+import os
+import sys
+import json
+import time
+import heapq
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+from jsonl_io import compression, open_jsonl
+from jsonl_index import index_path_for, update_index
+from scrape import JSONL_PATH_DEFAULT, result_id
+
+CHUNK_LINES = 100_000
+SEQ_MAX = 10 ** 15 - 1
+
+def _sort_key(line: str, seq: int) -> str:
+    try:
+        url = json.loads(line).get("url")
+    except (ValueError, AttributeError):
+        url = None
+    if not url:
+        return f"~~{seq:015d}"  # after every result ID, in file order
+    rid = result_id(url)
+    return f"{rid:015d} {url}" if rid is not None else f"~ {url}"
+
+def _spill(chunk: list[str], tmp_dir: Path, runs: list[Path]) -> None:
+    chunk.sort()
+    run = tmp_dir / f"run{len(runs):05d}.txt"
+    with open(run, "w", encoding="utf-8") as f:
+        f.writelines(chunk)
+    runs.append(run)
+    chunk.clear()
+
+def _sorted_runs(archive: Path, tmp_dir: Path, chunk_lines: int, stats: dict) -> list[Path]:
+    """Pass 1: split the archive into sorted run files."""
+    runs: list[Path] = []
+    chunk: list[str] = []
+    with open_jsonl(archive) as f:
+        for seq, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            stats["lines"] += 1
+            chunk.append(f"{_sort_key(line, seq)}\t{SEQ_MAX - seq:015d}\t{line}\n")
+            if len(chunk) >= chunk_lines:
+                _spill(chunk, tmp_dir, runs)
+    if chunk:
+        _spill(chunk, tmp_dir, runs)
+    return runs
+
+def _merge(runs: list[Path], out, stats: dict) -> None:
+    """Pass 2: k-way merge the runs, writing the first (newest) line per key."""
+    files = [open(run, "r", encoding="utf-8") for run in runs]
+    try:
+        last_key = None
+        for merged in heapq.merge(*files):
+            key, _, line = merged.split("\t", 2)
+            if key == last_key:
+                stats["duplicates"] += 1
+                continue
+            last_key = key
+            out.write(line)
+            stats["written"] += 1
+    finally:
+        for f in files:
+            f.close()
+
+def compact(archive, *, chunk_lines: int = CHUNK_LINES, index: bool = False) -> dict:
+    """Deduplicate and sort `archive` in place; returns counts for the summary.
+
+    The archive is replaced with os.replace, so readers see either the old or
+    the new file. If it grew while we were compacting (a scraper run), the
+    result is discarded and RuntimeError raised; just run it again.
+    """
+    archive = Path(archive)
+    if not archive.exists():
+        raise FileNotFoundError(f"Input not found: {archive}")
+    before = archive.stat()
+    stats = {"lines": 0, "duplicates": 0, "written": 0, "runs": 0,
+             "bytes_before": before.st_size, "bytes_after": 0}
+    tmp_dir = Path(tempfile.mkdtemp(prefix="compact_", dir=archive.parent))
+    try:
+        runs = _sorted_runs(archive, tmp_dir, chunk_lines, stats)
+        stats["runs"] = len(runs)
+        out_path = tmp_dir / ("compacted" + "".join(archive.suffixes))
+        with open_jsonl(out_path, "w") as out:
+            _merge(runs, out, stats)
+        with open(out_path, "rb+") as f:
+            os.fsync(f.fileno())
+        now = archive.stat()
+        if (now.st_size, now.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            raise RuntimeError(f"{archive} changed during compaction; nothing replaced, run it again")
+        stats["bytes_after"] = out_path.stat().st_size
+        os.replace(out_path, archive)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # the inode changed, so this re-indexes from scratch
+    if not compression(archive) and (index or index_path_for(archive).exists()):
+        update_index(archive)
+        stats["indexed"] = True
+    return stats
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Deduplicate (newest wins) and sort the JSONL archive by result ID.")
+    parser.add_argument("archive", nargs="?", default=str(JSONL_PATH_DEFAULT), help="JSONL archive (.gz / .zst ok)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES,
+                        help="Lines sorted in memory per run file (bounds memory use)")
+    parser.add_argument("--index", action="store_true",
+                        help="Build the jsonl_index.py sidecar even if there isn't one yet")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        stats = compact(args.archive, chunk_lines=max(1, args.chunk_lines), index=args.index)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"{stats['lines']} lines -> {stats['written']} ({stats['duplicates']} duplicate URLs dropped) "
+          f"via {stats['runs']} sorted run(s) in {time.perf_counter() - t0:.1f}s")
+    print(f"{stats['bytes_before'] / 1e6:.2f} MB -> {stats['bytes_after'] / 1e6:.2f} MB"
+          + ("; line index rebuilt" if stats.get("indexed") else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# module_2/jsonl_index.py
+# Line-offset sidecar index for the applicant JSONL archive.
+#
+# <archive>.idx holds, after a fixed header,
+#   - a URL hash table: open-addressed (hash64, byte offset) pairs, and
+#   - the byte offset of every record line, as a raw array('q').
+# The file is memory-mapped, so record N and the record for a URL are found
+# without reading the archive from the start. Appends are indexed in place:
+# new offsets go on the end of the file and new URLs into free table slots;
+# the table is only rewritten (doubled) when it gets too full. A rewritten or
+# truncated archive (different inode, shorter, or a changed tail) is
+# re-indexed from scratch.
+#
+#   python jsonl_index.py build llm_extend_applicant_data.jsonl
+#   python jsonl_index.py get   llm_extend_applicant_data.jsonl https://.../result/123456
+#   python jsonl_index.py line  llm_extend_applicant_data.jsonl 1000
+#   python jsonl_index.py ranges llm_extend_applicant_data.jsonl 4
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from jsonl_io import compression
+
+# magic, lines, indexed bytes, table slots, urls, st_dev, st_ino, tail digest
+HEADER = struct.Struct("<8sqqqqQQ16s")
+MAGIC = b"JSONLIX1"
+SLOT = struct.Struct("<qq")   # (url hash, byte offset); offset -1 = empty
+MIN_SLOTS = 1024
+MAX_LOAD = 0.6                # rewrite the table with twice the slots beyond this
+TAIL_WINDOW = 4096            # bytes before the indexed end hashed to spot rewrites
+
+def index_path_for(archive) -> Path:
+    archive = Path(archive)
+    return archive.with_name(archive.name + ".idx")
+
+def url_hash(url: str) -> int:
+    """Stable signed 64-bit hash (str hash() is salted per process)."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+def _tail_digest(f, end: int) -> bytes:
+    start = max(0, end - TAIL_WINDOW)
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=16).digest()
+
+def _scan(f, start: int):
+    """Index complete lines from `start`: (offsets, [(hash, offset)], end offset).
+
+    A last line without a newline is left for the next update, as it may
+    still be being written.
+    """
+    offsets, urls = array("q"), []
+    pos = start
+    f.seek(start)
+    for line in f:
+        if not line.endswith(b"\n"):
+            break
+        if line.strip():
+            offsets.append(pos)
+            try:
+                url = json.loads(line).get("url")
+            except (ValueError, AttributeError):
+                url = None
+            if url:
+                urls.append((url_hash(url), pos))
+        pos += len(line)
+    return offsets, urls, pos
+
+def _table_size(n: int) -> int:
+    """Slots for `n` distinct URL hashes at no more than MAX_LOAD."""
+    slots = MIN_SLOTS
+    while n > slots * MAX_LOAD:
+        slots *= 2
+    return slots
+
+def _put(table, slots: int, h: int, offset: int) -> bool:
+    """Insert into a (hash, offset) table; True if the URL was new.
+
+    A URL that is already present points at its newest line. Equal 64-bit
+    hashes are taken as the same URL; get() re-checks the record's url.
+    """
+    i = h & (slots - 1)
+    while True:
+        if table[2 * i + 1] == -1 or table[2 * i] == h:
+            new = table[2 * i + 1] == -1
+            table[2 * i], table[2 * i + 1] = h, offset
+            return new
+        i = (i + 1) & (slots - 1)
+
+# ---------------------------------------------------------------------------
+# Building / updating the sidecar
+# ---------------------------------------------------------------------------
+
+def _write_index(path: Path, st, f, offsets, pairs, end: int) -> None:
+    """Write a whole index atomically (tmp file + rename)."""
+    slots = _table_size(len({h for h, _ in pairs}))  # repeated URLs share a slot
+    table = array("q", [0, -1]) * slots
+    urls = sum(_put(table, slots, h, off) for h, off in pairs)
+    header = HEADER.pack(MAGIC, len(offsets), end, slots, urls,
+                         st.st_dev, st.st_ino, _tail_digest(f, end))
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as out:
+        out.write(header)
+        table.tofile(out)
+        offsets.tofile(out)
+    os.replace(tmp, path)
+
+def _read_header(path: Path):
+    try:
+        with open(path, "rb") as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return fields if fields[0] == MAGIC else None
+
+def update_index(archive, index_path=None) -> tuple[int, bool]:
+    """Bring the sidecar up to date with the archive: (lines added, rebuilt?)."""
+    archive = Path(archive)
+    if compression(archive):
+        raise ValueError(f"{archive.name}: byte offsets need an uncompressed archive")
+    path = Path(index_path) if index_path else index_path_for(archive)
+    with open(archive, "rb") as f:
+        st = os.fstat(f.fileno())
+        header = _read_header(path)
+        if header is not None:
+            _, lines, end, slots, urls, dev, ino, digest = header
+            if ((dev, ino) != (st.st_dev, st.st_ino) or st.st_size < end
+                    or _tail_digest(f, end) != digest):
+                header = None  # truncated or rewritten: start over
+        if header is None:
+            offsets, pairs, new_end = _scan(f, 0)
+            _write_index(path, st, f, offsets, pairs, new_end)
+            return len(offsets), True
+
+        offsets, pairs, new_end = _scan(f, end)
+        if new_end == end:
+            return 0, False
+        if urls + len({h for h, _ in pairs}) > slots * MAX_LOAD:
+            # table too full: rewrite everything, rehashing from the stored pairs
+            old = array("q")
+            with open(path, "rb") as idx:
+                idx.seek(HEADER.size)
+                old.fromfile(idx, 2 * slots)
+                all_offsets = array("q")
+                all_offsets.fromfile(idx, lines)
+            kept = [(old[2 * i], old[2 * i + 1]) for i in range(slots) if old[2 * i + 1] != -1]
+            _write_index(path, st, f, all_offsets + offsets, kept + pairs, new_end)
+            return len(offsets), False
+
+        tail = _tail_digest(f, new_end)
+    # in place: offsets first, then table slots, then the header that makes
+    # them visible -- a crash part way leaves the old header, and the next
+    # update simply redoes the same lines
+    table_bytes = HEADER.size + SLOT.size * slots
+    with open(path, "r+b") as idx:
+        idx.truncate(table_bytes + 8 * lines)
+        idx.seek(0, os.SEEK_END)
+        offsets.tofile(idx)
+        idx.flush()
+        with mmap.mmap(idx.fileno(), table_bytes) as mm:
+            table = memoryview(mm)[HEADER.size:table_bytes].cast("q")
+            urls += sum(_put(table, slots, h, off) for h, off in pairs)
+            table.release()
+            mm[:HEADER.size] = HEADER.pack(MAGIC, lines + len(offsets), new_end, slots, urls,
+                                           st.st_dev, st.st_ino, tail)
+            mm.flush()
+    return len(offsets), False
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class JsonlIndex:
+    """
+    Memory-mapped view of an archive's sidecar index.
+
+    Opening updates the sidecar first (pass refresh=False to skip that);
+    call refresh() again to pick up lines appended since.
+    """
+
+    def __init__(self, archive, index_path=None, *, refresh: bool = True):
+        self.archive = Path(archive)
+        self.path = Path(index_path) if index_path else index_path_for(self.archive)
+        self._mm = self._table = self._offsets = self._f = None
+        if refresh or not self.path.exists():
+            update_index(self.archive, self.path)
+        self._map()
+
+    def _map(self) -> None:
+        self.close()
+        _, lines, self.end, slots, self.urls, *_ = _read_header(self.path)
+        self.slots = slots
+        with open(self.path, "rb") as idx:
+            self._mm = mmap.mmap(idx.fileno(), 0, access=mmap.ACCESS_READ)
+        table_bytes = HEADER.size + SLOT.size * slots
+        with memoryview(self._mm) as view:
+            self._table = view[HEADER.size:table_bytes].cast("q")
+            self._offsets = view[table_bytes:table_bytes + 8 * lines].cast("q")
+        self._f = open(self.archive, "rb")
+
+    def refresh(self) -> int:
+        self.close()  # Windows won't resize or replace a mapped file
+        added, _ = update_index(self.archive, self.path)
+        self._map()
+        return added
+
+    def close(self) -> None:
+        for view in (self._table, self._offsets):
+            if view is not None:
+                view.release()
+        if self._mm is not None:
+            self._mm.close()
+        if self._f is not None:
+            self._f.close()
+        self._mm = self._table = self._offsets = self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def offset(self, n: int) -> int:
+        """Byte offset of record line n (0-based; negative counts from the end)."""
+        return self._offsets[n]
+
+    def _read_at(self, offset: int) -> dict:
+        self._f.seek(offset)
+        return json.loads(self._f.readline())
+
+    def line(self, n: int) -> dict:
+        return self._read_at(self._offsets[n])
+
+    def offset_of(self, url: str) -> int | None:
+        """Byte offset of the newest line for `url`, or None."""
+        h, mask = url_hash(url), self.slots - 1
+        i = h & mask
+        while self._table[2 * i + 1] != -1:
+            if self._table[2 * i] == h:
+                return self._table[2 * i + 1]
+            i = (i + 1) & mask
+        return None
+
+    def get(self, url: str) -> dict | None:
+        offset = self.offset_of(url)
+        if offset is None:
+            return None
+        record = self._read_at(offset)
+        return record if record.get("url") == url else None
+
+    def ranges(self, parts: int) -> list[tuple[int, int]]:
+        """Split the indexed bytes into <= `parts` line-aligned (start, end) ranges.
+
+        Each range can be handed to a worker process that seeks to start and
+        reads lines until end.
+        """
+        if not len(self):
+            return []
+        cuts = {self._offsets[0]}
+        for k in range(1, parts):
+            i = bisect_left(self._offsets, k * self.end // parts)
+            if i < len(self):
+                cuts.add(self._offsets[i])
+        starts = sorted(cuts)
+        return list(zip(starts, starts[1:] + [self.end]))
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Line-offset / URL index for a JSONL archive.")
+    parser.add_argument("cmd", choices=("build", "get", "line", "ranges"))
+    parser.add_argument("archive", help="Uncompressed JSONL archive")
+    parser.add_argument("arg", nargs="?", help="URL (get), line number (line) or worker count (ranges)")
+    parser.add_argument("--index", default=None, help="Sidecar path (default: <archive>.idx)")
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        added, rebuilt = update_index(args.archive, args.index)
+        with JsonlIndex(args.archive, args.index, refresh=False) as ix:
+            print(f"{'Rebuilt' if rebuilt else 'Updated'} {ix.path}: {added} new lines, "
+                  f"{len(ix)} lines, {ix.urls} URLs, {ix.end} bytes indexed")
+        sys.exit(0)
+    if args.arg is None:
+        parser.error(f"{args.cmd} needs an argument")
+    with JsonlIndex(args.archive, args.index) as ix:
+        if args.cmd == "get":
+            rec = ix.get(args.arg)
+            print(json.dumps(rec, ensure_ascii=False) if rec else f"not found: {args.arg}")
+            sys.exit(0 if rec else 1)
+        if args.cmd == "line":
+            print(json.dumps(ix.line(int(args.arg)), ensure_ascii=False))
+        else:
+            for start, end in ix.ranges(int(args.arg)):
+                print(f"{start}\t{end}")
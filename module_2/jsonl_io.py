@@ -0,0 +1,139 @@
+# module_2/jsonl_io.py
+# Open JSONL files by suffix: plain text, gzip (.gz) or zstandard (.zst).
+#
+# Compressed writers stream, and flush() ends the current gzip member / zstd
+# frame (the next write starts another), so after a flush the file is
+# complete as it stands: it can be read back while the writer keeps going,
+# and a crash after a checkpoint (flush + fsync) loses nothing before it.
+# Opening for append first trims an unterminated trailing member / frame left
+# by a crash, so the new data never lands after a torn one.
+# Readers walk every member / frame and decompress as they go; the file is
+# never materialized.
+#
+#   with open_jsonl("out.jsonl.gz", "a") as f: f.write(line)
+#   with open_jsonl("out.jsonl.zst") as f: for line in f: ...
+
+import io
+import zlib
+import gzip
+from pathlib import Path
+
+try:
+    import zstandard  # optional: pip install zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+SCAN_BYTES = 1 << 20  # append-time tail check reads the file 1 MiB at a time
+
+def compression(path) -> str | None:
+    """'gzip', 'zstd' or None (plain text), from the file suffix."""
+    return {".gz": "gzip", ".zst": "zstd"}.get(Path(path).suffix.lower())
+
+def open_jsonl(path, mode: str = "r", *, level: int | None = None):
+    """Open `path` as UTF-8 text for "r", "w" or "a", compressing by suffix."""
+    if mode not in ("r", "w", "a"):
+        raise ValueError(f"mode must be 'r', 'w' or 'a', not {mode!r}")
+    path = Path(path)
+    kind = compression(path)
+    if kind is None:
+        return open(path, mode, encoding="utf-8")
+    if kind == "gzip":
+        if mode == "r":
+            return gzip.open(path, "rt", encoding="utf-8")
+        compresslevel = GZIP_LEVEL if level is None else level
+        return _FramedWriter(_open_raw(path, kind, mode),
+                             lambda raw: gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=compresslevel))
+    if zstandard is None:
+        raise ImportError(f"{path.name}: .zst files need the zstandard package (pip install zstandard)")
+    if mode == "r":
+        raw = open(path, "rb")
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL if level is None else level)
+    return _FramedWriter(_open_raw(path, kind, mode), lambda raw: cctx.stream_writer(raw, closefd=False))
+
+class _FramedWriter:
+    """
+    Text writer over a raw file for .gz / .zst. Each flush() closes the
+    compressor, which ends the member / frame; the next write opens a new one.
+    """
+
+    def __init__(self, raw, new_stream):
+        self._raw, self._new_stream, self._text = raw, new_stream, None
+
+    def write(self, s: str) -> int:
+        if self._text is None:
+            self._text = io.TextIOWrapper(self._new_stream(self._raw), encoding="utf-8")
+        return self._text.write(s)
+
+    def flush(self) -> None:
+        if self._text is not None:
+            self._text.close()  # writes the trailer; the raw file stays open
+            self._text = None
+        self._raw.flush()
+
+    def fileno(self) -> int:
+        return self._raw.fileno()
+
+    @property
+    def closed(self) -> bool:
+        return self._raw.closed
+
+    def close(self) -> None:
+        if self._raw.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _open_raw(path: Path, kind: str, mode: str):
+    """Binary handle for writing; "a" first drops an unterminated trailing member / frame."""
+    if mode == "w" or not path.exists():
+        return open(path, "wb")
+    raw = open(path, "r+b")
+    try:
+        end = _complete_length(raw, kind)
+        if end < raw.seek(0, io.SEEK_END):
+            raw.truncate(end)
+        raw.seek(end)
+    except BaseException:
+        raw.close()
+        raise
+    return raw
+
+def _complete_length(f, kind: str) -> int:
+    """
+    Bytes of `f` made of complete gzip members / zstd frames. A torn tail (a
+    crash mid-member) is a valid prefix, so the decoder just runs out of
+    input; anything it rejects outright is real corruption, and is raised
+    rather than truncated away.
+    """
+    if kind == "gzip":
+        new_decoder, error = (lambda: zlib.decompressobj(wbits=31)), zlib.error
+    else:
+        new_decoder, error = zstandard.ZstdDecompressor().decompressobj, zstandard.ZstdError
+    f.seek(0)
+    end = offset = 0
+    decoder = new_decoder()
+    while chunk := f.read(SCAN_BYTES):
+        offset += len(chunk)
+        while chunk:
+            try:
+                decoder.decompress(chunk)
+            except error as e:
+                raise ValueError(f"{Path(f.name).name}: corrupt {kind} data after byte {end}: {e}") from e
+            if not decoder.eof:
+                break
+            chunk = decoder.unused_data
+            end = offset - len(chunk)
+            decoder = new_decoder()
+    return end
@@ -0,0 +1,227 @@
+# module_2/replay.py
+# Offline record/replay harness for benchmarking scrape.py.
+#
+#   python scrape.py --record run.warc.gz ...          record a real run
+#   python replay.py serve run.warc.gz --port 8765     serve it locally
+#   python scrape.py --base-url http://127.0.0.1:8765 --since 2000-01-01
+#   python replay.py bench run.warc.gz --concurrency 4 --latency-ms 80
+#
+# The archive is WARC-like: one gzip member per record, each a WARC/1.0
+# "response" record whose block is the raw HTTP status line, headers and
+# (already decoded) body.
+
+import gzip
+import time
+import uuid
+import random
+import argparse
+import tempfile
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import urllib.parse as up
+
+import scrape
+
+# headers that describe the wire encoding, not the (decoded) body we store
+_HOP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+# ---------------------------------------------------------------------------
+# Archive format
+# ---------------------------------------------------------------------------
+
+def _warc_record(url: str, status: int, headers, body: bytes) -> bytes:
+    lines = [f"HTTP/1.1 {status} {'OK' if status == 200 else 'Status'}"]
+    for k, v in headers.items():
+        if k.lower() not in _HOP_HEADERS:
+            lines.append(f"{k}: {v}")
+    lines.append(f"Content-Length: {len(body)}")
+    block = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace") + body
+    head = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        "Content-Type: application/http; msgtype=response\r\n"
+        f"Content-Length: {len(block)}\r\n\r\n"
+    ).encode("ascii")
+    return head + block + b"\r\n\r\n"
+
+def read_archive(path: Path):
+    """Yield (url, status, headers, body) for every response record in the archive.
+
+    headers leave out the length/encoding/connection ones; body is decoded.
+    """
+    with gzip.open(path, "rb") as f:  # gzip reads concatenated members as one stream
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.startswith(b"WARC/"):
+                continue
+            warc = {}
+            for raw in iter(f.readline, b"\r\n"):
+                k, _, v = raw.decode("utf-8").partition(":")
+                warc[k.strip().lower()] = v.strip()
+            block = f.read(int(warc["content-length"]))
+            f.read(4)  # record separator
+            if warc.get("warc-type") != "response":
+                continue
+            head, _, body = block.partition(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            # the block always carries our own Content-Length; older archives may
+            # also hold the live response's wire headers. Drop both so serving
+            # doesn't send them twice (or claim an encoding the body lacks).
+            headers = {k: v for k, v in (h.split(": ", 1) for h in header_lines if ": " in h)
+                       if k.lower() not in _HOP_HEADERS}
+            yield warc["warc-target-uri"], int(status_line.split()[1]), headers, body
+
+
+class RecordingHttp:
+    """Pass requests through to `inner` and archive every response it returns."""
+
+    def __init__(self, inner, path: Path):
+        self.inner = inner
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "ab")
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def request(self, method: str, url: str, **kw):
+        resp = self.inner.request(method, url, **kw)
+        rec = gzip.compress(_warc_record(url, resp.status, resp.headers, resp.data))
+        with self._lock:
+            self._f.write(rec)
+            self.records += 1
+        return resp
+
+    def close(self) -> None:
+        self._f.close()
+        print(f"Recorded {self.records} responses -> {self.path}")
+
+# ---------------------------------------------------------------------------
+# Replay server
+# ---------------------------------------------------------------------------
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Serve archived responses by path + query. Unknown paths get 404.
+    Each request is delayed by latency_ms (+/- jitter_ms), and error_rate
+    of them are answered with 503 + Retry-After (or 429, half the time).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, archive: Path, port: int = 0, *, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, seed: int | None = None):
+        self.responses = {}
+        for url, status, headers, body in read_archive(archive):
+            parts = up.urlsplit(url)
+            key = parts.path + (f"?{parts.query}" if parts.query else "")
+            self.responses[key] = (status, headers, body)
+        self.latency_ms, self.jitter_ms, self.error_rate = latency_ms, jitter_ms, error_rate
+        self.rng = random.Random(seed)
+        self.served = self.injected = 0
+        super().__init__(("127.0.0.1", port), _ReplayHandler)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "ReplayServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server
+        delay = srv.latency_ms + srv.rng.uniform(-srv.jitter_ms, srv.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if srv.error_rate and srv.rng.random() < srv.error_rate:
+            srv.injected += 1
+            status, headers, body = (429 if srv.rng.random() < 0.5 else 503), {"Retry-After": "1"}, b""
+        else:
+            status, headers, body = srv.responses.get(self.path, (404, {}, b"not in archive"))
+        srv.served += 1
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def _server_from(args) -> ReplayServer:
+    return ReplayServer(Path(args.archive), args.port, latency_ms=args.latency_ms,
+                        jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed)
+
+def cmd_serve(args) -> None:
+    srv = _server_from(args)
+    print(f"Serving {len(srv.responses)} archived responses at {srv.base_url} (Ctrl-C to stop)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def cmd_bench(args) -> None:
+    srv = _server_from(args).start()
+    print(f"Replaying {len(srv.responses)} responses from {srv.base_url} "
+          f"(latency {args.latency_ms} ms, error rate {args.error_rate:.0%})")
+    scrape.LIST_URL = up.urljoin(srv.base_url, "/survey/index.php")
+    if args.parser:
+        scrape.PARSER_BACKEND = args.parser
+    limiter = scrape.AimdRateLimiter(args.rps or 5.0) if args.adaptive else None
+    with tempfile.TemporaryDirectory() as tmp:
+        # keep the real last_run.txt out of it
+        scrape.STATE_FILE = Path(tmp) / "last_run.txt"
+        stats = scrape.scrape_data(since=date(2000, 1, 1), jsonl_out=Path(tmp) / "out.jsonl",
+                                   concurrency=args.concurrency, rps=args.rps, limiter=limiter,
+                                   stop_early=args.save_bandwidth,
+                                   parse_workers=args.parse_workers)
+    srv.shutdown()
+
+    elapsed = stats["elapsed"]
+    pages = stats["list_pages"] + stats["detail_pages"]
+    print(f"\n{pages} pages in {elapsed:.2f}s: {pages / elapsed:.1f} pages/s, "
+          f"{stats['appended'] / elapsed:.1f} records/s "
+          f"({srv.injected} injected errors, parser {scrape.PARSER_BACKEND}, "
+          f"concurrency {args.concurrency}, parse workers {args.parse_workers})")
+    for stage, secs in stats["timings"].items():
+        print(f"  {stage:13s} {secs:8.3f}s  {secs / elapsed:6.1%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve or benchmark a recorded scrape offline.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, func, hlp in (("serve", cmd_serve, "Serve the archive over HTTP"),
+                            ("bench", cmd_bench, "Run scrape_data() against the archive and time it")):
+        p = sub.add_parser(name, help=hlp)
+        p.add_argument("archive", help=".warc.gz written by scrape.py --record")
+        p.add_argument("--port", type=int, default=8765 if name == "serve" else 0)
+        p.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per response")
+        p.add_argument("--jitter-ms", type=float, default=0.0, help="Random +/- spread on the delay")
+        p.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 429/503")
+        p.add_argument("--seed", type=int, default=None, help="Seed for jitter / error injection")
+        p.set_defaults(func=func)
+        if name == "bench":
+            p.add_argument("--concurrency", type=int, default=1)
+            p.add_argument("--parse-workers", type=int, default=0, help="Parse processes (0 = inline)")
+            p.add_argument("--rps", type=float, default=None, help="Request budget (default unthrottled)")
+            p.add_argument("--adaptive", action="store_true", help="Use the AIMD limiter")
+            p.add_argument("--parser", choices=scrape.available_backends(), default=None)
+            p.add_argument("--save-bandwidth", action="store_true", help="Stop detail downloads after </dl>")
+
+    args = parser.parse_args()
+    args.func(args)
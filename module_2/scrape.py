@@ -2,17 +2,33 @@
 # Scrapes GradCafe entries, appends NEW rows (since the last run) to JSONL,
 # and updates last_run.txt with the latest scraped "Added on" date.
 
+import os
+import sys
 import re
 import json
+import hashlib
 import time
 import argparse
+import threading
+import shutil
+import tempfile
+import functools
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, date, timedelta
+from email.utils import parsedate_to_datetime
 import urllib.parse as up
+from array import array
+from bisect import bisect_left
 from pathlib import Path
 
 import urllib3
 from bs4 import BeautifulSoup
 
+from jsonl_io import compression, open_jsonl
+from jsonl_index import index_path_for, update_index
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -30,27 +46,420 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                   "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    # gzip/deflate, plus br when brotli is installed (urllib3 decodes them all)
+    "Accept-Encoding": urllib3.util.make_headers(accept_encoding=True)["accept-encoding"],
 }
 
 DEFAULT_BACKFILL_DAYS = 7  # if last_run.txt missing, only look back this many days
+DEFAULT_SLEEP = 0.35       # seconds between requests unless --sleep/--rps say otherwise
 
 # ---------------------------------------------------------------------------
 # HTTP + utils
 # ---------------------------------------------------------------------------
 
-def _http() -> urllib3.PoolManager:
+def _http(maxsize: int = 1, retry_throttled: bool = True) -> urllib3.PoolManager:
+    # maxsize = connections kept per host; raise it to match --concurrency so
+    # worker threads share one pool instead of opening throwaway sockets.
+    # retry_throttled=False hands 429s and 503s back to the caller (the
+    # adaptive limiter needs to see them instead of urllib3 quietly sleeping
+    # and retrying). urllib3 retries any 413/429/503 carrying Retry-After
+    # whatever status_forcelist says, so that has to be switched off too.
+    statuses = [500, 502, 504]
+    if retry_throttled:
+        statuses = [429, 500, 502, 503, 504]
     return urllib3.PoolManager(
+        maxsize=maxsize,
+        block=True,
         headers=HEADERS,
         timeout=urllib3.Timeout(connect=5.0, read=12.0),
         retries=urllib3.Retry(
             total=3, connect=2, read=2, status=2,
             backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=statuses,
+            respect_retry_after_header=retry_throttled,
             allowed_methods=frozenset(["GET"]),
             raise_on_status=False
         ),
     )
 
+def _retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+class RateLimiter:
+    """
+    Global requests-per-second budget shared by every worker thread.
+
+    Each call to wait() reserves the next free time slot (1/rps apart) and
+    sleeps until it arrives, so N threads together never exceed `rps`.
+    """
+
+    adaptive = False
+
+    def __init__(self, rps: float | None):
+        self.interval = 1.0 / rps if rps and rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self.started = time.monotonic()
+        self.requests = 0
+
+    def wait(self) -> None:
+        with self._lock:
+            self.requests += 1
+            if self.interval <= 0:
+                return
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def observe(self, status: int, latency: float, retry_after: float | None = None) -> None:
+        """Feedback hook called after every response (no-op for a fixed rate)."""
+
+    @property
+    def rate(self) -> float | None:
+        return 1.0 / self.interval if self.interval > 0 else None
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = f"{self.rate:.2f} req/s" if self.rate else "unthrottled"
+        return (f"Rate: {rate}; {self.requests} requests, "
+                f"effective {self.requests / elapsed:.2f} req/s")
+
+
+class AimdRateLimiter(RateLimiter):
+    """
+    Additive-increase / multiplicative-decrease throttle.
+
+    Every fast 200 adds `step` req/s (up to max_rps). A 429, a 503, a
+    Retry-After header or a latency spike (slower than `spike_factor` x the
+    running average and over `spike_floor` seconds) multiplies the rate by `decrease` (down to min_rps).
+    Retry-After also pauses every worker until the server's deadline.
+    Decreases are spaced at least `cooldown` seconds apart so one burst of
+    concurrent 429s only counts as one backoff. Spikes move the latency
+    baseline only by `spike_weight`, so a lone slow response barely shifts it
+    but a lasting slowdown becomes the new normal after a few backoffs.
+    """
+
+    adaptive = True
+
+    def __init__(self, rps: float, *, min_rps: float = 0.5, max_rps: float = 20.0,
+                 step: float = 0.25, decrease: float = 0.5,
+                 spike_factor: float = 3.0, spike_floor: float = 1.0,
+                 spike_weight: float = 0.05, cooldown: float = 2.0):
+        super().__init__(rps)
+        self.min_rps, self.max_rps = min_rps, max_rps
+        self.step, self.decrease = step, decrease
+        self.spike_factor, self.spike_floor = spike_factor, spike_floor
+        self.spike_weight = spike_weight
+        self.cooldown = cooldown
+        self.rps = min(max(rps, min_rps), max_rps)
+        self.interval = 1.0 / self.rps
+        self.peak_rps = self.rps
+        self.avg_latency: float | None = None
+        self.backoffs = {"429": 0, "503": 0, "retry-after": 0, "latency": 0}
+        self._last_backoff = 0.0
+
+    def _set_rps(self, rps: float) -> None:
+        self.rps = min(max(rps, self.min_rps), self.max_rps)
+        self.interval = 1.0 / self.rps
+        self.peak_rps = max(self.peak_rps, self.rps)
+
+    def observe(self, status: int, latency: float, retry_after: float | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            reason = None
+            if retry_after is not None and status in (429, 503):
+                reason = "retry-after"
+            elif status in (429, 503):
+                reason = str(status)
+            elif (self.avg_latency is not None and latency > self.spike_floor
+                  and latency > self.spike_factor * self.avg_latency):
+                reason = "latency"
+
+            if reason is None:
+                if status == 200:
+                    self._set_rps(self.rps + self.step)
+            elif now - self._last_backoff >= self.cooldown:
+                self._last_backoff = now
+                self.backoffs[reason] += 1
+                self._set_rps(self.rps * self.decrease)
+            if retry_after and status in (429, 503):
+                self._next_slot = max(self._next_slot, now + min(retry_after, 120.0))
+
+            # running latency baseline (EWMA); spikes only nudge it
+            weight = self.spike_weight if reason == "latency" else 0.2
+            self.avg_latency = (latency if self.avg_latency is None
+                                else (1 - weight) * self.avg_latency + weight * latency)
+
+    def summary(self) -> str:
+        events = ", ".join(f"{k}={v}" for k, v in self.backoffs.items())
+        return (f"{super().summary()}; peak {self.peak_rps:.2f} req/s; "
+                f"backoffs: {sum(self.backoffs.values())} ({events})")
+
+
+class BandwidthMeter:
+    """
+    Byte counts for one run: what came over the wire, what it decoded to,
+    and what early-aborted responses never downloaded (known only when the
+    server sent a Content-Length).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = self.aborted = 0
+        self.wire = self.decoded = self.skipped = 0
+
+    def add(self, wire: int, decoded: int, *, aborted: bool = False, skipped: int = 0) -> None:
+        with self._lock:
+            self.responses += 1
+            self.wire += wire
+            self.decoded += decoded
+            self.aborted += aborted
+            self.skipped += skipped
+
+    def counts(self) -> dict:
+        return {k: getattr(self, k) for k in ("responses", "aborted", "wire", "decoded", "skipped")}
+
+    def merge(self, counts: dict) -> None:
+        """Fold in counts() from another meter (e.g. an --id-range shard)."""
+        with self._lock:
+            for k, v in counts.items():
+                setattr(self, k, getattr(self, k) + v)
+
+    def summary(self) -> str:
+        kib = lambda n: f"{n / 1024:,.0f} KiB"
+        return (f"Bandwidth: {kib(self.wire)} received for {kib(self.decoded)} of HTML "
+                f"over {self.responses} responses; saved {kib(max(0, self.decoded - self.wire))} "
+                f"by compression, {kib(self.skipped)} by stopping {self.aborted} pages early")
+
+
+class ThrottledHttp:
+    """
+    Wrap a PoolManager so every request first waits on the shared RateLimiter
+    and reports its status/latency back to it. With an adaptive limiter a 429
+    or 503 is retried here (after the limiter has backed off) up to `max_429`
+    times.
+
+    request(..., stop_at=b"...") streams the body instead and stops reading
+    once that marker has been decoded; the connection is then dropped rather
+    than drained. Wire/decoded byte counts go to `meter`.
+    """
+
+    def __init__(self, pool: urllib3.PoolManager, limiter: RateLimiter, max_429: int = 3,
+                 meter: BandwidthMeter | None = None):
+        self.pool = pool
+        self.limiter = limiter
+        self.max_429 = max_429 if limiter.adaptive else 0
+        self.meter = meter or BandwidthMeter()
+
+    def request(self, method: str, url: str, *, stop_at: bytes | None = None, **kw):
+        for _ in range(self.max_429 + 1):
+            self.limiter.wait()
+            t0 = time.monotonic()
+            if stop_at is None:
+                resp = self.pool.request(method, url, **kw)
+                self.meter.add(resp.tell(), len(resp.data))
+            else:
+                resp = self._stream(method, url, stop_at, **kw)
+            retry_after = _retry_after_seconds(resp.headers.get("Retry-After"))
+            self.limiter.observe(resp.status, time.monotonic() - t0, retry_after)
+            if resp.status not in (429, 503):
+                break
+        return resp
+
+    def _stream(self, method: str, url: str, stop_at: bytes, **kw) -> "CachedResponse":
+        resp = self.pool.request(method, url, preload_content=False, **kw)
+        chunks, window, cut = [], b"", False
+        try:
+            if resp.status == 200:
+                for chunk in resp.stream(4 * 1024):  # decoded (gunzipped) chunks
+                    chunks.append(chunk)
+                    window = window[-len(stop_at):] + chunk  # marker may straddle chunks
+                    if stop_at in window:
+                        cut = True
+                        break
+            else:
+                chunks.append(resp.read())
+            wire = resp.tell()
+        finally:
+            if cut:
+                resp.close()  # closes the socket; the pool reconnects next time
+            resp.release_conn()
+        data = b"".join(chunks)
+        length = resp.headers.get("Content-Length")
+        skipped = int(length) - wire if cut and length and length.isdigit() else 0
+        self.meter.add(wire, len(data), aborted=cut, skipped=skipped)
+        return CachedResponse(resp.status, data, resp.headers)
+
+# ---------------------------------------------------------------------------
+# On-disk HTTP response cache
+# ---------------------------------------------------------------------------
+
+CACHE_DIR_DEFAULT = HERE / ".cache" / "http"
+IMMUTABLE_URL_RE = re.compile(r"/result/\d+/?$")  # detail pages never change once posted
+
+
+class CachedResponse:
+    """Minimal stand-in for urllib3's response (status / data / headers)."""
+
+    def __init__(self, status: int, data: bytes, headers: dict | None = None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+
+class HttpCache:
+    """
+    URL-keyed on-disk cache: <sha256(url)>.body holds the response bytes and
+    <sha256(url)>.json holds url / ETag / Last-Modified. Entries are touched on
+    every hit, and the least recently used ones are evicted once the bodies
+    exceed `max_bytes` (never with max_bytes=None; call trim() later).
+    Counters and the index are shared by the fetch threads, under one lock.
+    """
+
+    def __init__(self, root: Path, max_bytes: int | None = 200 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> [last_used, size]; rebuilt from file mtimes on start-up
+        self._index: dict[str, list[float]] = {}
+        for body in self.root.glob("*.body"):
+            st = body.stat()
+            self._index[body.stem] = [st.st_mtime, st.st_size]
+        self.total = sum(size for _, size in self._index.values())
+        self.hits = self.revalidated = self.misses = self.evicted = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def count(self, outcome: str) -> None:
+        """Bump the hits / revalidated / misses counter."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get(self, url: str) -> tuple[bytes, dict] | None:
+        k = self.key(url)
+        try:
+            meta = json.loads((self.root / f"{k}.json").read_text(encoding="utf-8"))
+            body = (self.root / f"{k}.body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        self.touch(url)
+        return body, meta
+
+    def touch(self, url: str) -> None:
+        k = self.key(url)
+        now = time.time()
+        with self._lock:
+            if k in self._index:
+                self._index[k][0] = now
+        try:
+            os.utime(self.root / f"{k}.body", (now, now))
+        except OSError:
+            pass
+
+    def put(self, url: str, body: bytes, headers) -> None:
+        k = self.key(url)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored": int(time.time()),
+        }
+        for suffix, payload in ((".body", body), (".json", json.dumps(meta).encode("utf-8"))):
+            tmp = self.root / f"{k}{suffix}.{threading.get_ident()}.tmp"
+            tmp.write_bytes(payload)
+            os.replace(tmp, self.root / f"{k}{suffix}")
+        with self._lock:
+            old = self._index.get(k)
+            self.total += len(body) - (old[1] if old else 0)
+            self._index[k] = [time.time(), len(body)]
+            if self.max_bytes is not None and self.total > self.max_bytes:
+                self._evict()
+
+    def trim(self) -> int:
+        """Evict down to the cap now (e.g. after other processes wrote); returns entries evicted."""
+        with self._lock:
+            before = self.evicted
+            if self.max_bytes is not None and self.total > self.max_bytes:
+                self._evict()
+            return self.evicted - before
+
+    def _evict(self) -> None:
+        # caller holds the lock; drop oldest entries until 90% of the cap
+        target = int(self.max_bytes * 0.9)
+        for k, (_, size) in sorted(self._index.items(), key=lambda kv: kv[1][0]):
+            if self.total <= target:
+                break
+            for suffix in (".body", ".json"):
+                (self.root / f"{k}{suffix}").unlink(missing_ok=True)
+            del self._index[k]
+            self.total -= size
+            self.evicted += 1
+
+    def summary(self) -> str:
+        return (f"Cache: {self.hits} hits, {self.revalidated} revalidated (304), "
+                f"{self.misses} fetched, {self.evicted} evicted, "
+                f"{self.total / 1_048_576:.1f} MiB on disk")
+
+
+class CachingHttp:
+    """
+    Serve GETs through an HttpCache in front of the (throttled) pool.
+
+    Immutable detail pages are answered straight from disk. Everything else
+    is revalidated with If-None-Match / If-Modified-Since, and a 304 is
+    turned back into a 200 carrying the cached body. Cache hits never touch
+    the network, so they don't spend the rate budget either.
+    """
+
+    def __init__(self, inner, cache: HttpCache, base_headers: dict | None = None):
+        self.inner = inner
+        self.cache = cache
+        self.base_headers = base_headers if base_headers is not None else HEADERS
+
+    def request(self, method: str, url: str, **kw):
+        if method.upper() != "GET":
+            return self.inner.request(method, url, **kw)
+        cached = self.cache.get(url)
+        if cached and IMMUTABLE_URL_RE.search(urllib3.util.parse_url(url).path or ""):
+            self.cache.count("hits")
+            return CachedResponse(200, cached[0], {"X-Cache": "hit"})
+
+        # passing headers= replaces the pool defaults, so start from those
+        headers = dict(self.base_headers)
+        headers.update(kw.pop("headers", None) or {})
+        if cached:
+            body, meta = cached
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = self.inner.request(method, url, headers=headers, **kw)
+        if resp.status == 304 and cached:
+            self.cache.count("revalidated")
+            return CachedResponse(200, cached[0], {"X-Cache": "revalidated"})
+        if resp.status == 200:
+            self.cache.count("misses")
+            self.cache.put(url, resp.data, resp.headers)
+        return resp
+
 def _norm_label(txt: str) -> str:
     """lowercase, strip, remove trailing colon"""
     t = " ".join((txt or "").split()).strip().lower()
@@ -87,33 +496,107 @@ def parse_added_on(s: str | None) -> date | None:
             continue
     return None
 
-def find_added_on_detail(dsoup) -> str | None:
-    """Find the 'Added on' value on the detail page (return raw string)."""
+ADDED_ON_TEXT_RES = (
+    re.compile(r"\bAdded on\s+([A-Za-z]+\s+\d{1,2},\s*\d{4})\b", flags=re.I),
+    # Accept ISO / slashes if they appear after "Added on"
+    re.compile(r"\bAdded on\s+(\d{4}-\d{2}-\d{2})\b", flags=re.I),
+    re.compile(r"\bAdded on\s+(\d{1,2}/\d{1,2}/\d{4})\b", flags=re.I),
+)
+
+def find_added_on_detail(pairs: dict[str, str], page_text) -> str | None:
+    """
+    Find the 'Added on' value on the detail page (return raw string).
+    `pairs` is the dt/dd dict from extract_detail(); `page_text` is a callable
+    returning the whole page's text, only evaluated if the pairs lack it.
+    """
     # Preferred: in the <dt>/<dd> pairs
-    for dt in dsoup.find_all("dt"):
-        label = (dt.get_text(" ", strip=True) or "").strip().lower().rstrip(":")
-        if label == "added on":
-            dd = dt.find_next_sibling("dd")
-            if dd:
-                val = dd.get_text(" ", strip=True)
-                if val:
-                    return val
+    if pairs.get("added on"):
+        return pairs["added on"]
 
     # Fallback: any 'Added on <date>' text anywhere
-    text = dsoup.get_text(" ", strip=True)
-    m = re.search(r"\bAdded on\s+([A-Za-z]+\s+\d{1,2},\s*\d{4})\b", text, flags=re.I)
-    if m:
-        return m.group(1)
+    text = page_text()
+    for rx in ADDED_ON_TEXT_RES:
+        m = rx.search(text)
+        if m:
+            return m.group(1)
+    return None
 
-    # Accept ISO / slashes if they appear after "Added on"
-    m = re.search(r"\bAdded on\s+(\d{4}-\d{2}-\d{2})\b", text, flags=re.I)
-    if m:
-        return m.group(1)
-    m = re.search(r"\bAdded on\s+(\d{1,2}/\d{1,2}/\d{4})\b", text, flags=re.I)
-    if m:
-        return m.group(1)
+# ---------------------------------------------------------------------------
+# HTML extraction backends (detail pages)
+# ---------------------------------------------------------------------------
 
-    return None
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+def available_backends() -> list[str]:
+    """Usable detail-page parsers, fastest first; html.parser is always there."""
+    out = []
+    if LexborHTMLParser is not None:
+        out.append("selectolax")
+    if lxml_html is not None:
+        out.append("lxml")
+    out.append("html.parser")
+    return out
+
+PARSER_BACKEND = available_backends()[0]
+
+def _squash(parts) -> str | None:
+    s = " ".join(" ".join(p.strip() for p in parts if p.strip()).split())
+    return s or None
+
+def _pair_dt_dd(items) -> dict[str, str]:
+    """
+    Single pass over (tag, parent_key, text) for every dt/dd in document
+    order: each dt is paired with the next dd under the same parent (what
+    BeautifulSoup's find_next_sibling("dd") did), keyed by its normalized label.
+    A repeated label keeps its last value, except 'added on', which keeps the
+    first non-empty one, as the old dedicated 'Added on' search did.
+    """
+    data: dict[str, str] = {}
+    pending: list[tuple[object, str]] = []
+    for tag, parent, text in items:
+        if tag == "dt":
+            pending.append((parent, _norm_label(text or "")))
+            continue
+        waiting = []
+        for dt_parent, label in pending:
+            if dt_parent != parent:
+                waiting.append((dt_parent, label))
+            elif label and text is not None and not (label == "added on" and label in data):
+                data[label] = text
+        pending = waiting
+    return data
+
+def extract_detail(html: str, backend: str | None = None):
+    """
+    Parse a detail page once and return (pairs, page_text): the normalized
+    dt-label -> dd-text dict, and a zero-arg callable giving the page's full
+    text (computed lazily; only the 'Added on' fallback needs it).
+    """
+    backend = backend or PARSER_BACKEND
+    if backend == "selectolax":
+        tree = LexborHTMLParser(html)
+        items = ((n.tag, n.parent.mem_id if n.parent else None,
+                  _squash([n.text(separator=" ", strip=True)]))
+                 for n in tree.css("dt, dd"))
+        root = tree.body or tree.root
+        return _pair_dt_dd(items), lambda: root.text(separator=" ", strip=True) if root else ""
+    if backend == "lxml":
+        doc = lxml_html.fromstring(html)
+        items = ((el.tag, el.getparent(), _squash(el.xpath(".//text()")))
+                 for el in doc.iter("dt", "dd"))
+        return _pair_dt_dd(items), lambda: _squash(doc.xpath("//body//text()")) or ""
+    if backend == "html.parser":
+        soup = BeautifulSoup(html, "html.parser")
+        items = ((el.name, id(el.parent), _text(el)) for el in soup.find_all(["dt", "dd"]))
+        return _pair_dt_dd(items), lambda: soup.get_text(" ", strip=True)
+    raise ValueError(f"unknown parser backend {backend!r} (available: {available_backends()})")
 
 # ---------------------------------------------------------------------------
 # GRE extraction
@@ -127,6 +610,58 @@ def _to_float(s: str | None):
     except Exception:
         return None
 
+# Every form extract_gre() understands, as (kind, shared prefix, pattern).
+# Kinds with the same prefix are merged into one alternation behind it, and
+# a lookahead on the characters a form can start with lets the combined
+# pattern skip everything else cheaply. Each kind has a different first
+# character (Q, V, A/W, "(Q", "(V") or, for the three digit-first suffix
+# forms, a different character after the digits, so at any position at
+# most one kind can match; re-searching from each match start + 1 finds
+# the leftmost match of every kind in a single pass.
+GRE_PATTERNS = (
+    # labeled singletons: 'Q 170', 'V: 165', 'AW 4.5', 'Writing=5'
+    ("q", r"\b", r"Q\s*[:=]?\s*(\d{2,3})\b"),
+    ("v", r"\b", r"V\s*[:=]?\s*(\d{2,3})\b"),
+    ("aw", r"\b", r"(?:AW|A\.?W\.?|W(?:riting)?)\s*[:=]?\s*([0-6](?:\.\d)?)\b"),
+    # parenthesized order hints: '(Q/V/W): 170/165/4.5', '(V/Q/W): 165/170/5.0'
+    ("qvw", r"\(", r"Q/V/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)"),
+    ("vqw", r"\(", r"V/Q/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)"),
+    # suffixed: '170Q/165V/4.5W' or variations with spaces
+    ("q_suffix", "", r"(\d{2,3})\s*Q\b"),
+    ("v_suffix", "", r"(\d{2,3})\s*V\b"),
+    ("aw_suffix", "", r"([0-6](?:\.\d)?)\s*(?:AW|W)\b"),
+)
+
+def _compile_gre(patterns):
+    """Build the combined regex plus kind -> slice of m.groups(), keyed by m.lastindex."""
+    by_prefix, kinds, n = {}, {}, 0
+    for kind, prefix, pat in patterns:
+        by_prefix.setdefault(prefix, []).append(pat)
+        width = re.compile(pat).groups
+        kinds[n + width] = (kind, slice(n, n + width))  # lastindex is the kind's last group
+        n += width
+    alts = "|".join(f"{prefix}(?:{'|'.join(pats)})" for prefix, pats in by_prefix.items())
+    return re.compile(rf"(?=[QVAW(\d])(?:{alts})", flags=re.I), kinds
+
+GRE_RE, _GRE_KINDS = _compile_gre(GRE_PATTERNS)
+_NO_GRE = (None, None, None)
+
+def _gre_scan(t: str) -> dict[str, tuple]:
+    """Leftmost match of each kind in `t`, as kind -> its captured values."""
+    found = {}
+    m = GRE_RE.search(t)
+    while m:
+        kind, groups = _GRE_KINDS[m.lastindex]
+        if kind not in found:
+            found[kind] = m.groups()[groups]
+            if len(found) == len(GRE_PATTERNS):
+                break
+            if (kind in ("q", "v", "aw") and "q" in found and "v" in found and "aw" in found
+                    and any(_to_float(found[k][0]) for k in ("q", "v", "aw"))):
+                break  # non-zero labeled values win, nothing later can change the answer
+        m = GRE_RE.search(t, m.start() + 1)
+    return found
+
 def extract_gre(raw_text: str):
     """
     Try to extract (Q, V, AW) from free text. Returns (q, v, aw) floats or None.
@@ -137,192 +672,531 @@ def extract_gre(raw_text: str):
     * 'GRE (Q/V/W): 170/165/4.5' or '(V/Q/W): 165/170/5.0'
     * '170Q/165V/4.5W'
     * 'V: 165, Q: 170, AW: 4.5'
+
+    Labeled values win if any of them is non-zero, then the (Q/V/W) and
+    (V/Q/W) hints, then the suffixed form.
     """
     if not raw_text:
-        return (None, None, None)
+        return _NO_GRE
     t = " ".join(raw_text.split())
+    found = _gre_scan(t)
+    if not found:
+        return _NO_GRE
 
-    # labeled singletons (most reliable)
-    qm = re.search(r'\bQ\s*[:=]?\s*(\d{2,3})\b', t, flags=re.I)
-    vm = re.search(r'\bV\s*[:=]?\s*(\d{2,3})\b', t, flags=re.I)
-    awm = re.search(r'\b(?:AW|A\.?W\.?|W(?:riting)?)\s*[:=]?\s*([0-6](?:\.\d)?)\b', t, flags=re.I)
-    q = _to_float(qm.group(1)) if qm else None
-    v = _to_float(vm.group(1)) if vm else None
-    aw = _to_float(awm.group(1)) if awm else None
+    q, v, aw = (_to_float(found[k][0]) if k in found else None for k in ("q", "v", "aw"))
     if q or v or aw:
         return (q, v, aw)
+    if "qvw" in found:
+        q, v, aw = found["qvw"]
+        return (_to_float(q), _to_float(v), _to_float(aw))
+    if "vqw" in found:
+        v, q, aw = found["vqw"]
+        return (_to_float(q), _to_float(v), _to_float(aw))
+    if "q_suffix" in found or "v_suffix" in found or "aw_suffix" in found:
+        return tuple(_to_float(found[k][0]) if k in found else None
+                     for k in ("q_suffix", "v_suffix", "aw_suffix"))
+    return _NO_GRE
+
+def extract_gre_batch(texts) -> list[tuple]:
+    """extract_gre() over many blobs; repeated blobs are only scanned once."""
+    seen = {}
+    out = []
+    for t in texts:
+        r = seen.get(t)
+        if r is None:
+            r = seen[t] = extract_gre(t)
+        out.append(r)
+    return out
+
+# ---------------------------------------------------------------------------
+# Known-URL index (skip detail pages we already have)
+# ---------------------------------------------------------------------------
+
+KNOWN_INDEX_DEFAULT = HERE / ".cache" / "known_ids.bin"
+RESULT_ID_RE = re.compile(r"/result/(\d+)")
+
+def result_id(url: str | None) -> int | None:
+    """Numeric GradCafe result ID from a detail URL, or None."""
+    m = RESULT_ID_RE.search(url or "")
+    return int(m.group(1)) if m else None
+
+
+class KnownIds:
+    """
+    Exact membership set of already-ingested result IDs.
+
+    IDs live in a sorted array('q') (8 bytes each, binary-searched) that is
+    persisted as raw bytes; IDs added during a run sit in a small set until
+    save() merges them in. URLs without a numeric ID fall back to a plain
+    set of strings (not persisted: the loader never produces them).
+    """
+
+    def __init__(self, ids=()):
+        self._ids = array("q", sorted(set(ids)))
+        self._new: set[int] = set()
+        self._other: set[str] = set()
+        self._lock = threading.Lock()
+        self.skipped = 0  # detail requests avoided this run
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._new)
+
+    def __getstate__(self):
+        # shipped to --id-range worker processes; locks don't pickle
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        rid = result_id(url)
+        if rid is None:
+            return url in self._other
+        i = bisect_left(self._ids, rid)
+        return (i < len(self._ids) and self._ids[i] == rid) or rid in self._new
+
+    def add(self, url: str) -> None:
+        rid = result_id(url)
+        with self._lock:
+            if rid is None:
+                self._other.add(url)
+            else:
+                self._new.add(rid)
+
+    def add_urls(self, urls) -> None:
+        for url in urls:
+            if url:
+                self.add(url)
+
+    def save(self, path: Path) -> None:
+        with self._lock:
+            if self._new:
+                self._ids = array("q", sorted(set(self._ids).union(self._new)))
+                self._new.clear()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp, "wb") as f:
+                self._ids.tofile(f)
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "KnownIds":
+        """Read a file written by save(); ValueError if it is truncated or corrupt."""
+        ids = array("q")
+        ids.frombytes(path.read_bytes())  # ValueError unless a whole number of IDs
+        if any(a >= b for a, b in zip(ids, ids[1:])):
+            raise ValueError(f"{path.name}: IDs are not strictly increasing")
+        known = cls()
+        known._ids = ids  # already sorted on save
+        return known
+
+
+def _jsonl_urls(path: Path):
+    """Yield the url field of every line in a JSONL file (bad lines skipped)."""
+    if not path.exists():
+        return
+    with open_jsonl(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line).get("url")
+            except (ValueError, AttributeError):
+                continue
+
+def _db_urls():
+    """
+    Yield applicants.url from Postgres when psycopg is installed and a server
+    is reachable; otherwise nothing. Connects with module_5's db.get_conn(),
+    so DATABASE_URL / PG* and the "gradcafe" default match the loader.
+    """
+    db_src = str(HERE.parent / "module_5" / "src")
+    if db_src not in sys.path:
+        sys.path.append(db_src)  # appended: a db module already on the path wins
+    try:
+        import psycopg
+        from db import get_conn
+    except ImportError:
+        return
+    os.environ.setdefault("PGCONNECT_TIMEOUT", "5")  # libpq: don't hang on a dead host
+    try:
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT url FROM applicants WHERE url IS NOT NULL")
+                for row in cur:
+                    yield row["url"]
+    except (psycopg.Error, OSError) as exc:
+        print(f"Known-URL index: database skipped ({exc.__class__.__name__})")
+
+def refresh_line_index(jsonl_out: Path) -> None:
+    """Index the lines just appended, if the archive has a jsonl_index.py sidecar."""
+    if compression(jsonl_out) or not index_path_for(jsonl_out).exists():
+        return
+    added, rebuilt = update_index(jsonl_out)
+    print(f"Line index: {'rebuilt' if rebuilt else 'added'} {added} lines")
 
-    # parenthesized order hints
-    m = re.search(r'\(Q/V/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)', t, flags=re.I)
-    if m:
-        return (_to_float(m.group(1)), _to_float(m.group(2)), _to_float(m.group(3)))
-    m = re.search(r'\(V/Q/W\)\s*[:=]?\s*(\d{2,3})\s*/\s*(\d{2,3})\s*/\s*([0-6](?:\.\d)?)', t, flags=re.I)
-    if m:
-        return (_to_float(m.group(2)), _to_float(m.group(1)), _to_float(m.group(3)))
-
-    # '170Q/165V/4.5W' or variations with spaces
-    qm = re.search(r'(\d{2,3})\s*Q\b', t, flags=re.I)
-    vm = re.search(r'(\d{2,3})\s*V\b', t, flags=re.I)
-    awm = re.search(r'([0-6](?:\.\d)?)\s*(?:AW|W)\b', t, flags=re.I)
-    if qm or vm or awm:
-        return (_to_float(qm.group(1)) if qm else None,
-                _to_float(vm.group(1)) if vm else None,
-                _to_float(awm.group(1)) if awm else None)
-
-    return (None, None, None)
+def load_known_ids(path: Path, jsonl_paths, *, rebuild: bool = False) -> KnownIds:
+    """Load the persisted index, or (re)build it from the JSONL file(s) and the DB."""
+    if path.exists() and not rebuild:
+        try:
+            return KnownIds.load(path)
+        except (OSError, ValueError) as exc:
+            print(f"Known-URL index unreadable ({exc}); rebuilding {path}")
+    known = KnownIds()
+    for p in jsonl_paths:
+        known.add_urls(_jsonl_urls(Path(p)))
+    known.add_urls(_db_urls())
+    known.save(path)
+    print(f"Built known-URL index: {len(known)} IDs -> {path}")
+    return known
 
 # ---------------------------------------------------------------------------
 # Core scraper
 # ---------------------------------------------------------------------------
 
-def scrape_data(*, sleep_s: float, since: date, jsonl_out: Path) -> None:
+ADDED_ON_CARD_RE = re.compile(r"\bAdded on\s+([A-Za-z]+\s+\d{1,2},\s*\d{4})", flags=re.I)
+
+def _card_candidates(soup, since: date,
+                     known: KnownIds | None = None) -> tuple[bool, bool, list[tuple[str, date | None]]]:
     """
-    Fetch list pages, follow 'See More' links, read <dt>/<dd> pairs on detail pages,
-    and append NEW rows (Added on >= since) to JSONL file.
+    Return (found_links, in_window, [(detail_url, card_added), ...]) for one
+    list page. Cards whose card-level "Added on" is older than `since`, or
+    whose URL is already in `known`, are skipped here, before any detail
+    request is made. in_window says whether any card is dated `since` or
+    later, known or not, so a page of already-ingested posts doesn't look
+    like the end of the window.
     """
-    http = _http()
+    links = soup.find_all("a", string=lambda s: s and "See More" in s)
+    out = []
+    in_window = False
+    for a in links:
+        # Try to read 'Added on ...' from the card BEFORE fetching details (for early skip)
+        card = a.find_parent(["article", "li", "div", "section"]) or a.parent
+        card_text = _text(card) or ""
+        m = ADDED_ON_CARD_RE.search(card_text)
+        card_added = parse_added_on(m.group(1)) if m else None
+        if card_added and card_added < since:
+            continue
+        in_window = in_window or card_added is not None
+        detail_url = up.urljoin(LIST_URL, a.get("href"))
+        if known is not None and detail_url in known:
+            known.skipped += 1
+            continue
+        out.append((detail_url, card_added))
+    return bool(links), in_window, out
 
-    appended = 0
-    min_date, max_date = None, None
-    page = 1
+# The dt/dd pairs all sit in one <dl>; nothing after it is read
+DETAIL_END = b"</dl>"
 
-    # open the jsonl for append once
-    jsonl_out.parent.mkdir(parents=True, exist_ok=True)
-    f_out = open(jsonl_out, "a", encoding="utf-8")
+def _fetch_detail(http, detail_url: str, stop_early: bool = False) -> bytes | None:
+    """
+    GET one detail page; return the raw body or None on a non-200 status.
+    stop_early stops the download at the end of the result's <dl>.
+    """
+    kw = {"stop_at": DETAIL_END} if stop_early else {}
+    rd = http.request("GET", detail_url, **kw)
+    if rd.status != 200:
+        return None
+    return rd.data
+
+def parse_detail(html: str, detail_url: str, *, card_added: date | None,
+                 since: date | None, backend: str | None = None) -> tuple[date | None, dict] | None:
+    """
+    Read the <dt>/<dd> pairs on a detail page and build one output record.
+    Returns (date_added, record), or None when the post has no usable date
+    or is older than `since`. With since=None (ID crawls, where there is no
+    card date to fall back on) undated posts are kept with date_added null.
+    """
+    # One parse, one walk: dt/dd pairs come back as a dict
+    data, page_text = extract_detail(html, backend)
+
+    # ---- Authoritative "Added on" ----
+    raw_added = find_added_on_detail(data, page_text)  # string or None
+    date_added = parse_added_on(raw_added)            # date or None
+    if not date_added and card_added:
+        date_added = card_added
+
+    # Require a valid date, and enforce cutoff
+    if since is not None and (not date_added or date_added < since):
+        return None
+
+    date_added_iso = date_added.strftime("%Y-%m-%d") if date_added else None
+
+    # Map labels found on the site to the exact output keys
+    institution = data.get("institution")
+    program_only = data.get("program")
+    if program_only and institution:
+        combined_program = f"{program_only}, {institution}"
+    else:
+        combined_program = program_only or institution or ""
+
+    # Notification often contains the date text ("on 07/08/2025 via ...")
+    decision = data.get("decision")
+    notification = data.get("notification")
+    status = f"{decision} {notification}" if (decision and notification) else (decision or None)
+
+    term = data.get("term")
+    comments = data.get("notes")
+
+    # ---- GRE extraction ----
+    gre_q = _to_float(data.get("gre general"))
+    gre_v = _to_float(data.get("gre verbal"))
+    gre_aw = _to_float(data.get("analytical writing"))
+    if gre_q is None or gre_v is None or gre_aw is None:
+        blob = " | ".join(filter(None, [
+            program_only, institution, decision, notification, comments,
+            data.get("test scores"), data.get("additional info"), data.get("score")
+        ]))
+        q2, v2, aw2 = extract_gre(blob)
+        gre_q = gre_q if gre_q is not None else q2
+        gre_v = gre_v if gre_v is not None else v2
+        gre_aw = gre_aw if gre_aw is not None else aw2
+
+    record = {
+        "program": combined_program,                 # program + institution combined
+        "comments": comments,
+        "date_added": date_added_iso,                # ISO string; loader parses to DATE cleanly
+        "url": detail_url,
+        "status": status,
+        "term": term,
+        "US/International": data.get("degree's country of origin"),
+        "Degree": data.get("degree type"),
+        "GPA": data.get("undergrad gpa"),
+        "GRE": gre_q,            # Quantitative
+        "GRE V": gre_v,          # Verbal
+        "GRE AW": gre_aw,        # Analytical Writing
+    }
+    return date_added, record
+
+def _parse_raw(raw: bytes, card: tuple[str, date | None], since: date | None,
+               backend: str | None = None):
+    """
+    Parse-stage body (runs in a worker process with --parse-workers): the
+    body of card (detail_url, card_added) -> ((date_added, record, JSONL
+    line) or None, seconds spent).
+    """
+    t0 = time.perf_counter()
+    detail_url, card_added = card
+    parsed = parse_detail(raw.decode("utf-8", errors="replace"), detail_url,
+                          card_added=card_added, since=since, backend=backend)
+    if parsed is not None:
+        parsed = (*parsed, json.dumps(parsed[1], ensure_ascii=False) + "\n")
+    return parsed, time.perf_counter() - t0
+
+def _detail_pipeline(candidates, fetch, parse, *, workers: ThreadPoolExecutor,
+                     parsers: ProcessPoolExecutor | None, max_inflight: int):
+    """
+    Yield (candidate, result) in candidate order, where result is None for a
+    failed fetch and parse(raw, candidate) otherwise. `parse` must pickle
+    (a module-level function or a partial of one) when `parsers` is set.
+
+    Fetch threads hand each body straight to the `parsers` pool and go back
+    to the network, so parsing never holds up I/O. Without a pool the body
+    is parsed here, on the consuming thread. At most `max_inflight` cards
+    are fetched/parsed ahead of the consumer, which bounds the raw pages and
+    records held in memory when the writer falls behind.
+    """
+    def stage(c):
+        raw = fetch(c)
+        if raw is None or parsers is None:
+            return raw
+        return parsers.submit(parse, raw, c)
+
+    pending = deque()
+    todo = iter(candidates)
+    while True:
+        for c in todo:
+            pending.append((c, workers.submit(stage, c)))
+            if len(pending) >= max_inflight:
+                break
+        if not pending:
+            return
+        c, fut = pending.popleft()
+        out = fut.result()
+        if out is not None:
+            out = out.result() if parsers is not None else parse(out, c)
+        yield c, out
 
+CHECKPOINT_DEFAULT = HERE / ".cache" / "scrape_checkpoint.json"
+
+def _timed(iterable, timings: dict, key: str):
+    """Yield from `iterable`, adding the time spent waiting on each item to timings[key]."""
+    it = iter(iterable)
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        finally:
+            timings[key] += time.perf_counter() - t0
+        yield item
+
+def _write_checkpoint(path: Path, state: dict) -> None:
+    """Atomically replace the checkpoint file (temp file + os.replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def load_checkpoint(path: Path) -> dict | None:
+    """Read a checkpoint left by an interrupted run (None if absent/corrupt)."""
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    for key in ("since", "min_date", "max_date"):
+        if state.get(key):
+            state[key] = date.fromisoformat(state[key])
+    return state
+
+def _new_stats() -> dict:
+    return {"list_pages": 0, "detail_pages": 0, "appended": 0,
+            "min_date": None, "max_date": None,
+            "timings": dict.fromkeys(("list_fetch", "list_parse", "detail_wait",
+                                      "detail_parse", "write"), 0.0)}
+
+def _count_record(stats: dict, known: KnownIds | None, detail_url: str, date_added: date) -> None:
+    """
+    Count a record the consumer has written: appended, the min/max dates and
+    the known-URL index. Done after the write, so a checkpoint or index saved
+    on an interrupt never covers a record that isn't in the output.
+    """
+    stats["appended"] += 1
+    if known is not None:
+        known.add(detail_url)
+
+    # track min/max dates of scraped items
+    if (MIN_OK <= date_added <= MAX_OK):
+        if (stats["min_date"] is None) or (date_added < stats["min_date"]):
+            stats["min_date"] = date_added
+        if (stats["max_date"] is None) or (date_added > stats["max_date"]):
+            stats["max_date"] = date_added
+
+def _crawl_new(since: date, *, stats: dict, concurrency: int = 1,
+               rps: float | None = None, limiter: RateLimiter | None = None,
+               cache: HttpCache | None = None, known: KnownIds | None = None,
+               resume: dict | None = None, record: Path | None = None,
+               stop_early: bool = False, parse_workers: int = 0,
+               max_inflight: int | None = None):
+    """
+    The crawl behind scrape_data() and iter_new_records(): yield
+    (page, detail_url, date_added, record, JSONL line) for every new post, in
+    card order, updating the page counts and stage timings in `stats` as it
+    goes. The consumer counts each record with _count_record() once it has
+    been written. The pools and the HTTP chain are shut down when the
+    generator is exhausted or closed.
+    """
+    concurrency = max(1, concurrency)
+    limiter = limiter or RateLimiter(rps)
+    throttled = ThrottledHttp(_http(maxsize=concurrency, retry_throttled=not limiter.adaptive), limiter)
+    http = throttled
+    if cache is not None:
+        http = CachingHttp(http, cache)
+    if record is not None:
+        from replay import RecordingHttp  # replay.py imports this module
+        http = RecordingHttp(http, record)
+    stats.update(limiter=limiter, meter=throttled.meter)
+    timings = stats["timings"]
+
+    page = 1
+    resume_after = None
+    if resume:
+        page = resume.get("page", 1)
+        resume_after = resume.get("last_url")
+
+    workers = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="detail")
+    parsers = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+    max_inflight = max(1, max_inflight or 2 * (concurrency + max(0, parse_workers)))
+    backend = PARSER_BACKEND  # worker processes may not see a CLI override
     try:
         while True:
-            print(f"\rFetching page {page}... (appended so far: {appended})", end="", flush=True)
+            print(f"\rFetching page {page}... (appended so far: {stats['appended']})", end="", flush=True)
             list_url = LIST_URL if page == 1 else f"{LIST_URL}?page={page}"
+            t0 = time.perf_counter()
             r = http.request("GET", list_url)
+            timings["list_fetch"] += time.perf_counter() - t0
             if r.status != 200:
                 print(f"\nHTTP {r.status} on page {page}, stopping.")
                 break
+            stats["list_pages"] += 1
 
+            t0 = time.perf_counter()
             soup = BeautifulSoup(r.data.decode("utf-8", errors="replace"), "html.parser")
-            links = soup.find_all("a", string=lambda s: s and "See More" in s)
-            if not links:
+            found_links, in_window, candidates = _card_candidates(soup, since, known)
+            timings["list_parse"] += time.perf_counter() - t0
+            if not found_links:
                 print(f"\nNo 'See More' links on page {page}, stopping.")
                 break
 
-            page_had_new = False
+            # a card dated inside the window keeps the crawl going even when
+            # every post on the page is already known (backfills with an
+            # earlier --since, restarts without --resume, after --id-range)
+            page_had_new = in_window
 
-            for a in links:
-                # Try to read 'Added on ...' from the card BEFORE fetching details (for early skip)
-                card = a.find_parent(["article", "li", "div", "section"]) or a.parent
-                card_text = _text(card) or ""
-                m = re.search(r"\bAdded on\s+([A-Za-z]+\s+\d{1,2},\s*\d{4})", card_text, flags=re.I)
-                card_added = parse_added_on(m.group(1)) if m else None
-                if card_added and card_added < since:
-                    continue
+            if resume_after is not None:
+                # first page after --resume: drop the cards already written
+                urls = [u for u, _ in candidates]
+                if resume_after in urls:
+                    candidates = candidates[urls.index(resume_after) + 1:]
+                    page_had_new = True  # an emptied page is not "reached old posts"
+                resume_after = None
 
-                detail_url = up.urljoin(LIST_URL, a.get("href"))
-                rd = http.request("GET", detail_url)
-                if rd.status != 200:
+            # results come back in card order, whatever order the fetches finish in
+            results = _timed(_detail_pipeline(
+                candidates,
+                lambda c: _fetch_detail(http, c[0], stop_early),
+                functools.partial(_parse_raw, since=since, backend=backend),
+                workers=workers, parsers=parsers, max_inflight=max_inflight,
+            ), timings, "detail_wait")
+            for (detail_url, _), result in results:
+                if result is None:
                     continue
-
-                dsoup = BeautifulSoup(rd.data.decode("utf-8", errors="replace"), "html.parser")
-
-                # ---- Authoritative "Added on" ----
-                raw_added = find_added_on_detail(dsoup)           # string or None
-                date_added = parse_added_on(raw_added)            # date or None
-                if not date_added and card_added:
-                    date_added = card_added
-
-                # Require a valid date, and enforce cutoff
-                if not date_added or date_added < since:
+                stats["detail_pages"] += 1
+                parsed, parse_secs = result
+                timings["detail_parse"] += parse_secs
+                if parsed is None:
                     continue
-
-                date_added_iso = date_added.strftime("%Y-%m-%d")
-
-                # Collect all <dt>/<dd> into a dict of normalized label -> value
-                data = {}
-                for dt in dsoup.find_all("dt"):
-                    dd = dt.find_next_sibling("dd")
-                    if not dd:
-                        continue
-                    label = _norm_label(_text(dt) or "")
-                    value = _text(dd)
-                    if label and value is not None:
-                        data[label] = value
-
-                # Map labels found on the site to the exact output keys
-                institution = data.get("institution")
-                program_only = data.get("program")
-                if program_only and institution:
-                    combined_program = f"{program_only}, {institution}"
-                else:
-                    combined_program = program_only or institution or ""
-
-                # Notification often contains the date text ("on 07/08/2025 via ...")
-                decision = data.get("decision")
-                notification = data.get("notification")
-                status = f"{decision} {notification}" if (decision and notification) else (decision or None)
-
-                term = data.get("term")
-                comments = data.get("notes")
-
-                # ---- GRE extraction ----
-                gre_q = _to_float(data.get("gre general"))
-                gre_v = _to_float(data.get("gre verbal"))
-                gre_aw = _to_float(data.get("analytical writing"))
-                if gre_q is None or gre_v is None or gre_aw is None:
-                    blob = " | ".join(filter(None, [
-                        program_only, institution, decision, notification, comments,
-                        data.get("test scores"), data.get("additional info"), data.get("score")
-                    ]))
-                    q2, v2, aw2 = extract_gre(blob)
-                    gre_q = gre_q if gre_q is not None else q2
-                    gre_v = gre_v if gre_v is not None else v2
-                    gre_aw = gre_aw if gre_aw is not None else aw2
-
-                record = {
-                    "program": combined_program,                 # program + institution combined
-                    "comments": comments,
-                    "date_added": date_added_iso,                # ISO string; loader parses to DATE cleanly
-                    "url": detail_url,
-                    "status": status,
-                    "term": term,
-                    "US/International": data.get("degree's country of origin"),
-                    "Degree": data.get("degree type"),
-                    "GPA": data.get("undergrad gpa"),
-                    "GRE": gre_q,            # Quantitative
-                    "GRE V": gre_v,          # Verbal
-                    "GRE AW": gre_aw,        # Analytical Writing
-                }
-
-                # Append to JSONL
-                f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
-                appended += 1
+                date_added, row, line = parsed
                 page_had_new = True
-
-                # track min/max dates of scraped items
-                if (MIN_OK <= date_added <= MAX_OK):
-                    if (min_date is None) or (date_added < min_date):
-                        min_date = date_added
-                    if (max_date is None) or (date_added > max_date):
-                        max_date = date_added
-
-                time.sleep(sleep_s)  # polite delay between detail requests
+                yield page, detail_url, date_added, row, line
 
             if not page_had_new:
-                # no new items on this page — likely reached older-than-since region
-                print(f"\nNo new items encountered on page {page}. Stopping.")
+                # nothing on this page is inside the window: reached older-than-since posts
+                print(f"\nNo posts since {since} on page {page}. Stopping.")
                 break
 
-            print(f"\nFinished page {page}, appended {appended} records so far.")
+            print(f"\nFinished page {page}, appended {stats['appended']} records so far.")
             page += 1
-
     finally:
-        f_out.close()
+        workers.shutdown(wait=True, cancel_futures=True)
+        if parsers is not None:
+            parsers.shutdown(wait=True, cancel_futures=True)
+        if record is not None:
+            http.close()
 
-    # Summary
-    if min_date or max_date:
-        print(f"Scraped date range this run: {min_date} to {max_date}")
-    else:
-        print("Scraped date range this run: (no valid 'Added on' dates parsed)")
+def iter_new_records(since: date, *, stats: dict | None = None, **options):
+    """
+    Yield new records (the dicts scrape_data() would append) in card order,
+    without touching the JSONL file or last_run.txt. Takes the same crawl
+    options as scrape_data() (concurrency, rps, limiter, cache, known,
+    stop_early, parse_workers, max_inflight, record). Pass a dict as `stats`
+    to read the counts and min/max dates afterwards; save_last_run(
+    stats["max_date"]) then moves the cutoff forward like a normal run.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(_new_stats())
+    with contextlib.closing(_crawl_new(since, stats=stats, **options)) as crawl:
+        for _, detail_url, date_added, row, _ in crawl:
+            _count_record(stats, options.get("known"), detail_url, date_added)
+            yield row
 
-    # Update last_run.txt to the max scraped date (best effort)
+def save_last_run(max_date: date | None) -> None:
+    """Move last_run.txt to the newest date scraped (created with today if missing)."""
     if max_date:
         STATE_FILE.write_text(max_date.strftime("%Y-%m-%d"), encoding="ascii")
         print(f"Updated {STATE_FILE.name} -> {max_date.strftime('%Y-%m-%d')}")
@@ -333,6 +1207,374 @@ def scrape_data(*, sleep_s: float, since: date, jsonl_out: Path) -> None:
             STATE_FILE.write_text(today_iso, encoding="ascii")
             print(f"No new items. Initialized {STATE_FILE.name} to {today_iso}")
 
+def scrape_data(*, since: date, jsonl_out: Path, concurrency: int = 1,
+                rps: float | None = None, limiter: RateLimiter | None = None,
+                cache: HttpCache | None = None, known: KnownIds | None = None,
+                checkpoint: Path | None = None, checkpoint_every: int = 50,
+                resume: dict | None = None, record: Path | None = None,
+                stop_early: bool = False, parse_workers: int = 0,
+                max_inflight: int | None = None) -> dict:
+    """
+    Fetch list pages, follow 'See More' links, read <dt>/<dd> pairs on detail pages,
+    and append NEW rows (Added on >= since) to JSONL file.
+
+    Detail pages for one list page are fetched by `concurrency` worker threads
+    sharing a single connection pool; `rps` caps the combined request rate
+    (None/0 = unthrottled), or pass an AimdRateLimiter as `limiter` to let the
+    rate adapt. Results are consumed in card order, so the JSONL output and
+    the last_run.txt update are the same as a serial run.
+
+    With an HttpCache, detail pages already on disk are not re-downloaded and
+    list pages are revalidated with conditional GETs. Cards whose URL is in
+    `known` are skipped without a detail request, and every appended URL is
+    added to it (the caller persists it with known.save()).
+
+    If `checkpoint` is set, the current page, the last emitted URL, the
+    running min/max dates and the appended count are written there
+    atomically every `checkpoint_every` records (after flushing the JSONL),
+    and the file is removed once the run finishes normally. Pass a loaded
+    checkpoint as `resume` to continue from its page, skipping cards up to
+    and including its last URL.
+
+    `record` archives every list/detail response the run sees (see
+    replay.py). stop_early streams detail pages and stops reading at the end
+    of the result's <dl> (what gets cached/recorded is then that prefix).
+
+    With parse_workers > 0, detail pages are parsed (and serialized) by that
+    many processes while the fetch threads keep downloading; this thread
+    only writes. max_inflight caps the cards fetched ahead of the writer
+    (default 2 x (concurrency + parse_workers)).
+
+    Returns run stats: counts plus seconds spent per stage (list fetch/parse,
+    waiting on detail fetches, detail parse, JSONL write).
+    """
+    stats = _new_stats()
+    timings = stats["timings"]
+    t_start = time.perf_counter()
+    page = 1
+    last_url = None
+    if resume:
+        stats.update(appended=resume.get("appended", 0),
+                     min_date=resume.get("min_date"), max_date=resume.get("max_date"))
+        page = resume.get("page", 1)
+        last_url = resume.get("last_url")
+        print(f"Resuming at page {page} after {last_url} ({stats['appended']} records already written)")
+
+    # open the jsonl for append once (.gz / .zst are compressed as we go)
+    jsonl_out.parent.mkdir(parents=True, exist_ok=True)
+    f_out = open_jsonl(jsonl_out, "a")
+    crawl = _crawl_new(since, stats=stats, concurrency=concurrency, rps=rps, limiter=limiter,
+                       cache=cache, known=known, resume=resume, record=record,
+                       stop_early=stop_early, parse_workers=parse_workers,
+                       max_inflight=max_inflight)
+
+    def save_checkpoint() -> None:
+        f_out.flush()
+        os.fsync(f_out.fileno())
+        _write_checkpoint(checkpoint, {
+            "since": since.isoformat(),
+            "jsonl_out": str(jsonl_out),
+            "page": page,
+            "last_url": last_url,
+            "min_date": stats["min_date"].isoformat() if stats["min_date"] else None,
+            "max_date": stats["max_date"].isoformat() if stats["max_date"] else None,
+            "appended": stats["appended"],
+        })
+
+    completed = False
+    try:
+        for card_page, detail_url, date_added, _, line in crawl:
+            # Append to JSONL; the checkpoint position and counts only move
+            # once the line is written
+            t0 = time.perf_counter()
+            f_out.write(line)
+            timings["write"] += time.perf_counter() - t0
+            page, last_url = card_page, detail_url
+            _count_record(stats, known, detail_url, date_added)
+            if checkpoint is not None and stats["appended"] % checkpoint_every == 0:
+                save_checkpoint()
+        completed = True
+
+    finally:
+        crawl.close()
+        if checkpoint is not None and not completed:
+            # interrupted (Ctrl-C / error): keep what we have. A page that was
+            # finished is simply re-listed and found empty on --resume.
+            save_checkpoint()
+            print(f"\nCheckpoint saved to {checkpoint}; rerun with --resume to continue.")
+        f_out.close()
+        refresh_line_index(jsonl_out)
+
+    # Summary
+    limiter, meter = stats.pop("limiter"), stats.pop("meter")
+    stats.update(elapsed=time.perf_counter() - t_start, bandwidth=meter.counts())
+    print(limiter.summary())
+    print(meter.summary())
+    if cache is not None:
+        print(cache.summary())
+    if known is not None:
+        print(f"Known-URL index: skipped {known.skipped} already-ingested posts")
+    if stats["min_date"] or stats["max_date"]:
+        print(f"Scraped date range this run: {stats['min_date']} to {stats['max_date']}")
+    else:
+        print("Scraped date range this run: (no valid 'Added on' dates parsed)")
+
+    # Update last_run.txt to the max scraped date (best effort)
+    save_last_run(stats["max_date"])
+
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+    return stats
+
+# ---------------------------------------------------------------------------
+# Result-ID range crawl (no list pages)
+# ---------------------------------------------------------------------------
+
+HWM_FILE = HERE / "last_id.txt"          # highest result ID fetched by --id-range
+GAPS_FILE = HERE / ".cache" / "id_gaps.txt"
+FAILED_FILE = HERE / ".cache" / "id_failed.txt"  # non-404 failures, retried next run
+
+def _result_url(rid: int) -> str:
+    return up.urljoin(LIST_URL, f"/result/{rid}")
+
+def _id_ranges(ids) -> list[tuple[int, int]]:
+    """Collapse sorted IDs into inclusive (first, last) runs."""
+    runs: list[tuple[int, int]] = []
+    for rid in ids:
+        if runs and rid == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], rid)
+        else:
+            runs.append((rid, rid))
+    return runs
+
+def _crawl_shard(job: dict) -> dict:
+    """
+    Worker-process body: fetch /result/<id> for every ID in job["ids"] (in
+    order), append parsed records to job["out"], and report which IDs were
+    stored, 404 (gaps) or failed. An ID whose fetch or parse raises (a dropped
+    connection, a parser crash) is just marked failed and the shard carries
+    on. Only a fatal error, such as a failed write, ends the shard early: what
+    it already wrote is kept and every ID not yet handled is reported as failed.
+    """
+    global PARSER_BACKEND, LIST_URL
+    # spawned workers don't inherit the CLI choices
+    PARSER_BACKEND, LIST_URL = job["parser"], job["list_url"]
+    ids = job["ids"]
+    known = job["known"]
+    concurrency = job["concurrency"]
+    throttled = ThrottledHttp(_http(maxsize=concurrency), RateLimiter(job["rps"]))
+    http = throttled
+    if job["cache_dir"]:
+        # shards share the directory but not an LRU index; the parent trims it
+        http = CachingHttp(http, HttpCache(Path(job["cache_dir"]), max_bytes=None))
+
+    def fetch(rid: int):
+        kw = {"stop_at": DETAIL_END} if job["stop_early"] else {}
+        try:
+            resp = http.request("GET", _result_url(rid), **kw)
+        except Exception as exc:
+            return None, f"{type(exc).__name__}: {exc}"
+        return resp.status, resp.data if resp.status == 200 else None
+
+    def parse(fetched, rid: int):
+        """(status, body or error) -> ("stored", JSONL line) / ("missing", None) / ("failed", error)."""
+        status, body = fetched
+        if status == 404:
+            return "missing", None
+        if status != 200:
+            return "failed", body if status is None else None
+        try:
+            parsed = parse_detail(body.decode("utf-8", errors="replace"), _result_url(rid),
+                                  card_added=None, since=None)
+        except Exception as exc:
+            return "failed", f"{type(exc).__name__}: {exc}"
+        if parsed is None:
+            return "failed", None
+        return "stored", json.dumps(parsed[1], ensure_ascii=False) + "\n"
+
+    todo = [rid for rid in ids if known is None or _result_url(rid) not in known]
+    stored, missing, failed = [], [], []
+    error, id_errors, id_error = None, 0, None
+    with open(job["out"], "w", encoding="utf-8") as f_out, \
+            ThreadPoolExecutor(max_workers=concurrency) as workers:
+        # only a bounded window of IDs is in flight, not a future per ID
+        results = _detail_pipeline(todo, fetch, parse, workers=workers, parsers=None,
+                                   max_inflight=2 * concurrency)
+        try:
+            with contextlib.closing(results):
+                for rid, (outcome, value) in results:
+                    if outcome == "stored":
+                        f_out.write(value)
+                        stored.append(rid)
+                    elif outcome == "missing":
+                        missing.append(rid)
+                    else:
+                        failed.append(rid)
+                        if value:
+                            id_errors += 1
+                            id_error = id_error or f"{rid}: {value}"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            workers.shutdown(cancel_futures=True)
+            done = set(stored) | set(missing) | set(failed)
+            failed.extend(rid for rid in todo if rid not in done)
+    return {"stored": stored, "missing": missing, "failed": failed, "error": error,
+            "id_errors": id_errors, "id_error": id_error,
+            "skipped": len(ids) - len(todo), "bandwidth": throttled.meter.counts()}
+
+def read_failed_ids() -> set[int]:
+    """IDs a previous --id-range run couldn't fetch (non-404 status, crash)."""
+    try:
+        return {int(line) for line in FAILED_FILE.read_text(encoding="ascii").split()}
+    except (OSError, ValueError):
+        return set()
+
+def _update_failed_ids(attempted, failed) -> set[int]:
+    """Rewrite FAILED_FILE: drop the IDs attempted this run, add the new failures."""
+    pending = (read_failed_ids() - set(attempted)) | set(failed)
+    FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = FAILED_FILE.with_suffix(".tmp")
+    tmp.write_text("".join(f"{rid}\n" for rid in sorted(pending)), encoding="ascii")
+    os.replace(tmp, FAILED_FILE)
+    return pending
+
+def scrape_id_range(start: int, end: int, *, jsonl_out: Path, shards: int = 4,
+                    concurrency: int = 1, rps: float | None = None,
+                    cache_dir: Path | None = None, cache_max_bytes: int = 200 * 1024 * 1024,
+                    known: KnownIds | None = None, stop_early: bool = False,
+                    retry_failed: bool = True) -> int | None:
+    """
+    Fetch result pages START..END (inclusive, either direction) directly by ID,
+    split into `shards` contiguous blocks crawled by separate processes. `rps`
+    is the total budget, split evenly across shards. The shards share the
+    response cache directory; cache_max_bytes caps it as a whole, enforced
+    by one LRU pass once they are done.
+
+    Shard outputs are concatenated in ID order, so the JSONL is deterministic.
+    404s are reported as gap ranges (and appended to .cache/id_gaps.txt), and
+    the highest ID stored is written to last_id.txt as the next cursor.
+    IDs that fail any other way go to .cache/id_failed.txt; with retry_failed
+    they are crawled again (merged into the range) on the next run, so moving
+    the cursor past them doesn't lose them. A shard that dies is reported and
+    its IDs marked failed; the other shards' records are still appended.
+    Returns that high-water mark (or None if nothing was stored).
+    stop_early stops each download at the end of the result's <dl>.
+    """
+    step = 1 if end >= start else -1
+    ids = list(range(start, end + step, step))
+    retry = sorted(read_failed_ids() - set(ids)) if retry_failed else []
+    if retry:
+        print(f"Retrying {len(retry)} IDs from {FAILED_FILE.name}")
+        ids = sorted(set(ids) | set(retry), reverse=step < 0)
+    shards = max(1, min(shards, len(ids)))
+    size = -(-len(ids) // shards)
+    blocks = [ids[i:i + size] for i in range(0, len(ids), size)]
+    print(f"Crawling result IDs {start}..{end} ({len(ids)} IDs) in {len(blocks)} shards")
+
+    jsonl_out.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix="id_range_", dir=jsonl_out.parent))
+    jobs = [{
+        "ids": block,
+        "out": str(tmp_dir / f"shard_{k:03d}.jsonl"),
+        "known": known,
+        "concurrency": max(1, concurrency),
+        "rps": (rps / len(blocks)) if rps else None,
+        "cache_dir": str(cache_dir) if cache_dir else None,
+        "parser": PARSER_BACKEND,
+        "list_url": LIST_URL,
+        "stop_early": stop_early,
+    } for k, block in enumerate(blocks)]
+
+    t0 = time.monotonic()
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as procs:
+            futures = [procs.submit(_crawl_shard, job) for job in jobs]
+        # concatenate shard files in block order -> records stay in ID order
+        with open_jsonl(jsonl_out, "a") as f_out:
+            for k, (job, fut) in enumerate(zip(jobs, futures)):
+                try:
+                    result = fut.result()
+                except Exception as exc:
+                    # the worker process itself died; its file can't be trusted
+                    result = {"stored": [], "missing": [], "failed": job["ids"], "skipped": 0,
+                              "error": f"{type(exc).__name__}: {exc}", "id_errors": 0,
+                              "id_error": None, "bandwidth": {}}
+                else:
+                    with open(job["out"], "r", encoding="utf-8") as f_in:
+                        shutil.copyfileobj(f_in, f_out)
+                if result["error"]:
+                    print(f"Shard {k} ({job['ids'][0]}..{job['ids'][-1]}) stopped early: "
+                          f"{result['error']}; {len(result['failed'])} IDs left for a retry")
+                elif result["id_errors"]:
+                    print(f"Shard {k}: {result['id_errors']} IDs raised errors "
+                          f"(first: {result['id_error']}); left for a retry")
+                results.append(result)
+        refresh_line_index(jsonl_out)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if cache_dir:
+            # one LRU pass with the whole cap over everything the shards wrote
+            evicted = HttpCache(cache_dir, cache_max_bytes).trim()
+            if evicted:
+                print(f"Cache: evicted {evicted} entries to stay under "
+                      f"{cache_max_bytes / 1_048_576:.0f} MiB")
+
+    stored = sorted(rid for r in results for rid in r["stored"])
+    missing = sorted(rid for r in results for rid in r["missing"])
+    failed = sorted(rid for r in results for rid in r["failed"])
+    skipped = sum(r["skipped"] for r in results)
+    elapsed = time.monotonic() - t0
+    print(f"appended {len(stored)} records from {len(ids)} IDs in {elapsed:.1f}s "
+          f"({len(ids) / max(elapsed, 1e-9):.1f} IDs/s); {skipped} already known")
+    meter = BandwidthMeter()
+    for r in results:
+        meter.merge(r["bandwidth"])
+    print(meter.summary())
+    if known is not None:
+        known.add_urls(_result_url(rid) for rid in stored)
+
+    gaps = [f"{a}-{b}" if a != b else str(a) for a, b in _id_ranges(missing)]
+    if gaps:
+        more = f" (+{len(gaps) - 10} more)" if len(gaps) > 10 else ""
+        print(f"Gaps (404): {len(missing)} IDs in {len(gaps)} runs: {', '.join(gaps[:10])}{more}")
+        GAPS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(GAPS_FILE, "a", encoding="ascii") as f:
+            f.writelines(g + "\n" for g in gaps)
+    pending = _update_failed_ids(ids, failed)
+    if failed:
+        print(f"Failed (non-404 / unparseable): {len(failed)} IDs, e.g. {failed[:10]}; "
+              f"{len(pending)} listed in {FAILED_FILE.name} for the next run")
+
+    if not stored:
+        return None
+    hwm = stored[-1]
+    prev = read_hwm()
+    if prev is None or hwm > prev:
+        HWM_FILE.write_text(str(hwm), encoding="ascii")
+        print(f"Updated {HWM_FILE.name} -> {hwm}")
+    return hwm
+
+def read_hwm() -> int | None:
+    """Highest result ID stored by a previous --id-range run, if any."""
+    try:
+        return int(HWM_FILE.read_text(encoding="ascii").strip())
+    except (OSError, ValueError):
+        return None
+
+def parse_id_range(spec: str) -> tuple[int, int]:
+    """'START:END' (inclusive), or ':END' to continue from last_id.txt + 1."""
+    start_s, sep, end_s = spec.partition(":")
+    if not sep or not end_s.strip():
+        raise ValueError(f"expected START:END or :END, got {spec!r}")
+    end = int(end_s)
+    if start_s.strip():
+        return int(start_s), end
+    hwm = read_hwm()
+    if hwm is None:
+        raise ValueError(f"{HWM_FILE.name} not found; give an explicit START")
+    return hwm + 1, end
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -356,10 +1598,82 @@ def resolve_since(cli_since: str | None) -> date:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scrape GradCafe posts (only NEW records by default).")
     parser.add_argument("--since", type=str, default=None, help="Only include posts Added on or after YYYY-MM-DD (overrides last_run.txt)")
-    parser.add_argument("--sleep", type=float, default=0.35, help="Delay between detail requests (seconds)")
-    parser.add_argument("--jsonl-out", type=str, default=str(JSONL_PATH_DEFAULT), help="Append results to this JSONL file")
+    parser.add_argument("--sleep", type=float, default=DEFAULT_SLEEP, help="Delay between requests (seconds); sets the default --rps")
+    parser.add_argument("--concurrency", type=int, default=1, help="Detail pages fetched in parallel (shared connection pool)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processes parsing detail pages while the fetch threads keep downloading (0 = parse inline)")
+    parser.add_argument("--max-inflight", type=int, default=None, help="Cards fetched/parsed ahead of the JSONL writer (default 2 x (concurrency + parse workers))")
+    parser.add_argument("--rps", type=float, default=None, help="Global requests/second budget across all workers (default: 1/--sleep)")
+    parser.add_argument("--adaptive", action="store_true", help="AIMD throttle: start at --rps, speed up on fast 200s, back off on 429/Retry-After/latency spikes")
+    parser.add_argument("--max-rps", type=float, default=20.0, help="Upper bound for --adaptive")
+    parser.add_argument("--cache-dir", type=str, default=str(CACHE_DIR_DEFAULT), help="On-disk HTTP response cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=200, help="Cache size cap; least recently used entries are evicted past it")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
+    parser.add_argument("--known-index", type=str, default=str(KNOWN_INDEX_DEFAULT), help="Persisted set of already-ingested result IDs")
+    parser.add_argument("--rebuild-known", action="store_true", help="Rebuild the known-URL index from the JSONL file and the applicants table")
+    parser.add_argument("--no-known", action="store_true", help="Fetch every card newer than the cutoff, even if already ingested")
+    parser.add_argument("--id-range", type=str, default=None, help="Crawl /result/<id> directly for START:END (or :END to resume from last_id.txt)")
+    parser.add_argument("--shards", type=int, default=4, help="Worker processes for --id-range")
+    parser.add_argument("--no-retry-failed", action="store_true", help="--id-range: don't re-crawl the IDs in .cache/id_failed.txt")
+    parser.add_argument("--checkpoint", type=str, default=str(CHECKPOINT_DEFAULT), help="Progress file written during list-page runs")
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="Flush the JSONL and rewrite the checkpoint every N records")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from --checkpoint")
+    parser.add_argument("--base-url", type=str, default=None, help="Scrape a different host, e.g. a replay.py server (http://127.0.0.1:8765)")
+    parser.add_argument("--record", type=str, default=None, help="Archive every list/detail response to this .warc.gz (see replay.py)")
+    parser.add_argument("--save-bandwidth", action="store_true", help="Stream detail pages and stop downloading after the result's </dl>")
+    parser.add_argument("--parser", choices=["auto", "selectolax", "lxml", "html.parser"], default="auto", help="Detail-page HTML parser (auto = fastest installed)")
+    parser.add_argument("--jsonl-out", type=str, default=str(JSONL_PATH_DEFAULT),
+                        help="Append results to this JSONL file (.jsonl.gz / .jsonl.zst are compressed)")
     args = parser.parse_args()
 
-    cutoff = resolve_since(args.since)
-    print(f"Cutoff (Added on >=): {cutoff.isoformat()}")
-    scrape_data(sleep_s=args.sleep, since=cutoff, jsonl_out=Path(args.jsonl_out))
+    if args.parser != "auto":
+        if args.parser not in available_backends():
+            parser.error(f"--parser {args.parser} is not installed (available: {available_backends()})")
+        PARSER_BACKEND = args.parser
+    print(f"Detail parser: {PARSER_BACKEND}")
+    if args.base_url:
+        LIST_URL = up.urljoin(args.base_url, "/survey/index.php")
+
+    rps = args.rps if args.rps is not None else (1.0 / args.sleep if args.sleep > 0 else None)
+    limiter = AimdRateLimiter(rps or 1.0, max_rps=args.max_rps) if args.adaptive else None
+    cache = None if args.no_cache else HttpCache(Path(args.cache_dir), args.cache_max_mb * 1024 * 1024)
+    known = None
+    if not args.no_known:
+        known = load_known_ids(Path(args.known_index), [args.jsonl_out], rebuild=args.rebuild_known)
+    try:
+        if args.id_range:
+            # shards are separate processes with fixed per-shard budgets and no
+            # shared archive writer, so these list-crawl options don't apply
+            unsupported = [flag for flag, on in (("--adaptive", args.adaptive), ("--record", args.record),
+                                                 ("--parse-workers", args.parse_workers)) if on]
+            if unsupported:
+                parser.error(f"--id-range can't be combined with {', '.join(unsupported)}")
+            try:
+                id_start, id_end = parse_id_range(args.id_range)
+            except ValueError as exc:
+                parser.error(f"--id-range: {exc}")
+            scrape_id_range(id_start, id_end, jsonl_out=Path(args.jsonl_out), shards=args.shards,
+                            concurrency=args.concurrency, rps=rps,
+                            cache_dir=None if args.no_cache else Path(args.cache_dir),
+                            cache_max_bytes=args.cache_max_mb * 1024 * 1024, known=known,
+                            stop_early=args.save_bandwidth, retry_failed=not args.no_retry_failed)
+        else:
+            checkpoint = Path(args.checkpoint)
+            resume = load_checkpoint(checkpoint) if args.resume else None
+            if args.resume and resume is None:
+                print(f"No usable checkpoint at {checkpoint}; starting a normal run.")
+            if resume:
+                cutoff = resume["since"]
+                args.jsonl_out = resume.get("jsonl_out") or args.jsonl_out
+            else:
+                cutoff = resolve_since(args.since)
+            print(f"Cutoff (Added on >=): {cutoff.isoformat()}")
+            scrape_data(since=cutoff, jsonl_out=Path(args.jsonl_out),
+                        concurrency=args.concurrency, rps=rps, limiter=limiter, cache=cache,
+                        known=known, checkpoint=checkpoint,
+                        checkpoint_every=max(1, args.checkpoint_every), resume=resume,
+                        record=Path(args.record) if args.record else None,
+                        stop_early=args.save_bandwidth, parse_workers=args.parse_workers,
+                        max_inflight=args.max_inflight)
+    finally:
+        if known is not None:
+            known.save(Path(args.known_index))
@@ -0,0 +1,8 @@
+"""Put module_2 on sys.path so the scraper scripts import as modules."""
+
+import sys
+from pathlib import Path
+
+MODULE_DIR = Path(__file__).resolve().parents[1]
+if str(MODULE_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULE_DIR))
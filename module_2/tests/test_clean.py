@@ -0,0 +1,106 @@
+"""clean.py: the streaming JSON-array reader and --stream output."""
+
+import io
+import json
+
+import pytest
+
+import clean
+
+ROWS = [
+    {"program": "Computer Science, Café Université", "comments": "<b>Great</b>\n  news — \"finally\"",
+     "date_added": "September 02, 2025", "url": "https://www.thegradcafe.com/result/2",
+     "status": "Accepted on 9/1/2025", "GPA": "3.80", "GRE": 165},
+    {"program": "Math \\ Stats, Test U 🎓", "comments": None, "status": "Rejected on Aug 30, 2025",
+     "url": "https://www.thegradcafe.com/result/1", "GRE AW": 4.5, "Degree": "PhD"},
+    {"program": "Physics", "status": "Wait listed", "GRE V": 1234567890},
+]
+
+
+def _array_bytes(rows):
+    return json.dumps(rows, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+@pytest.mark.parametrize("read_bytes", [1, 2, 3, 7, 64])
+def test_array_elements_strings_and_escapes_span_buffers(monkeypatch, read_bytes):
+    monkeypatch.setattr(clean, "READ_BYTES", read_bytes)
+    data = _array_bytes(ROWS)
+
+    pairs = list(clean.iter_rows(io.BytesIO(data)))
+
+    assert [row for row, _ in pairs] == ROWS
+    assert pairs[-1][1] <= len(data)
+    assert [done for _, done in pairs] == sorted(done for _, done in pairs)
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", b'[{"a": 1}', b'[{"a": 1},'])
+def test_array_reader_rejects_malformed_input(monkeypatch, data):
+    monkeypatch.setattr(clean, "READ_BYTES", 2)
+
+    with pytest.raises(ValueError):
+        list(clean._iter_array(io.BytesIO(data)))
+
+
+def test_jsonl_input_skips_blank_lines():
+    data = b"\n".join(json.dumps(row).encode() for row in ROWS) + b"\n\n"
+
+    data = b"  \n" + data
+
+    pairs = list(clean.iter_rows(io.BytesIO(data)))
+
+    assert [row for row, _ in pairs] == ROWS
+    assert pairs[-1][1] == len(data) - 1  # the trailing blank line is not a row
+
+
+@pytest.mark.parametrize("as_jsonl", [False, True])
+def test_stream_output_matches_clean_data_row_for_row(tmp_path, monkeypatch, as_jsonl):
+    monkeypatch.setattr(clean, "READ_BYTES", 5)
+    src = tmp_path / "applicant_data.json"
+    if as_jsonl:
+        src.write_text("".join(json.dumps(row) + "\n" for row in ROWS), encoding="utf-8")
+    else:
+        src.write_bytes(_array_bytes(ROWS))
+    out = tmp_path / "clean.jsonl"
+
+    assert clean.main(["--in", str(src), "--out", str(out), "--stream"]) == 0
+
+    streamed = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert streamed == clean.clean_data(ROWS)
+    assert streamed[0]["comments"] == 'Great news — "finally"'
+    assert streamed[0]["acceptance_date"] == "9/1/2025"
+    assert streamed[1]["rejection_date"] == "Aug 30, 2025"
+
+
+def _numbered_rows(n):
+    return [{**ROWS[i % len(ROWS)], "url": f"https://www.thegradcafe.com/result/{i}"} for i in range(n)]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_workers_output_is_byte_identical_to_serial_and_in_order(tmp_path, monkeypatch, stream):
+    monkeypatch.setattr(clean, "BATCH_ROWS", 3)
+    rows = _numbered_rows(20)
+    src = tmp_path / "applicant_data.json"
+    src.write_bytes(_array_bytes(rows))
+    serial, parallel = tmp_path / "serial.json", tmp_path / "parallel.json"
+    extra = ["--stream"] if stream else []
+
+    assert clean.main(["--in", str(src), "--out", str(serial), *extra]) == 0
+    assert clean.main(["--in", str(src), "--out", str(parallel), "--workers", "2", *extra]) == 0
+
+    assert parallel.read_bytes() == serial.read_bytes()
+    if stream:
+        urls = [json.loads(line)["url"] for line in parallel.read_text(encoding="utf-8").splitlines()]
+    else:
+        urls = [row["url"] for row in json.loads(parallel.read_text(encoding="utf-8"))]
+    assert urls == [row["url"] for row in rows]
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_parallel_save_matches_save_data_for_tiny_inputs(tmp_path, n):
+    rows = _numbered_rows(n)
+    serial, parallel = tmp_path / "serial.json", tmp_path / "parallel.json"
+
+    clean.save_data(clean.clean_data(rows), str(serial))
+    assert clean.save_data_parallel(rows, 2, str(parallel)) == n
+
+    assert parallel.read_bytes() == serial.read_bytes()
@@ -0,0 +1,96 @@
+"""Archive compaction in compact.py: dedupe by URL, sort by result ID."""
+
+import gzip
+import json
+
+import pytest
+
+import compact
+import jsonl_index
+
+
+def _line(rid, **extra):
+    return json.dumps({"url": f"https://www.thegradcafe.com/result/{rid}", **extra}) + "\n"
+
+
+ARCHIVE = "".join([
+    _line(30, v=1),
+    "not json\n",
+    _line(10, v=1),
+    json.dumps({"program": "no url"}) + "\n",
+    _line(30, v=2),
+    _line(20, v=1),
+    _line(10, v=2),
+    "\n",
+    _line(10, v=3),
+])
+
+
+def _records(path):
+    return [json.loads(line) if line.startswith("{") else line
+            for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("chunk_lines", [2, compact.CHUNK_LINES])
+def test_newest_line_wins_sorted_by_id_with_unkeyed_lines_last(tmp_path, chunk_lines):
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text(ARCHIVE, encoding="utf-8")
+
+    stats = compact.compact(archive, chunk_lines=chunk_lines)
+
+    assert _records(archive) == [
+        {"url": "https://www.thegradcafe.com/result/10", "v": 3},
+        {"url": "https://www.thegradcafe.com/result/20", "v": 1},
+        {"url": "https://www.thegradcafe.com/result/30", "v": 2},
+        "not json",
+        {"program": "no url"},
+    ]
+    assert (stats["lines"], stats["duplicates"], stats["written"]) == (8, 3, 5)
+    assert not list(tmp_path.glob("compact_*"))
+
+
+def test_gzip_archive_is_compacted_in_place(tmp_path):
+    archive = tmp_path / "archive.jsonl.gz"
+    with gzip.open(archive, "wt", encoding="utf-8") as f:
+        f.write(ARCHIVE)
+
+    compact.compact(archive)
+
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        urls = [json.loads(line).get("url") for line in f if line.startswith("{")]
+    assert urls[:3] == [f"https://www.thegradcafe.com/result/{rid}" for rid in (10, 20, 30)]
+    assert len(urls) == 4
+
+
+def test_archive_changed_mid_run_is_left_alone(tmp_path, monkeypatch):
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text(ARCHIVE, encoding="utf-8")
+    merge = compact._merge
+
+    def merge_while_scraper_appends(runs, out, stats):
+        with open(archive, "a", encoding="utf-8") as f:
+            f.write(_line(40))
+        merge(runs, out, stats)
+
+    monkeypatch.setattr(compact, "_merge", merge_while_scraper_appends)
+
+    with pytest.raises(RuntimeError, match="changed during compaction"):
+        compact.compact(archive)
+    assert archive.read_text(encoding="utf-8") == ARCHIVE + _line(40)
+    assert not list(tmp_path.glob("compact_*"))
+    assert compact.main([str(archive)]) == 1
+
+
+def test_existing_line_index_is_rebuilt(tmp_path):
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text(ARCHIVE, encoding="utf-8")
+    jsonl_index.update_index(archive)
+
+    stats = compact.compact(archive)
+
+    assert stats["indexed"]
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert len(ix) == 5
+        assert ix.get("https://www.thegradcafe.com/result/10")["v"] == 3
+        assert ix.line(1)["url"].endswith("/20")
+    assert jsonl_index.update_index(archive) == (0, False)
@@ -0,0 +1,134 @@
+"""Sidecar line-offset / URL index of jsonl_index.py."""
+
+import json
+import os
+
+import pytest
+
+import jsonl_index
+
+
+def _line(i, **extra):
+    return json.dumps({"url": f"https://www.thegradcafe.com/result/{i}", "n": i, **extra}) + "\n"
+
+
+def _url(i):
+    return f"https://www.thegradcafe.com/result/{i}"
+
+
+@pytest.fixture(name="archive")
+def archive_fixture(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_index, "MIN_SLOTS", 8)
+    path = tmp_path / "archive.jsonl"
+    path.write_text("".join(_line(i) for i in range(3)), encoding="utf-8")
+    return path
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_get_returns_the_newest_line_for_a_url(archive):
+    _append(archive, _line(1, status="updated") + "not json\n")
+
+    with jsonl_index.JsonlIndex(archive) as ix:
+        assert len(ix) == 5
+        assert ix.get(_url(1)) == {"url": _url(1), "n": 1, "status": "updated"}
+        assert ix.offset_of(_url(1)) == ix.offset(3)
+        assert ix.get(_url(0))["n"] == 0
+        assert ix.get(_url(99)) is None
+
+
+def test_line_reads_record_n(archive):
+    with jsonl_index.JsonlIndex(archive) as ix:
+        assert [ix.line(n)["n"] for n in range(3)] == [0, 1, 2]
+        assert ix.line(-1)["n"] == 2
+
+
+def test_ranges_are_line_aligned_and_cover_the_archive(archive):
+    _append(archive, "".join(_line(i) for i in range(3, 20)))
+    data = archive.read_bytes()
+
+    with jsonl_index.JsonlIndex(archive) as ix:
+        spans = ix.ranges(4)
+
+    assert 1 < len(spans) <= 4
+    assert spans[0][0] == 0 and spans[-1][1] == len(data)
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+    lines = [line for start, end in spans for line in data[start:end].splitlines()]
+    assert [json.loads(line)["n"] for line in lines] == list(range(20))
+
+
+def test_update_indexes_only_appended_lines(archive):
+    assert jsonl_index.update_index(archive) == (3, True)
+    _append(archive, _line(3) + _line(4))
+
+    assert jsonl_index.update_index(archive) == (2, False)
+    assert jsonl_index.update_index(archive) == (0, False)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert len(ix) == 5 and ix.urls == 5
+        assert ix.get(_url(4))["n"] == 4
+
+
+def test_table_is_rewritten_once_load_passes_max(archive):
+    jsonl_index.update_index(archive)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert ix.slots == 8
+    _append(archive, _line(3) + _line(4))  # 5 URLs > 8 * 0.6
+
+    assert jsonl_index.update_index(archive) == (2, False)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert ix.slots == 16 and ix.urls == 5
+        assert [ix.get(_url(i))["n"] for i in range(5)] == list(range(5))
+
+
+def test_table_is_sized_from_distinct_urls(archive):
+    archive.write_text("".join(_line(i % 2, rev=i) for i in range(12)), encoding="utf-8")
+
+    with jsonl_index.JsonlIndex(archive) as ix:
+        assert len(ix) == 12 and ix.urls == 2
+        assert ix.slots == 8
+        assert ix.get(_url(0))["rev"] == 10
+
+
+def test_rewritten_archive_is_reindexed(archive, tmp_path):
+    jsonl_index.update_index(archive)
+    replacement = tmp_path / "replacement.jsonl"
+    replacement.write_text(archive.read_text(encoding="utf-8") + _line(3), encoding="utf-8")
+    os.replace(replacement, archive)  # new inode
+
+    assert jsonl_index.update_index(archive) == (4, True)
+
+
+def test_truncated_archive_is_reindexed(archive):
+    jsonl_index.update_index(archive)
+    with open(archive, "r+b") as f:
+        f.truncate(len(_line(0)))
+
+    assert jsonl_index.update_index(archive) == (1, True)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert ix.get(_url(2)) is None
+
+
+def test_changed_tail_is_reindexed(archive):
+    jsonl_index.update_index(archive)
+    data = archive.read_bytes()
+    archive.write_bytes(data.replace(b'"n": 2', b'"n": 7'))  # same length, same inode
+
+    assert jsonl_index.update_index(archive) == (3, True)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert ix.get(_url(2))["n"] == 7
+
+
+def test_partial_last_line_waits_for_the_next_update(archive):
+    jsonl_index.update_index(archive)
+    full = _line(3)
+    _append(archive, full[:10])
+
+    assert jsonl_index.update_index(archive) == (0, False)
+    _append(archive, full[10:])
+    assert jsonl_index.update_index(archive) == (1, False)
+    with jsonl_index.JsonlIndex(archive, refresh=False) as ix:
+        assert len(ix) == 4 and ix.get(_url(3))["n"] == 3
@@ -0,0 +1,122 @@
+"""Compressed JSONL round trips through jsonl_io.open_jsonl."""
+
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import jsonl_io
+
+
+def _rows(start, stop):
+    return [{"url": f"https://www.thegradcafe.com/result/{i}", "n": i} for i in range(start, stop)]
+
+
+def _append(path, rows, flush=False):
+    with jsonl_io.open_jsonl(path, "a") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+            if flush:
+                f.flush()
+
+
+def _read(path):
+    with jsonl_io.open_jsonl(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_gzip_appends_add_members_and_read_back_in_order(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+    for start in (0, 3, 6):
+        _append(path, _rows(start, start + 3))
+
+    assert _read(path) == _rows(0, 9)
+    # each append session wrote its own gzip member
+    assert path.read_bytes().count(b"\x1f\x8b\x08") >= 3
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 9
+
+
+def test_zstd_append_flush_and_read_back(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "out.jsonl.zst"
+    _append(path, _rows(0, 2))
+
+    with jsonl_io.open_jsonl(path, "a") as f:
+        f.write(json.dumps(_rows(2, 3)[0]) + "\n")
+        f.flush()
+        # a checkpoint flush makes everything so far readable while the writer stays open
+        assert _read(path) == _rows(0, 3)
+        f.write(json.dumps(_rows(3, 4)[0]) + "\n")
+
+    _append(path, _rows(4, 6), flush=True)
+    assert _read(path) == _rows(0, 6)
+
+
+SUFFIXES = [".gz", pytest.param(".zst", marks=pytest.mark.skipif(
+    jsonl_io.zstandard is None, reason="zstandard not installed"))]
+
+# flush + fsync (a scraper checkpoint), then enough incompressible data that
+# the compressor puts part of a member / frame on disk, then a hard kill
+CRASH_AFTER_CHECKPOINT = """
+import json, os, sys
+sys.path.insert(0, {module_dir!r})
+import jsonl_io
+f = jsonl_io.open_jsonl({path!r}, "a")
+for i in range(3):
+    f.write(json.dumps({{"n": i}}) + "\\n")
+f.flush()
+os.fsync(f.fileno())
+f.write(json.dumps({{"n": 99, "pad": os.urandom(300_000).hex()}}) + "\\n")
+os._exit(1)
+"""
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_flushed_data_survives_a_crash_and_later_appends(tmp_path, suffix):
+    path = tmp_path / f"out.jsonl{suffix}"
+    script = CRASH_AFTER_CHECKPOINT.format(module_dir=str(Path(jsonl_io.__file__).parent),
+                                           path=str(path))
+    subprocess.run([sys.executable, "-c", script], check=False)
+    torn = path.stat().st_size
+
+    _append(path, [{"n": 3}])
+
+    assert _read(path) == [{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}]
+    assert path.stat().st_size < torn  # the unterminated member / frame was dropped
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_flushed_data_reads_back_while_the_writer_is_open(tmp_path, suffix):
+    path = tmp_path / f"out.jsonl{suffix}"
+    with jsonl_io.open_jsonl(path, "w") as f:
+        f.write(json.dumps(_rows(0, 1)[0]) + "\n")
+        f.flush()
+        assert _read(path) == _rows(0, 1)
+        f.flush()  # nothing new: no empty member
+        f.write(json.dumps(_rows(1, 2)[0]) + "\n")
+    assert _read(path) == _rows(0, 2)
+
+
+def test_corrupt_archive_is_not_truncated_on_append(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+    _append(path, _rows(0, 2))
+    data = path.read_bytes()
+    crc = data[-8:-4]
+    path.write_bytes(data[:-8] + bytes(b ^ 0xFF for b in crc) + data[-4:])  # bad CRC32
+
+    with pytest.raises(ValueError, match="corrupt gzip data"):
+        jsonl_io.open_jsonl(path, "a")
+    assert path.stat().st_size == len(data)
+
+
+def test_plain_suffix_is_uncompressed_text(tmp_path):
+    path = tmp_path / "out.jsonl"
+    _append(path, _rows(0, 2))
+
+    assert jsonl_io.compression(path) is None
+    assert path.read_text(encoding="utf-8").splitlines()[0].startswith('{"url"')
+    assert _read(path) == _rows(0, 2)
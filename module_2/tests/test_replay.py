@@ -0,0 +1,29 @@
+"""replay.py: archived responses are served back with clean framing headers."""
+
+import gzip
+import http.client
+
+import replay
+
+
+def test_served_response_has_one_content_length(tmp_path):
+    archive = tmp_path / "run.warc.gz"
+    body = b"<html>result</html>"
+    headers = {"Content-Type": "text/html", "Content-Encoding": "gzip", "Connection": "keep-alive"}
+    archive.write_bytes(gzip.compress(replay._warc_record("https://example.org/result/1", 200, headers, body)))
+
+    srv = replay.ReplayServer(archive).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", srv.server_address[1], timeout=5)
+        conn.request("GET", "/result/1")
+        resp = conn.getresponse()
+        data = resp.read()
+        conn.close()
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    assert resp.status == 200 and data == body
+    assert resp.msg.get_all("Content-Length") == [str(len(body))]
+    assert resp.getheader("Content-Encoding") is None
+    assert resp.getheader("Content-Type") == "text/html"
@@ -0,0 +1,29 @@
+"""HttpCache size cap when several processes write one cache directory."""
+
+import os
+
+import scrape
+
+
+def _entry(root, url, size, mtime):
+    key = scrape.HttpCache.key(url)
+    (root / f"{key}.body").write_bytes(b"x" * size)
+    (root / f"{key}.json").write_text("{}", encoding="utf-8")
+    os.utime(root / f"{key}.body", (mtime, mtime))
+    return root / f"{key}.body"
+
+
+def test_uncapped_cache_leaves_eviction_to_trim(tmp_path):
+    """A shard's cache (max_bytes=None) never evicts; the parent's trim applies the one cap."""
+    shard = scrape.HttpCache(tmp_path, max_bytes=None)
+    for n in range(3):
+        shard.put(f"https://example.org/result/{n}", b"x" * 100, {})
+    assert shard.evicted == 0 and shard.total == 300
+
+    oldest = _entry(tmp_path, "https://example.org/result/old", 100, 1_000)
+
+    parent = scrape.HttpCache(tmp_path, max_bytes=350)
+    assert parent.trim() == 1
+    assert not oldest.exists()
+    assert parent.total == 300
+    assert parent.trim() == 0
@@ -0,0 +1,78 @@
+"""HTTP behaviour of scrape.py against a throwaway local server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scrape
+
+
+class _ThrottleOnce(BaseHTTPRequestHandler):
+    """Answer the first request with 429 + Retry-After, every later one with 200."""
+
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        throttled = type(self).hits == 1
+        body = b"slow down" if throttled else b"ok"
+        self.send_response(429 if throttled else 200)
+        if throttled:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="server_url")
+def server_url_fixture():
+    _ThrottleOnce.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottleOnce)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_adaptive_limiter_sees_429_with_retry_after(server_url):
+    """urllib3 must not swallow a Retry-After 429: the limiter backs off, then we retry."""
+    limiter = scrape.AimdRateLimiter(10.0, cooldown=0.0)
+    http = scrape.ThrottledHttp(scrape._http(retry_throttled=False), limiter)
+
+    resp = http.request("GET", server_url)
+
+    assert resp.status == 200
+    assert _ThrottleOnce.hits == 2
+    assert limiter.backoffs["retry-after"] == 1
+    assert limiter.rps < 10.0
+
+
+def test_fixed_rate_mode_still_retries_inside_urllib3(server_url):
+    """Without the adaptive limiter urllib3 keeps honouring Retry-After itself."""
+    limiter = scrape.RateLimiter(10.0)
+    http = scrape.ThrottledHttp(scrape._http(), limiter)
+
+    assert http.request("GET", server_url).status == 200
+    assert _ThrottleOnce.hits == 2
+
+
+def test_sustained_latency_step_becomes_the_new_baseline():
+    """A server that stays slow (0.1s -> 1.5s) costs a few backoffs, then the rate climbs again."""
+    limiter = scrape.AimdRateLimiter(4.0, min_rps=0.5, cooldown=0.0)
+    for _ in range(20):
+        limiter.observe(200, 0.1)
+
+    limiter.observe(200, 1.5)
+    assert limiter.backoffs["latency"] == 1 and limiter.avg_latency < 0.2  # a lone spike barely moves it
+
+    for _ in range(100):
+        limiter.observe(200, 1.5)
+
+    assert limiter.backoffs["latency"] < 15
+    assert limiter.avg_latency > 0.5
+    assert limiter.rps > limiter.min_rps + 10 * limiter.step
@@ -0,0 +1,93 @@
+"""--id-range shards: one bad ID doesn't end a shard, failures are kept for a retry."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+
+import scrape
+
+
+class _Results(BaseHTTPRequestHandler):
+    """/result/2 is a gap (404), /result/5 drops the connection; every other ID is a 200."""
+
+    def do_GET(self):
+        if self.path.endswith("/5"):
+            self.close_connection = True
+            return
+        status = 404 if self.path.endswith("/2") else 200
+        body = f"<dl>{self.path}</dl>".encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="list_url")
+def list_url_fixture():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Results)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/survey/index.php"
+    server.shutdown()
+    server.server_close()
+
+
+def _fake_parse(html, url, *, card_added, since):
+    if url.endswith("/3"):
+        raise RuntimeError("parser blew up")
+    return None, {"url": url, "note": "\ud800" if url.endswith("/6") else None}
+
+
+def _job(out, list_url, ids):
+    return {"ids": ids, "out": str(out), "known": None, "concurrency": 2,
+            "rps": None, "cache_dir": None, "cache_max_bytes": 0,
+            "parser": scrape.PARSER_BACKEND, "list_url": list_url, "stop_early": False}
+
+
+@pytest.fixture(name="no_retries")
+def no_retries_fixture(monkeypatch):
+    monkeypatch.setattr(scrape, "parse_detail", _fake_parse)
+    monkeypatch.setattr(scrape, "_http", lambda maxsize=1, **_: urllib3.PoolManager(maxsize=maxsize,
+                                                                                   retries=False))
+
+
+def test_bad_ids_fail_alone_and_the_shard_carries_on(list_url, tmp_path, no_retries):
+    out = tmp_path / "shard.jsonl"
+
+    result = scrape._crawl_shard(_job(out, list_url, [1, 2, 3, 4, 5, 7]))
+
+    assert result["stored"] == [1, 4, 7]
+    assert result["missing"] == [2]
+    assert result["failed"] == [3, 5]
+    assert result["error"] is None
+    assert result["id_errors"] == 2 and "parser blew up" in result["id_error"]
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == [scrape._result_url(i) for i in (1, 4, 7)]
+
+
+def test_write_error_ends_the_shard_and_fails_the_rest(list_url, tmp_path, no_retries):
+    out = tmp_path / "shard.jsonl"
+
+    result = scrape._crawl_shard(_job(out, list_url, [1, 6, 7, 8]))
+
+    assert result["stored"] == [1]
+    assert result["failed"] == [6, 7, 8]
+    assert result["error"].startswith("UnicodeEncodeError")
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == [scrape._result_url(1)]
+
+
+def test_failed_ids_persist_until_a_run_resolves_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(scrape, "FAILED_FILE", tmp_path / "id_failed.txt")
+
+    assert scrape._update_failed_ids(range(10, 20), [12, 15]) == {12, 15}
+    assert scrape._update_failed_ids(range(20, 30), [25]) == {12, 15, 25}
+    # a later run that attempts 12 and 15 again (and only 15 fails) clears 12
+    assert scrape._update_failed_ids([12, 15, 30], [15]) == {15, 25}
+    assert scrape.read_failed_ids() == {15, 25}
@@ -0,0 +1,26 @@
+"""Detail-page extraction on the committed fixture pages, for every parser backend."""
+
+import pytest
+
+import bench
+import scrape
+
+BACKENDS = scrape.available_backends()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_first_non_empty_added_on_wins(backend):
+    html = (bench.HERE / "fixtures" / "detail_page_added_on.html").read_text(encoding="utf-8")
+
+    pairs, page_text = scrape.extract_detail(html, backend)
+
+    assert scrape.find_added_on_detail(pairs, page_text) == "Sep 14, 2025"
+    assert pairs["program"] == "Computer Science"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_match_the_legacy_parse_on_every_fixture(backend):
+    parse = bench._new_parse(backend)
+    for path in bench.FIXTURE_PAGES:
+        html = path.read_text(encoding="utf-8")
+        assert parse(html) == bench._legacy_parse(html), path.name
@@ -0,0 +1,152 @@
+"""scrape_data() end to end against a throwaway local GradCafe: concurrency and --resume."""
+
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scrape
+
+SINCE = date(2025, 9, 1)
+# three pages of in-window cards, then a page of posts older than SINCE
+PAGES = {1: range(112, 108, -1), 2: range(108, 104, -1), 3: range(104, 100, -1), 4: range(100, 96, -1)}
+MISSING = 106      # detail page answers 404
+SLOW = (112, 108)  # first card of pages 1 and 2 finishes after the cards behind it
+
+
+def _card_date(rid):
+    return "Aug 30, 2025" if rid <= 100 else f"Sep {rid - 100:02d}, 2025"
+
+
+def _list_page(page):
+    cards = "".join(f'<li>Added on {_card_date(rid)} <a href="/result/{rid}">See More</a></li>'
+                    for rid in PAGES.get(page, ()))
+    return f"<ul>{cards}</ul>"
+
+
+def _detail_page(rid):
+    return (f"<dl><dt>Institution</dt><dd>Test U {rid}</dd><dt>Program</dt><dd>CS</dd>"
+            f"<dt>Decision</dt><dd>Accepted</dd><dt>Notes</dt><dd>GRE 16{rid % 10} V 155</dd></dl>")
+
+
+class _GradCafe(BaseHTTPRequestHandler):
+    """List pages under /survey/index.php, detail pages under /result/<id>."""
+
+    completed = []  # detail IDs in the order their responses were sent
+
+    def do_GET(self):
+        status = 200
+        if self.path.startswith("/result/"):
+            rid = int(self.path.rsplit("/", 1)[1])
+            if rid in SLOW:
+                time.sleep(0.2)
+            status = 404 if rid == MISSING else 200
+            body = _detail_page(rid)
+        else:
+            page = int(self.path.partition("page=")[2] or 1)
+            body = _list_page(page)
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        if self.path.startswith("/result/"):
+            type(self).completed.append(rid)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="gradcafe")
+def gradcafe_fixture(tmp_path, monkeypatch):
+    _GradCafe.completed = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GradCafe)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(scrape, "LIST_URL", f"http://127.0.0.1:{server.server_port}/survey/index.php")
+    monkeypatch.setattr(scrape, "STATE_FILE", tmp_path / "last_run.txt")
+    yield tmp_path
+    server.shutdown()
+    server.server_close()
+
+
+def _run(tmp_path, name, **options):
+    out = tmp_path / f"{name}.jsonl"
+    scrape.STATE_FILE.unlink(missing_ok=True)
+    stats = scrape.scrape_data(since=SINCE, jsonl_out=out, **options)
+    return out.read_bytes(), scrape.STATE_FILE.read_text(encoding="ascii"), stats
+
+
+def test_concurrent_pipeline_matches_a_serial_run(gradcafe):
+    serial, serial_last_run, serial_stats = _run(gradcafe, "serial")
+    _GradCafe.completed = []
+
+    parallel, last_run, stats = _run(gradcafe, "parallel", concurrency=4, parse_workers=2,
+                                     max_inflight=3)
+
+    # the slow first card really did finish after the ones fetched behind it
+    assert _GradCafe.completed.index(112) > _GradCafe.completed.index(111)
+    assert parallel == serial
+    assert last_run == serial_last_run == "2025-09-12"
+    urls = [json.loads(line)["url"] for line in parallel.decode().splitlines()]
+    assert [scrape.result_id(u) for u in urls] == [rid for rid in range(112, 100, -1) if rid != MISSING]
+    assert stats["appended"] == serial_stats["appended"] == 11
+    assert (stats["min_date"], stats["max_date"]) == (date(2025, 9, 1), date(2025, 9, 12))
+
+
+class _InterruptingWriter:
+    """JSONL handle whose `fail_at`-th write raises KeyboardInterrupt before writing."""
+
+    def __init__(self, f, fail_at):
+        self.f, self.fail_at, self.writes = f, fail_at, 0
+
+    def write(self, line):
+        self.writes += 1
+        if self.writes == self.fail_at:
+            raise KeyboardInterrupt
+        return self.f.write(line)
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+
+@pytest.mark.parametrize("where", ["write", "fetch"])
+def test_resume_after_interrupt_matches_a_clean_run(gradcafe, monkeypatch, where):
+    clean, clean_last_run, _ = _run(gradcafe, "clean")
+    out, checkpoint = gradcafe / "resumed.jsonl", gradcafe / "checkpoint.json"
+    open_jsonl, fetch = scrape.open_jsonl, scrape._fetch_detail
+
+    def interrupting_fetch(http, url, stop_early=False):
+        if url.endswith("/107"):
+            raise KeyboardInterrupt
+        return fetch(http, url, stop_early)
+
+    if where == "write":
+        monkeypatch.setattr(scrape, "open_jsonl",
+                            lambda path, mode: _InterruptingWriter(open_jsonl(path, mode), 6))
+    else:
+        monkeypatch.setattr(scrape, "_fetch_detail", interrupting_fetch)
+
+    with pytest.raises(KeyboardInterrupt):
+        scrape.scrape_data(since=SINCE, jsonl_out=out, checkpoint=checkpoint, checkpoint_every=2,
+                           concurrency=2)
+    monkeypatch.setattr(scrape, "open_jsonl", open_jsonl)
+    monkeypatch.setattr(scrape, "_fetch_detail", fetch)
+
+    state = scrape.load_checkpoint(checkpoint)
+    written = out.read_text(encoding="utf-8").splitlines()
+    assert state["appended"] == len(written) == 5
+    assert state["last_url"] == json.loads(written[-1])["url"]
+    assert (state["min_date"], state["max_date"]) == (date(2025, 9, 8), date(2025, 9, 12))
+
+    scrape.STATE_FILE.unlink(missing_ok=True)
+    stats = scrape.scrape_data(since=state["since"], jsonl_out=out, checkpoint=checkpoint,
+                               resume=state)
+
+    assert out.read_bytes() == clean
+    assert scrape.STATE_FILE.read_text(encoding="ascii") == clean_last_run
+    assert stats["appended"] == 11
+    assert not checkpoint.exists()
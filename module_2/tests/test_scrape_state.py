@@ -0,0 +1,50 @@
+"""Crawl stop rule and the known-ID index of scrape.py."""
+
+from datetime import date
+
+from bs4 import BeautifulSoup
+
+import scrape
+
+LIST_PAGE = """
+<ul>
+  <li>Added on Sep 03, 2025 <a href="/result/103">See More</a></li>
+  <li>Added on Sep 02, 2025 <a href="/result/102">See More</a></li>
+  <li>Added on Aug 01, 2025 <a href="/result/101">See More</a></li>
+</ul>
+"""
+
+
+def test_known_cards_inside_the_window_keep_the_crawl_going():
+    """A page whose in-window cards are all known is not the end of the window."""
+    known = scrape.KnownIds([102, 103])
+    soup = BeautifulSoup(LIST_PAGE, "html.parser")
+
+    found, in_window, candidates = scrape._card_candidates(soup, date(2025, 9, 1), known)
+
+    assert found and in_window
+    assert candidates == []
+    assert known.skipped == 2
+
+
+def test_page_older_than_since_is_out_of_window():
+    soup = BeautifulSoup(LIST_PAGE, "html.parser")
+
+    found, in_window, candidates = scrape._card_candidates(soup, date(2025, 10, 1))
+
+    assert found and not in_window and candidates == []
+
+
+def test_truncated_known_index_is_rebuilt(tmp_path, monkeypatch):
+    """A torn write leaves a partial ID; loading falls back to a rebuild."""
+    path = tmp_path / "known.bin"
+    scrape.KnownIds([5, 7]).save(path)
+    path.write_bytes(path.read_bytes()[:-3])
+    archive = tmp_path / "archive.jsonl"
+    archive.write_text('{"url": "https://www.thegradcafe.com/result/9"}\n', encoding="utf-8")
+    monkeypatch.setattr(scrape, "_db_urls", lambda: iter(()))
+
+    known = scrape.load_known_ids(path, [archive])
+
+    assert "https://www.thegradcafe.com/result/9" in known
+    assert len(scrape.KnownIds.load(path)) == 1
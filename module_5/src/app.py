@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import contextlib
+import importlib
+import json
 import os
 import re
 import subprocess
 import sys
 import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
+from typing import Any, TextIO
 
+import psycopg
 from flask import Flask, flash, jsonify, redirect, render_template, request, url_for
 
+import load_data
 from query_data import compute_stats
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -29,6 +37,14 @@ PULL_OK_FILE = MODULE3_ROOT / "last_pull_success.txt"
 SCRAPER_CMD = [sys.executable, str(SCRAPER_PATH)]
 LOADER_CMD = [sys.executable, str(LOADER_PATH), str(JSONL_PATH)]
 
+# PULL_MODE=inprocess scrapes and loads inside the app process (no JSONL hop);
+# PULL_JSONL_TEE=1 still appends the pulled records to JSONL_PATH for auditing.
+PULL_MODE_ENV = "PULL_MODE"
+JSONL_TEE_ENV = "PULL_JSONL_TEE"
+# In-process pulls commit after every batch, so no transaction stays open
+# (holding locks on applicants) while the crawl waits on the rate limiter.
+PULL_BATCH_SIZE = 100
+
 app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev")
 app.config["TEMPLATES_AUTO_RELOAD"] = True
@@ -42,6 +58,7 @@ class PullResult:
     inserted: int | None
     scraper_output: str
     loader_output: str
+    rejected: int | None = None
 
 
 def _clear_lock() -> None:
@@ -197,6 +214,68 @@ def _run_scraper_and_loader(env: dict[str, str]) -> PullResult:
     return PullResult(scraped, inserted, scraper_stdout, loader_stdout)
 
 
+def _load_scraper() -> ModuleType:
+    """Import ``module_2/scrape.py`` as a library for in-process pulls."""
+
+    if str(MODULE2_ROOT) not in sys.path:
+        sys.path.insert(0, str(MODULE2_ROOT))
+    return importlib.import_module("scrape")
+
+
+def _scrape_options(scraper: ModuleType) -> dict[str, Any]:
+    """Mirror the scraper CLI defaults: polite rate, HTTP cache and known-URL index."""
+
+    return {
+        "rps": 1.0 / scraper.DEFAULT_SLEEP,
+        "cache": scraper.HttpCache(scraper.CACHE_DIR_DEFAULT),
+        "known": scraper.load_known_ids(scraper.KNOWN_INDEX_DEFAULT, [JSONL_PATH]),
+    }
+
+
+def _tee_jsonl(records: Iterable[dict[str, Any]], handle: TextIO) -> Iterator[dict[str, Any]]:
+    """Pass *records* through unchanged, appending each one to *handle* as JSONL."""
+
+    for record in records:
+        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        yield record
+
+
+def _run_inprocess_pull() -> PullResult:
+    """Stream newly scraped records straight into the database in this process."""
+
+    set_lock(os.getpid())
+    try:
+        scraper = _load_scraper()
+        options = _scrape_options(scraper)
+        stats: dict[str, Any] = {}
+        # the same reject file load_data.py uses for JSONL_PATH
+        rejects = load_data.DeadLetter(f"{JSONL_PATH}.rejects.jsonl")
+        with contextlib.ExitStack() as stack:
+            # a failed insert must not leave the scraper's fetch/parse workers running
+            records = stack.enter_context(contextlib.closing(
+                scraper.iter_new_records(scraper.resolve_since(None), stats=stats, **options)
+            ))
+            if os.getenv(JSONL_TEE_ENV) == "1":
+                handle = stack.enter_context(JSONL_PATH.open("a", encoding="utf-8"))
+                records = _tee_jsonl(records, handle)
+            inserted = load_data.insert_records(
+                records, PULL_BATCH_SIZE, commit_every=PULL_BATCH_SIZE, rejects=rejects
+            )
+        options["known"].save(scraper.KNOWN_INDEX_DEFAULT)
+        scraper.save_last_run(stats.get("max_date"))
+        _write_success_marker()
+    finally:
+        set_lock(None)
+
+    scraped = stats.get("appended", 0)
+    loader_output = f"Inserted rows: {inserted}"
+    if rejects.count:
+        loader_output += f"; rejected rows: {rejects.count} (written to {rejects.path})"
+    return PullResult(
+        scraped, inserted, f"appended {scraped} records", loader_output, rejects.count
+    )
+
+
 def _handle_when_running(json_response: bool):
     """Return a busy response when a pull is already running."""
 
@@ -261,6 +340,8 @@ def _respond_success(json_response: bool, result: PullResult):
         "scraped": result.scraped or 0,
         "inserted": result.inserted or 0,
     }
+    if result.rejected is not None:
+        payload["rejected"] = result.rejected
     if json_response:
         return jsonify(payload), 200
     for message, category in _success_messages(result):
@@ -295,10 +376,13 @@ def pull_data():
         return busy_response
 
     try:
-        result = _run_scraper_and_loader(_build_child_env())
+        if os.getenv(PULL_MODE_ENV, "subprocess").lower() == "inprocess":
+            result = _run_inprocess_pull()
+        else:
+            result = _run_scraper_and_loader(_build_child_env())
     except subprocess.CalledProcessError as exc:
         return _handle_subprocess_failure(json_response, exc)
-    except (OSError, ValueError) as exc:
+    except (OSError, ValueError, psycopg.Error) as exc:
         return _handle_generic_failure(json_response, exc)
 
     return _respond_success(json_response, result)
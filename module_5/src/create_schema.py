@@ -3,6 +3,10 @@
 
 from db import get_conn
 
+# Prefix of the notice the URL migration raises; every other NOTICE from the
+# IF NOT EXISTS statements ("... already exists, skipping") is dropped.
+MIGRATION_NOTICE = "Created applicants_url_uniq"
+
 DDL = """ -- 1) Main applicants table
 
 CREATE TABLE IF NOT EXISTS applicants (
@@ -23,6 +27,7 @@ CREATE TABLE IF NOT EXISTS applicants (
   degree                    TEXT,      -- e.g., 'MS', 'M.S.', 'Master', 'PhD', 'Ph.D.'
   llm_generated_program     TEXT,      -- normalized by your Module 2 LLM pass
   llm_generated_university  TEXT,      -- normalized by your Module 2 LLM pass
+  content_hash              TEXT,      -- digest of the fields above; upserts skip unchanged rows
 
   -- Contraints for NULL values and ranges
   CONSTRAINT gpa_range CHECK (gpa IS NULL OR (gpa >= 0 AND gpa <= 4.3)),
@@ -34,6 +39,28 @@ CREATE TABLE IF NOT EXISTS applicants (
   CONSTRAINT applicants_uniq UNIQUE (program, url, date_added)
 );
 
+-- Tables created before content hashes existed get the column here
+ALTER TABLE applicants ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- One-off migration to one row per result URL (the loader's ON CONFLICT (url)
+-- and upsert mode rely on this index). Only runs while the index is missing:
+-- keeps the newest duplicate of each URL and reports how many rows went.
+-- Rows it leaves have no content_hash yet; the loader's upsert fills that in
+-- and only counts the row as changed if its columns differ.
+DO $$
+DECLARE
+  removed BIGINT;
+BEGIN
+  IF to_regclass('applicants_url_uniq') IS NULL THEN
+    DELETE FROM applicants older
+      USING applicants newer
+      WHERE older.url = newer.url AND older.p_id < newer.p_id;
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    CREATE UNIQUE INDEX applicants_url_uniq ON applicants (url);
+    RAISE NOTICE 'Created applicants_url_uniq; removed % duplicate URL rows', removed;
+  END IF;
+END $$;
+
 -- 2) Indexes to speed up common queries
 CREATE INDEX IF NOT EXISTS idx_applicants_term ON applicants (term);
 CREATE INDEX IF NOT EXISTS idx_applicants_status ON applicants (status);
@@ -52,7 +79,16 @@ CREATE INDEX IF NOT EXISTS idx_applicants_program_lower
   ON applicants (LOWER(llm_generated_program));
 """
 
+
+def print_migration_notice(diag) -> None:
+    ''' Print the URL migration's notice and ignore the rest '''
+    message = diag.message_primary or ""
+    if message.startswith(MIGRATION_NOTICE):
+        print(message)
+
+
 if __name__ == "__main__":
     with get_conn() as conn, conn.cursor() as cur:
+        conn.add_notice_handler(print_migration_notice)
         cur.execute(DDL)
     print("Schema created/verified.")
@@ -2,16 +2,73 @@
 
 from __future__ import annotations
 
+import argparse
+import gzip
+import hashlib
+import io
 import json
+import os
 import re
 import sys
-from collections.abc import Iterator, Sequence
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import Any, TypedDict
+
+import psycopg
 
 from db import get_conn
 
+try:  # optional accelerated decoders; the stdlib json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+try:  # optional: reads .jsonl.zst sources
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# The raw fields build_payload() reads; a typed decoder skips everything else.
+ApplicantRecord = TypedDict(
+    "ApplicantRecord",
+    {
+        "program": Any, "comments": Any, "date_added": Any, "url": Any, "status": Any,
+        "term": Any, "US/International": Any, "GPA": Any, "GRE": Any, "GRE V": Any,
+        "GRE AW": Any, "Degree": Any, "llm-generated-program": Any,
+        "llm-generated-university": Any,
+    },
+    total=False,
+)
+
+
+def _select_decoders() -> tuple[str, Callable[[Any], Any], Callable[[Any], Any], tuple]:
+    """Pick ``(name, loads, decode_applicant, errors)`` from the installed JSON libraries.
+
+    ``loads`` returns whole documents; ``decode_applicant`` may return only
+    the :class:`ApplicantRecord` fields (msgspec decodes straight into it).
+    """
+
+    decode: Callable[[Any], Any] = json.loads
+    name = "json"
+    if orjson is not None:  # pragma: no cover - optional dependency
+        decode, name = orjson.loads, "orjson"
+    if msgspec is not None:  # pragma: no cover - optional dependency
+        typed = msgspec.json.Decoder(ApplicantRecord)
+        return "msgspec", decode, typed.decode, (ValueError, msgspec.DecodeError)
+    return name, decode, decode, (ValueError,)
+
+
+JSON_DECODER, loads, decode_applicant, DECODE_ERRORS = _select_decoders()
+
 DATE_FORMATS: tuple[str, ...] = (
     "%Y-%m-%d",  # 2025-09-14
     "%m/%d/%Y",  # 09/14/2025
@@ -37,20 +94,92 @@ def parse_float(value: Any) -> float | None:
         return None
 
 
+class DateParser:
+    """Memoised ``strptime`` over *formats* that tries the most successful format first.
+
+    Results for repeated strings (misses included) come from a bounded LRU
+    cache. Each successful format moves ahead of any format with fewer hits,
+    so after a few rows the file's dominant format is tried first and the
+    others stop costing a ``ValueError`` per value. ``hits``/``misses``
+    count successful and failed ``strptime`` calls per format.
+    """
+
+    def __init__(self, formats: Sequence[str] = DATE_FORMATS, cache_size: int = 4096) -> None:
+        self.default_order = tuple(formats)
+        self.cache_size = cache_size
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the cache, the learned order and the counters (e.g. for a new file)."""
+
+        self.formats = list(self.default_order)
+        self._cache: OrderedDict[str, date | None] = OrderedDict()
+        self.hits = dict.fromkeys(self.default_order, 0)
+        self.misses = dict.fromkeys(self.default_order, 0)
+        self.cache_hits = 0
+
+    def __call__(self, value: Any) -> date | None:
+        if value is None:
+            return None
+        text = str(value).strip()
+        if not text:
+            return None
+        if text in self._cache:
+            self._cache.move_to_end(text)
+            self.cache_hits += 1
+            return self._cache[text]
+        parsed = self._parse(text)
+        self._cache[text] = parsed
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return parsed
+
+    def _parse(self, text: str) -> date | None:
+        for index, fmt in enumerate(self.formats):
+            try:
+                parsed = datetime.strptime(text, fmt).date()
+            except ValueError:
+                self.misses[fmt] += 1
+                continue
+            self.hits[fmt] += 1
+            while index and self.hits[self.formats[index - 1]] < self.hits[fmt]:
+                self.formats[index - 1], self.formats[index] = fmt, self.formats[index - 1]
+                index -= 1
+            return parsed
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """Counters as plain data, so worker processes can send them back."""
+
+        return {"hits": dict(self.hits), "misses": dict(self.misses),
+                "cache_hits": self.cache_hits}
+
+    def merge(self, stats: dict[str, Any]) -> None:
+        """Add counters reported by :meth:`stats` of another parser."""
+
+        for fmt, count in stats["hits"].items():
+            self.hits[fmt] = self.hits.get(fmt, 0) + count
+        for fmt, count in stats["misses"].items():
+            self.misses[fmt] = self.misses.get(fmt, 0) + count
+        self.cache_hits += stats["cache_hits"]
+
+    def summary(self) -> str:
+        """One line with the cache hits and the per-format hit/miss counts."""
+
+        formats = ", ".join(
+            f"{fmt} {self.hits[fmt]}/{self.misses[fmt]}"
+            for fmt in self.default_order if self.hits[fmt] or self.misses[fmt]
+        )
+        return f"Dates: {self.cache_hits} cached; format hits/misses: {formats or 'none'}"
+
+
+DATE_PARSER = DateParser()
+
+
 def parse_date(value: Any) -> date | None:
     """Parse *value* into a date value, returning None when unsupported."""
 
-    if value is None:
-        return None
-    text = str(value).strip()
-    if not text:
-        return None
-    for fmt in DATE_FORMATS:
-        try:
-            return datetime.strptime(text, fmt).date()
-        except ValueError:
-            continue
-    return None
+    return DATE_PARSER(value)
 
 
 def parse_status(raw_status: Any) -> tuple[str | None, date | None]:
@@ -65,39 +194,319 @@ def parse_status(raw_status: Any) -> tuple[str | None, date | None]:
     return match.group("status").strip(), status_date
 
 
+# Source suffixes decompressed on the fly by iter_records().
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def _open_text(path: Path) -> Any:
+    """Open *path* as UTF-8 text, decompressing ``.gz`` and ``.zst`` as it is read."""
+
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if suffix == ".zst":
+        if zstandard is not None:  # pragma: no cover - optional dependency
+            raw = zstandard.ZstdDecompressor().stream_reader(
+                path.open("rb"), read_across_frames=True, closefd=True)
+            return io.TextIOWrapper(raw, encoding="utf-8")
+        raise ImportError(f"{path.name}: reading .zst files needs the zstandard package")
+    return path.open(encoding="utf-8")
+
+
 def iter_records(source_path: str | Path) -> Iterator[dict[str, Any]]:
-    """Yield JSON records from *source_path*, supporting JSONL and JSON arrays."""
+    """Yield JSON records from *source_path*, supporting JSONL and JSON arrays.
+
+    ``.gz`` and ``.zst`` files are decompressed incrementally, so a JSONL
+    source is never held in memory whole.
+    """
 
     path = Path(source_path)
-    with path.open(encoding="utf-8") as handle:
+    with _open_text(path) as handle:
         first_char = handle.read(1)
         while first_char and first_char.isspace():
             first_char = handle.read(1)
-        handle.seek(0)
         if first_char == "[":
-            yield from json.load(handle)
+            yield from loads(first_char + handle.read())
         else:
-            for line in handle:
+            for line in chain([first_char + handle.readline()], handle):
                 line = line.strip()
                 if line:
-                    yield json.loads(line)
+                    yield loads(line)
+
+
+# Bytes hashed at each end of the already-loaded prefix to detect rewrites.
+WATERMARK_WINDOW = 64 * 1024
+# Size of the line-aligned byte ranges handed to normalisation workers.
+SHARD_BYTES = 8 * 1024 * 1024
+
+
+def _read_lines(handle: Any, offset: int, end: int | None = None) -> Iterator[tuple[Any, int]]:
+    """Yield ``(record, offset after its line)`` for JSONL lines from *offset* up to *end*.
+
+    A last line without a newline is only consumed if it already parses,
+    so a record still being appended is left for the next run.
+    """
+
+    handle.seek(offset)
+    for raw in handle:
+        if end is not None and offset >= end:
+            return
+        line = raw.strip()
+        if not raw.endswith(b"\n"):
+            try:
+                record = decode_applicant(line)
+            except DECODE_ERRORS:
+                return
+            yield record, offset + len(raw)
+            return
+        offset += len(raw)
+        if line:
+            yield decode_applicant(line), offset
+
+
+def _line_ranges(handle: Any, start: int, size: int, shard_bytes: int) -> Iterator[tuple[int, int]]:
+    """Cut ``[start, size)`` into ranges of about *shard_bytes* that end on a newline."""
+
+    while start < size:
+        end = start + shard_bytes
+        if end < size:
+            handle.seek(end)
+            handle.readline()
+            end = handle.tell()
+        else:
+            end = size
+        yield start, end
+        start = end
+
+
+def _normalize_range(
+    path: Path, start: int, end: int
+) -> tuple[list[dict[str, Any]], int, dict[str, Any]]:
+    """Worker: payloads for ``[start, end)``, the offset after the last line and date stats."""
+
+    payloads = []
+    consumed = start
+    DATE_PARSER.reset()
+    with path.open("rb") as handle:
+        for record, consumed in _read_lines(handle, start, end):
+            payloads.append(build_payload(record))
+    return payloads, consumed, DATE_PARSER.stats()
+
+
+def _prefix_digest(handle: Any, offset: int) -> str:
+    """Hash the first and last ``WATERMARK_WINDOW`` bytes before *offset* (all of it if short)."""
+
+    digest = hashlib.sha256()
+    handle.seek(0)
+    if offset <= 2 * WATERMARK_WINDOW:
+        digest.update(handle.read(offset))
+    else:
+        digest.update(handle.read(WATERMARK_WINDOW))
+        handle.seek(offset - WATERMARK_WINDOW)
+        digest.update(handle.read(WATERMARK_WINDOW))
+    return digest.hexdigest()
+
+
+def read_watermark(path: str | Path) -> dict[str, Any] | None:
+    """Return the saved watermark at *path*, or None when missing or unreadable."""
+
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def write_watermark(path: str | Path, state: dict[str, Any]) -> None:
+    """Atomically replace the watermark file at *path* with *state*."""
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class JsonlTail:
+    """Iterate the records appended to a JSONL file since a saved watermark.
+
+    The watermark records the file identity (device + inode), the byte
+    offset after the last loaded line and a hash of the loaded prefix. A
+    matching watermark means the reader seeks straight to the unread tail;
+    a different file, a file shorter than the offset or a changed prefix
+    means it was truncated or rewritten, and everything is read again.
+    A last line without a newline is only consumed if it already parses,
+    so a record still being appended is picked up by the next run.
+    Compressed sources have no byte offsets to resume from and are read
+    whole, like JSON arrays.
+    ``state()`` is the watermark to save once the yielded records are
+    committed.
+    """
+
+    def __init__(self, source_path: str | Path, watermark: dict[str, Any] | None) -> None:
+        self.path = Path(source_path)
+        self.watermark = watermark
+        self.start = 0
+        self.offset = 0
+        self.reloaded = False
+        self.incremental = True
+
+    def _resume_offset(self, handle: Any, stat: os.stat_result) -> int:
+        """Return where reading should start, flagging a full reload when needed."""
+
+        mark = self.watermark
+        if not mark:
+            return 0
+        offset = int(mark.get("offset", 0))
+        same_file = (mark.get("dev"), mark.get("ino")) == (stat.st_dev, stat.st_ino)
+        if (not same_file or stat.st_size < offset
+                or _prefix_digest(handle, offset) != mark.get("digest")):
+            self.reloaded = True
+            return 0
+        return offset
+
+    def _open_at(self, handle: Any) -> int | None:
+        """Return the offset to read from, or None for a JSON array source."""
+
+        if (self.path.suffix.lower() in COMPRESSED_SUFFIXES
+                or handle.read(64).lstrip().startswith(b"[")):
+            # JSON arrays and compressed files can't be resumed mid-file; read them whole
+            self.incremental = False
+            return None
+        self.start = self.offset = self._resume_offset(handle, os.fstat(handle.fileno()))
+        return self.start
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        with self.path.open("rb") as handle:
+            start = self._open_at(handle)
+            if start is None:
+                yield from iter_records(self.path)
+                return
+            for record, self.offset in _read_lines(handle, start):
+                yield record
+
+    def payloads(
+        self, workers: int = 0, shard_bytes: int = SHARD_BYTES
+    ) -> Iterator[dict[str, Any]]:
+        """Yield normalised payloads, built in *workers* processes when more than one.
+
+        The unread part of the file is cut into line-aligned byte ranges
+        that workers parse and normalise; results come back in file order.
+        The offset advances a whole range at a time, once its last payload
+        has been taken, so a watermark saved mid-run never runs ahead of
+        what was written.
+        """
+
+        if workers <= 1:
+            yield from map(build_payload, self)
+            return
+        with self.path.open("rb") as handle:
+            start = self._open_at(handle)
+            if start is None:
+                ranges = []
+            else:
+                size = os.fstat(handle.fileno()).st_size
+                ranges = list(_line_ranges(handle, start, size, shard_bytes))
+        if start is None:
+            yield from map(build_payload, iter_records(self.path))
+            return
+
+        queued = iter(ranges)
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = deque(
+                pool.submit(_normalize_range, self.path, *span)
+                for span in islice(queued, 2 * workers)
+            )
+            while pending:
+                batch, consumed, date_stats = pending.popleft().result()
+                DATE_PARSER.merge(date_stats)
+                for span in islice(queued, 1):
+                    pending.append(pool.submit(_normalize_range, self.path, *span))
+                yield from batch
+                self.offset = consumed
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def state(self) -> dict[str, Any]:
+        """Watermark covering everything consumed so far."""
+
+        stat = self.path.stat()
+        with self.path.open("rb") as handle:
+            digest = _prefix_digest(handle, self.offset)
+        return {"path": str(self.path), "dev": stat.st_dev, "ino": stat.st_ino,
+                "offset": self.offset, "digest": digest}
 
 
 INSERT_SQL = """
 INSERT INTO applicants
 (program, comments, date_added, url, status, term, us_or_international,
- gpa, gre, gre_v, gre_aw, degree, llm_generated_program, llm_generated_university)
+ gpa, gre, gre_v, gre_aw, degree, llm_generated_program, llm_generated_university,
+ content_hash)
 VALUES (%(program)s, %(comments)s, %(date_added)s, %(url)s, %(status)s, %(term)s,
         %(us_or_international)s, %(gpa)s, %(gre)s, %(gre_v)s, %(gre_aw)s, %(degree)s,
-        %(llm_generated_program)s, %(llm_generated_university)s)
+        %(llm_generated_program)s, %(llm_generated_university)s, %(content_hash)s)
 ON CONFLICT (url) DO NOTHING;
 """
 
 
+# The applicant fields, in the order hashed into content_hash.
+DATA_COLUMNS = (
+    "program", "comments", "date_added", "url", "status", "term", "us_or_international",
+    "gpa", "gre", "gre_v", "gre_aw", "degree", "llm_generated_program",
+    "llm_generated_university",
+)
+# Column order shared by the COPY stream, the set-based merge and the upsert.
+COLUMNS = DATA_COLUMNS + ("content_hash",)
+_COLUMN_LIST = ", ".join(COLUMNS)
+
+# Insert new URLs; rewrite a known URL only when its content hash changed.
+# xmax is 0 only for freshly inserted tuples, which tells the two apart.
+# The subquery reads the row as it was before this statement: a row loaded
+# before content hashes existed, whose columns all match, only gets its hash
+# filled in and is flagged "backfilled". If any column differs it is updated.
+_STORED_ROW = ", ".join(f"old.{column}" for column in DATA_COLUMNS)
+_WRITTEN_ROW = ", ".join(f"applicants.{column}" for column in DATA_COLUMNS)
+UPSERT_SQL = f"""
+INSERT INTO applicants ({_COLUMN_LIST})
+VALUES ({", ".join(f"%({column})s" for column in COLUMNS)})
+ON CONFLICT (url) DO UPDATE SET
+{", ".join(f"{column} = EXCLUDED.{column}" for column in COLUMNS if column != "url")}
+WHERE applicants.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+RETURNING (xmax = 0) AS inserted,
+  (SELECT old.content_hash IS NULL
+          AND ROW({_STORED_ROW}) IS NOT DISTINCT FROM ROW({_WRITTEN_ROW})
+     FROM applicants old WHERE old.url = %(url)s) AS backfilled;
+"""
+
+STAGING_DDL = """
+CREATE UNLOGGED TABLE IF NOT EXISTS applicants_staging (
+  program TEXT, comments TEXT, date_added DATE, url TEXT, status TEXT, term TEXT,
+  us_or_international TEXT, gpa REAL, gre REAL, gre_v REAL, gre_aw REAL, degree TEXT,
+  llm_generated_program TEXT, llm_generated_university TEXT, content_hash TEXT
+);
+ALTER TABLE applicants_staging ADD COLUMN IF NOT EXISTS content_hash TEXT;
+"""
+# TRUNCATE also takes an exclusive lock, so concurrent bulk loads queue up.
+STAGING_TRUNCATE_SQL = "TRUNCATE applicants_staging;"
+COPY_SQL = f"COPY applicants_staging ({_COLUMN_LIST}) FROM STDIN"
+MERGE_SQL = f"""
+INSERT INTO applicants ({_COLUMN_LIST})
+SELECT {_COLUMN_LIST} FROM applicants_staging
+ON CONFLICT DO NOTHING;
+"""
+
+
+def content_hash(payload: dict[str, Any]) -> str:
+    """Stable digest of the applicant fields of *payload*, used to skip unchanged rows."""
+
+    values = json.dumps([payload[column] for column in DATA_COLUMNS], default=str)
+    return hashlib.blake2b(values.encode("utf-8"), digest_size=16).hexdigest()
+
+
 def build_payload(record: dict[str, Any]) -> dict[str, Any]:
     """Normalise a raw applicant record for database insertion."""
 
-    return {
+    payload = {
         "program": record.get("program"),
         "comments": record.get("comments"),
         "date_added": parse_date(record.get("date_added")),
@@ -113,19 +522,334 @@ def build_payload(record: dict[str, Any]) -> dict[str, Any]:
         "llm_generated_program": record.get("llm-generated-program"),
         "llm_generated_university": record.get("llm-generated-university"),
     }
+    payload["content_hash"] = content_hash(payload)
+    return payload
+
+
+@dataclass
+class BatchPolicy:
+    """Batch size, commit interval, workers, reject file and write mode for a load."""
+
+    size: int = 500
+    commit_every: int | None = 5000
+    workers: int = 0
+    dead_letter: str | Path | None = None
+    upsert: bool = False
+
+
+@dataclass
+class LoadStats:
+    """Batch timings and row outcomes collected by :func:`insert_payloads`."""
+
+    timings: list[float] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def tally_upserts(self, cursor: Any, sent: int) -> None:
+        """Count the ``RETURNING`` rows of an upsert ``executemany`` of *sent* rows.
+
+        Inserted and changed rows each return one row; unchanged rows
+        return nothing. A row that only had its missing hash filled in
+        returns one too, but counts as unchanged; a hashless row whose
+        columns also changed counts as updated.
+        """
+
+        returned = 0
+        while True:
+            row = cursor.fetchone()
+            if row is not None:
+                returned += 1
+                if row["inserted"]:
+                    self.inserted += 1
+                elif row["backfilled"]:
+                    self.unchanged += 1
+                else:
+                    self.updated += 1
+            if not cursor.nextset():
+                break
+        self.unchanged += sent - returned
+
+    def batch_summary(self) -> str:
+        """One line with the batch count and the average and slowest batch times."""
+
+        timings = self.timings
+        return (f"Batches: {len(timings)}, avg {sum(timings) / len(timings) * 1e3:.1f} ms, "
+                f"max {max(timings) * 1e3:.1f} ms")
+
+
+# Mirrors the CHECK constraints in create_schema.DDL: column -> (low, high, constraint).
+RANGE_CHECKS: dict[str, tuple[float, float, str]] = {
+    "gpa": (0.0, 4.3, "gpa_range"),
+    "gre": (130.0, 170.0, "gre_q_range"),
+    "gre_v": (130.0, 170.0, "gre_v_range"),
+    "gre_aw": (0.0, 6.0, "gre_aw_range"),
+}
+
+# Errors caused by the row's own values; anything else still aborts the load.
+ROW_ERRORS = (psycopg.IntegrityError, psycopg.DataError)
+
+
+def check_ranges(payload: dict[str, Any]) -> str | None:
+    """Return the first range constraint *payload* would violate, or None."""
+
+    for column, (low, high, constraint) in RANGE_CHECKS.items():
+        value = payload.get(column)
+        if value is not None and not low <= value <= high:
+            return constraint
+    return None
 
 
-def main(source_path: str | Path, limit: int | None = None) -> int:
-    """Load applicant data from *source_path* into the database and return rows inserted."""
+class DeadLetter:
+    """Append rejected payloads, with the reason, to a JSONL file.
+
+    Rejects are rare, so the file is opened per row and only created once
+    something is rejected. Without a path the rejects are only counted.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.count = 0
+
+    def write(self, payload: dict[str, Any], error: str) -> None:
+        """Record one rejected payload."""
+
+        self.count += 1
+        if self.path is None:
+            return
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"error": error, "row": payload}, default=str) + "\n")
+
+    def screen(self, payloads: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Yield the payloads that pass :func:`check_ranges`; reject the rest here."""
+
+        for payload in payloads:
+            constraint = check_ranges(payload)
+            if constraint is None:
+                yield payload
+            else:
+                self.write(payload, f"violates check constraint {constraint!r}")
+
+
+def _send_batch(
+    conn: Any,
+    cursor: Any,
+    batch: list[dict[str, Any]],
+    rejects: DeadLetter,
+    upserts: LoadStats | None = None,
+) -> int:
+    """Insert *batch* under a savepoint, bisecting it on row errors; return rows kept.
+
+    The rows go out in pipeline mode, and the pipeline is synced before the
+    savepoint block ends, so a row error is raised here, for this batch,
+    while ``ROLLBACK TO SAVEPOINT`` can still run. A failing batch is split
+    in half and each half retried under its own savepoint, so a bad row
+    costs about log2(batch) extra round-trips and ends up in *rejects*
+    while every other row is still written. Must be called inside an open
+    transaction (see :func:`insert_payloads`), or the savepoint would be a
+    transaction of its own. With *upserts*, rows go through ``UPSERT_SQL``
+    and their outcomes are counted there.
+    """
 
-    inserted = 0
+    try:
+        with conn.transaction(), conn.pipeline():
+            if upserts is None:
+                cursor.executemany(INSERT_SQL, batch)
+            else:
+                cursor.executemany(UPSERT_SQL, batch, returning=True)
+    except ROW_ERRORS as exc:
+        if len(batch) == 1:
+            rejects.write(batch[0], str(exc).strip())
+            return 0
+        middle = len(batch) // 2
+        return (_send_batch(conn, cursor, batch[:middle], rejects, upserts)
+                + _send_batch(conn, cursor, batch[middle:], rejects, upserts))
+    if upserts is not None:
+        upserts.tally_upserts(cursor, len(batch))
+    return len(batch)
+
+
+def insert_payloads(
+    payloads: Iterable[dict[str, Any]],
+    policy: BatchPolicy | None = None,
+    *,
+    on_commit: Callable[[], None] | None = None,
+    stats: LoadStats | None = None,
+    rejects: DeadLetter | None = None,
+) -> int:
+    """Insert normalised *payloads* in ``executemany`` batches over one connection.
+
+    Returns the number of rows written. Rows outside the schema's ranges
+    are rejected in Python before they are sent; a batch the database
+    still refuses is bisected under savepoints (see :func:`_send_batch`),
+    and every refused row goes to *rejects*. Each batch is sent in its
+    own pipeline, so its rows go out without a round-trip each and its
+    errors are reported against it. Batches run inside an explicit
+    transaction that is committed after roughly ``policy.commit_every``
+    rows (or once, at the end), calling *on_commit* after each commit, so
+    a crash only loses the open batch window.
+    With ``policy.upsert``, known URLs are rewritten only when their
+    content hash changed. The seconds spent building and sending each
+    batch, and the upsert outcomes, are recorded in *stats*.
+    """
+
+    policy = policy or BatchPolicy(commit_every=None)
+    rejects = rejects or DeadLetter()
+    stats = stats or LoadStats()
+    upserts = stats if policy.upsert else None
+    batches = _batches(rejects.screen(payloads), policy.size)
+    sent = 0
+    started = time.perf_counter()
     with get_conn() as conn, conn.cursor() as cursor:
-        for record in iter_records(source_path):
-            payload = build_payload(record)
-            cursor.execute(INSERT_SQL, payload)
-            inserted += 1
-            if limit is not None and inserted >= limit:
-                break
+        for first in batches:
+            uncommitted = 0
+            with conn.transaction():
+                for batch in chain([first], batches):
+                    kept = _send_batch(conn, cursor, batch, rejects, upserts)
+                    sent += kept
+                    uncommitted += kept
+                    stats.timings.append(time.perf_counter() - started)
+                    started = time.perf_counter()
+                    if policy.commit_every and uncommitted >= policy.commit_every:
+                        break
+            if on_commit is not None:
+                on_commit()
+    return sent
+
+
+def _batches(payloads: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """Group *payloads* into lists of up to *size* rows."""
+
+    payloads = iter(payloads)
+    while batch := list(islice(payloads, size)):
+        yield batch
+
+
+def insert_records(
+    records: Iterable[dict[str, Any]],
+    batch_size: int = 500,
+    commit_every: int | None = None,
+    *,
+    timings: list[float] | None = None,
+    **options: Any,
+) -> int:
+    """Normalise raw *records* and write them with :func:`insert_payloads`; return rows sent.
+
+    Records are consumed lazily, so a generator (such as the scraper's
+    ``iter_new_records``) is written while it is still producing rows.
+    Rows failing the range checks, or refused by the database, are skipped;
+    pass ``rejects`` to keep them. *options* (``on_commit``, ``rejects``)
+    go to :func:`insert_payloads` as they are.
+    """
+
+    stats = LoadStats(timings if timings is not None else [])
+    return insert_payloads(map(build_payload, records), BatchPolicy(batch_size, commit_every),
+                           stats=stats, **options)
+
+
+def bulk_insert(records: Iterable[dict[str, Any]]) -> tuple[int, int]:
+    """Normalise raw *records* and load them with :func:`copy_payloads`."""
+
+    return copy_payloads(map(build_payload, records))
+
+
+def copy_payloads(
+    payloads: Iterable[dict[str, Any]], rejects: DeadLetter | None = None
+) -> tuple[int, int]:
+    """COPY *payloads* into the unlogged staging table and merge them in one statement.
+
+    Returns ``(inserted, skipped)``, where skipped rows are those the
+    ``ON CONFLICT`` clause discarded as duplicates. Rows failing the range
+    checks never reach the staging table; they go to *rejects*. Staging,
+    merge and cleanup share one transaction, so a failure leaves
+    ``applicants`` untouched.
+    """
+
+    rejects = rejects or DeadLetter()
+    staged = 0
+    with get_conn() as conn, conn.cursor() as cursor:
+        cursor.execute(STAGING_DDL)
+        cursor.execute(STAGING_TRUNCATE_SQL)
+        with cursor.copy(COPY_SQL) as copy:
+            for payload in rejects.screen(payloads):
+                copy.write_row(tuple(payload[column] for column in COLUMNS))
+                staged += 1
+        cursor.execute(MERGE_SQL)
+        inserted = cursor.rowcount
+        cursor.execute(STAGING_TRUNCATE_SQL)
+    return inserted, staged - inserted
+
+
+def _open_payloads(
+    source_path: str | Path, watermark_path: str | Path | None, workers: int
+) -> tuple[JsonlTail | None, Iterable[dict[str, Any]]]:
+    """Return the tail reader (when one is needed) and the payload stream for a load."""
+
+    if watermark_path is None and workers <= 1:
+        return None, map(build_payload, iter_records(source_path))
+    mark = read_watermark(watermark_path) if watermark_path is not None else None
+    tail = JsonlTail(source_path, mark)
+    return tail, tail.payloads(workers)
+
+
+def main(
+    source_path: str | Path,
+    limit: int | None = None,
+    watermark_path: str | Path | None = None,
+    bulk: bool = False,
+    batching: BatchPolicy | None = None,
+) -> int:
+    """Load applicant data from *source_path* into the database and return rows inserted.
+
+    Rows go through :func:`insert_payloads` in *batching*-sized pipelined
+    batches, normalised by ``batching.workers`` processes when more than
+    one. With *watermark_path*, only JSONL lines appended since the saved
+    watermark are read, and the watermark is moved forward at every
+    commit. With *bulk*, rows are streamed through :func:`copy_payloads`
+    instead, and the count returned is the number of rows actually added.
+    Rejected rows are appended to ``batching.dead_letter`` (by default
+    ``<source>.rejects.jsonl``) instead of aborting the load. With
+    ``batching.upsert``, rows whose content changed are updated in place
+    and only new URLs count as inserted.
+    """
+
+    batching = batching or BatchPolicy()
+    DATE_PARSER.reset()  # learn this file's dominant date format from scratch
+    tail, payloads = _open_payloads(source_path, watermark_path, batching.workers)
+    if limit is not None:
+        payloads = islice(payloads, limit)
+
+    def save_watermark() -> None:
+        if watermark_path is not None and tail is not None and tail.incremental:
+            write_watermark(watermark_path, tail.state())
+
+    started = time.perf_counter()
+    stats = LoadStats()
+    rejects = DeadLetter(batching.dead_letter or f"{source_path}.rejects.jsonl")
+    if bulk:
+        written, skipped = copy_payloads(payloads, rejects)
+        inserted = written
+        print(f"Skipped rows (already loaded): {skipped}")
+    else:
+        written = insert_payloads(payloads, batching, on_commit=save_watermark,
+                                  stats=stats, rejects=rejects)
+        inserted = stats.inserted if batching.upsert else written
+    elapsed = time.perf_counter() - started
+
+    save_watermark()
+    if tail is not None and tail.incremental:
+        if tail.reloaded:
+            print("Watermark: file was truncated or rewritten; reloaded from the start")
+        print(f"Watermark: read bytes {tail.start}-{tail.offset}")
+    print(DATE_PARSER.summary())
+    if rejects.count:
+        print(f"Rejected rows: {rejects.count} (written to {rejects.path})")
+    if batching.upsert and not bulk:
+        print(f"Upserted rows: {stats.inserted} inserted, {stats.updated} updated, "
+              f"{stats.unchanged} unchanged")
+    if stats.timings:
+        print(stats.batch_summary())
+    print(f"Throughput: {written / elapsed if elapsed else 0:.0f} rows/s over {elapsed:.2f}s")
     print(f"Inserted rows: {inserted}")
     return inserted
 
@@ -144,22 +868,87 @@ def _parse_limit(raw_limit: str | None) -> int | None:
     return limit_value
 
 
+USAGE = (
+    "Usage: python module_3/load_data.py <path.jsonl|.json> [limit] "
+    "[--bulk | --upsert] [--workers N] [--full] [--watermark PATH]"
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the loader CLI."""
+
+    parser = argparse.ArgumentParser(
+        prog="load_data.py",
+        description="Load applicant records into PostgreSQL, resuming after the last load.",
+    )
+    parser.add_argument("source", help="JSONL (or JSON array) file to load")
+    parser.add_argument("limit", nargs="?", default=None, help="Stop after this many rows")
+    parser.add_argument(
+        "--watermark",
+        default=None,
+        help="Watermark file (default: <source>.watermark.json next to the source)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--bulk",
+        action="store_true",
+        help="COPY rows into a staging table and merge them with one INSERT ... SELECT",
+    )
+    mode.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Update rows whose content changed since they were loaded (matched by url)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Rows per executemany batch (default 500)"
+    )
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        default=5000,
+        help="Commit after this many rows; 0 commits once at the end (default 5000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Processes normalising line-aligned byte ranges of the file (default 0 = inline)",
+    )
+    parser.add_argument(
+        "--dead-letter",
+        default=None,
+        help="JSONL file for rows the range checks or the database reject "
+        "(default: <source>.rejects.jsonl)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the watermark and load the whole file (the watermark is then rewritten)",
+    )
+    return parser
+
+
 def _cli(argv: Sequence[str]) -> int:
     """Command-line entrypoint returning a process exit status."""
 
-    if len(argv) not in (1, 2):
-        print("Usage: python module_3/load_data.py <path.jsonl|.json> [limit]")
+    if not argv:
+        print(USAGE)
         return 1
+    args = _build_parser().parse_args(argv)
 
-    source_path = argv[0]
     try:
-        limit = _parse_limit(argv[1] if len(argv) == 2 else None)
+        limit = _parse_limit(args.limit)
     except ValueError as exc:
         print(f"Error: {exc}")
         return 1
 
+    watermark = Path(args.watermark or f"{args.source}.watermark.json")
+    if args.full:
+        watermark.unlink(missing_ok=True)
     try:
-        main(source_path, limit)
+        main(args.source, limit, watermark, bulk=args.bulk,
+             batching=BatchPolicy(max(1, args.batch_size), args.commit_every or None,
+                                  args.workers, args.dead_letter, args.upsert))
     except FileNotFoundError as exc:
         print(f"Error: {exc}")
         return 1
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager, nullcontext
 from typing import Any, Callable, Iterable, Iterator, Sequence
 
 
@@ -25,6 +26,18 @@ class FakeDBConnection:
         """Provide a new cursor bound to this connection."""
         return FakeCursor(self)
 
+    def pipeline(self) -> nullcontext:
+        """Stand in for psycopg pipeline mode, which needs no emulation here."""
+        return nullcontext()
+
+    def commit(self) -> None:
+        """Commits are no-ops for the in-memory store."""
+        return None
+
+    def transaction(self) -> nullcontext:
+        """Savepoints are no-ops for the in-memory store."""
+        return nullcontext()
+
 
 class FakeCursor:
     """Cursor companion for :class:`FakeDBConnection`."""
@@ -50,6 +63,11 @@ class FakeCursor:
                 self.conn.seen_urls.add(url)
                 self.conn.rows.append(params.copy())
 
+    def executemany(self, sql: str, params_seq: Iterable[dict[str, Any]]) -> None:
+        """Apply :meth:`execute` to every payload of a batch."""
+        for params in params_seq:
+            self.execute(sql, params)
+
     def fetchone(self) -> Any:
         """Return ``None`` as no query output exists."""
         return None
@@ -215,8 +233,13 @@ class RecordingCursor:
     """Cursor used for verifying insert payloads in loader tests."""
 
     def __init__(self) -> None:
-        """Initialise the list used to capture payloads."""
+        """Initialise the lists used to capture payloads, batch sizes and COPY rows."""
         self.rows: list[dict[str, Any]] = []
+        self.batches: list[int] = []
+        self.statements: list[str] = []
+        self.staged: list[dict[str, Any]] = []
+        self.rowcount = -1
+        self.results: list[dict[str, Any] | None] = []
 
     def __enter__(self) -> "RecordingCursor":
         """Return ``self`` for context manager usage."""
@@ -226,26 +249,106 @@ class RecordingCursor:
         """Support context manager protocol without special cleanup."""
         return None
 
-    def execute(self, sql: str, params: dict[str, Any]) -> None:
-        """Record the payload for later assertions."""
+    def execute(self, sql: str, params: dict[str, Any] | None = None) -> None:
+        """Record the payload, or emulate the staging statements of a bulk load."""
+        if params is not None:
+            self.rows.append(params.copy())
+            return
+        self.statements.append(sql.split()[0])
+        if sql.lstrip().startswith("TRUNCATE"):
+            self.staged.clear()
+        elif "FROM applicants_staging" in sql:
+            seen = {row["url"] for row in self.rows}
+            fresh = []
+            for row in self.staged:
+                if row["url"] not in seen:
+                    seen.add(row["url"])
+                    fresh.append(row)
+            self.rows.extend(fresh)
+            self.rowcount = len(fresh)
+
+    def copy(self, sql: str) -> "RecordingCopy":
+        """Start a COPY whose rows land in :attr:`staged` keyed by column name."""
+        columns = sql[sql.index("(") + 1:sql.index(")")].split(", ")
+        return RecordingCopy(self, columns)
+
+    def executemany(
+        self, sql: str, params_seq: Iterable[dict[str, Any]], *, returning: bool = False
+    ) -> None:
+        """Record each payload of a batch and the batch size.
+
+        With ``returning`` the batch is treated as the loader's upsert: rows
+        are matched by url and each produces a ``RETURNING`` result, or
+        ``None`` when its content hash is unchanged. A stored row without a
+        hash whose columns all match comes back ``backfilled``.
+        """
         del sql
-        self.rows.append(params.copy())
+        params_seq = list(params_seq)
+        self.batches.append(len(params_seq))
+        if not returning:
+            self.rows.extend(params.copy() for params in params_seq)
+            return
+        by_url = {row["url"]: row for row in self.rows}
+        self.results = []
+        for params in params_seq:
+            known = by_url.get(params["url"])
+            if known is None:
+                by_url[params["url"]] = params.copy()
+                self.rows.append(by_url[params["url"]])
+                self.results.append({"inserted": True, "backfilled": None})
+            elif known.get("content_hash") != params["content_hash"]:
+                backfilled = known.get("content_hash") is None and all(
+                    known.get(column) == value
+                    for column, value in params.items() if column != "content_hash")
+                known.update(params)
+                self.results.append({"inserted": False, "backfilled": backfilled})
+            else:
+                self.results.append(None)
 
     def fetchone(self):
-        """Return ``None`` for API compatibility."""
-        return None
+        """Return the current ``RETURNING`` row, if any."""
+        return self.results[0] if self.results else None
+
+    def nextset(self) -> bool | None:
+        """Advance to the next ``RETURNING`` result set."""
+        if self.results:
+            self.results.pop(0)
+        return True if self.results else None
 
     def fetchall(self):
         """Return an empty list for API compatibility."""
         return []
 
 
+class RecordingCopy:
+    """``cursor.copy()`` stand-in collecting rows written to the staging table."""
+
+    def __init__(self, cursor: RecordingCursor, columns: list[str]) -> None:
+        """Bind the copy to its cursor and the column order of the COPY statement."""
+        self.cursor = cursor
+        self.columns = columns
+
+    def __enter__(self) -> "RecordingCopy":
+        """Return ``self`` for context manager usage."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Support context manager protocol without special cleanup."""
+        return None
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        """Stage one row as a column-name mapping."""
+        self.cursor.staged.append(dict(zip(self.columns, row)))
+
+
 class RecordingConnection:
     """Connection that provides a :class:`RecordingCursor`."""
 
     def __init__(self, cursor: RecordingCursor) -> None:
         """Store the cursor instance used for the connection."""
         self.cursor_obj = cursor
+        self.commits: list[int] = []
+        self.depth = 0
 
     def __enter__(self) -> "RecordingConnection":
         """Return ``self`` for context manager usage."""
@@ -259,6 +362,29 @@ class RecordingConnection:
         """Return the recording cursor."""
         return self.cursor_obj
 
+    def pipeline(self) -> nullcontext:
+        """Stand in for psycopg pipeline mode."""
+        return nullcontext()
+
+    def commit(self) -> None:
+        """Record a commit as the number of rows sent so far."""
+        self.commits.append(len(self.cursor_obj.rows))
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Nest like psycopg: the outermost block commits, inner ones are savepoints.
+
+        Failing batches are simply not recorded, so a savepoint has nothing
+        to roll back.
+        """
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+        if not self.depth:
+            self.commit()
+
 
 __all__ = [
     "FakeDBConnection",
@@ -269,5 +395,6 @@ __all__ = [
     "ScriptCursor",
     "ScriptConnection",
     "RecordingCursor",
+    "RecordingCopy",
     "RecordingConnection",
 ]
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import gzip
 import json
 import runpy
 import sys
 from datetime import date
 from pathlib import Path
 import types
+from uuid import uuid4
+
+import psycopg
 import pytest
 
 from tests._app_import import import_app_module
@@ -72,6 +76,39 @@ def test_iter_records_read_jsonl(tmp_path):
 
     rows = list(load_data.iter_records(path))
     assert rows == payload
+
+
+@pytest.mark.db
+def test_iter_records_reads_gzip_jsonl_across_members(tmp_path):
+    '''Gzipped JSONL is decompressed on the fly, including members appended later.'''
+    path = tmp_path / "records.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"id": 1}) + "\n")
+    with gzip.open(path, "at", encoding="utf-8") as handle:
+        handle.write(json.dumps({"id": 2}) + "\n")
+
+    assert list(load_data.iter_records(path)) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.db
+def test_iter_records_reads_gzip_json_array(tmp_path):
+    '''A gzipped JSON array decodes the same as a plain one.'''
+    path = tmp_path / "records.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(" " + json.dumps([{"id": 1}]))
+
+    assert list(load_data.iter_records(path)) == [{"id": 1}]
+
+
+@pytest.mark.db
+def test_iter_records_zst_without_zstandard(monkeypatch, tmp_path):
+    '''.zst sources name the missing package instead of failing to decode.'''
+    path = tmp_path / "records.jsonl.zst"
+    path.write_bytes(b"")
+    monkeypatch.setattr(load_data, "zstandard", None)
+
+    with pytest.raises(ImportError, match="zstandard"):
+        list(load_data.iter_records(path))
 @pytest.mark.db
 def test_main_inserts_records_respects_limit(monkeypatch):
     '''main should insert records into the DB and respect the limit parameter.'''
@@ -129,6 +166,21 @@ def test_main_inserts_records_respects_limit(monkeypatch):
     assert captured[-1] == "Inserted rows: 1"
 
 
+@pytest.mark.db
+def test_insert_records_batches_executemany(monkeypatch):
+    '''insert_records should build payloads lazily and send them in fixed-size batches.'''
+    cursor = RecordingCursor()
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+
+    records = ({"url": f"https://example.com/{i}", "GPA": "3.5"} for i in range(5))
+    sent = load_data.insert_records(records, batch_size=2)
+
+    assert sent == 5
+    assert cursor.batches == [2, 2, 1]
+    assert [row["url"] for row in cursor.rows] == [f"https://example.com/{i}" for i in range(5)]
+    assert cursor.rows[0]["gpa"] == pytest.approx(3.5)
+
+
 @pytest.mark.db
 def test_load_data_script_usage(monkeypatch, capsys):
     '''Running load_data.py without arguments should print usage and exit.'''
@@ -183,3 +235,627 @@ def test_load_data_script_invokes_main(monkeypatch, tmp_path):
         runpy.run_path(Path("src/load_data.py"), run_name="__main__")
     assert exc_info.value.code == 0
     assert cursor.rows and cursor.rows[0]["url"] == "https://example.com/1"
+
+
+def _write_jsonl(path: Path, urls: list[str], mode: str = "w") -> None:
+    '''Write one minimal applicant record per URL as JSON Lines.'''
+    with path.open(mode, encoding="utf-8") as handle:
+        for url in urls:
+            handle.write(json.dumps({"url": url, "GPA": "3.5"}) + "\n")
+
+
+@pytest.fixture(name="watermarked")
+def watermarked_fixture(monkeypatch, tmp_path):
+    '''A JSONL source, its watermark path and a recording cursor wired into get_conn.'''
+    cursor = RecordingCursor()
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+    source = tmp_path / "applicants.jsonl"
+    _write_jsonl(source, ["u1", "u2"])
+    return source, tmp_path / "applicants.watermark.json", cursor
+
+
+@pytest.mark.db
+def test_main_with_watermark_loads_only_appended_lines(watermarked, capsys):
+    '''A second run reads nothing, and a run after an append reads only the new lines.'''
+    source, mark, cursor = watermarked
+
+    assert load_data.main(source, watermark_path=mark) == 2
+    state = load_data.read_watermark(mark)
+    assert state["offset"] == source.stat().st_size
+
+    assert load_data.main(source, watermark_path=mark) == 0
+    _write_jsonl(source, ["u3"], mode="a")
+    assert load_data.main(source, watermark_path=mark) == 1
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3"]
+    out = capsys.readouterr().out
+    assert f"Watermark: read bytes {state['offset']}-{source.stat().st_size}" in out
+    assert "reloaded" not in out
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("rewrite", ["truncate", "edit", "replace"])
+def test_main_with_watermark_reloads_rewritten_file(watermarked, capsys, rewrite):
+    '''Truncation, an edited prefix or a new file at the path trigger a full reload.'''
+    source, mark, cursor = watermarked
+    load_data.main(source, watermark_path=mark)
+
+    if rewrite == "truncate":
+        _write_jsonl(source, ["u9"])
+    elif rewrite == "edit":
+        text = source.read_text(encoding="utf-8").replace("u1", "u7")
+        source.write_text(text, encoding="utf-8")
+    else:
+        other = source.with_name("fresh.jsonl")
+        _write_jsonl(other, ["u1", "u2"])
+        other.replace(source)
+    reread = load_data.main(source, watermark_path=mark)
+
+    assert reread == (1 if rewrite == "truncate" else 2)
+    assert "truncated or rewritten; reloaded" in capsys.readouterr().out
+    assert load_data.read_watermark(mark)["offset"] == source.stat().st_size
+    assert len(cursor.rows) == 2 + reread
+
+
+@pytest.mark.db
+def test_watermark_digest_covers_both_ends_of_large_prefix(watermarked, monkeypatch):
+    '''Past two windows only the head and tail are hashed, and edits there are still caught.'''
+    source, mark, cursor = watermarked
+    monkeypatch.setattr(load_data, "WATERMARK_WINDOW", 16)
+    load_data.main(source, watermark_path=mark)
+
+    text = source.read_text(encoding="utf-8")
+    source.write_text(text[:-3] + "X\"}\n", encoding="utf-8")
+    load_data.main(source, watermark_path=mark)
+
+    assert len(cursor.rows) == 4
+
+
+@pytest.mark.db
+def test_jsonl_tail_leaves_half_written_line(watermarked):
+    '''An unterminated last line is consumed only once it parses as a full record.'''
+    source, mark, cursor = watermarked
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write('{"url": "u3", "GP')
+    load_data.main(source, watermark_path=mark)
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2"]
+
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write('A": "3.1"}')
+    load_data.main(source, watermark_path=mark)
+    _write_jsonl(source, ["u4"], mode="a")
+    source.write_text(source.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    load_data.main(source, watermark_path=mark)
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3", "u4"]
+
+
+@pytest.mark.db
+def test_main_with_watermark_stops_at_limit(watermarked):
+    '''With a limit the watermark ends after the last inserted line, so the rest loads next.'''
+    source, mark, cursor = watermarked
+
+    load_data.main(source, limit=1, watermark_path=mark)
+    load_data.main(source, watermark_path=mark)
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2"]
+
+
+@pytest.mark.db
+def test_main_with_watermark_reads_json_array_whole(watermarked):
+    '''JSON array sources are always read in full and never get a watermark.'''
+    source, mark, cursor = watermarked
+    source.write_text(json.dumps([{"url": "a1"}]), encoding="utf-8")
+
+    load_data.main(source, watermark_path=mark)
+    load_data.main(source, watermark_path=mark)
+
+    assert [row["url"] for row in cursor.rows] == ["a1", "a1"]
+    assert not mark.exists()
+
+
+@pytest.mark.db
+def test_main_with_watermark_reads_compressed_source_whole(watermarked, tmp_path):
+    '''Compressed JSONL has no resumable byte offsets, so it is loaded whole each time.'''
+    _, mark, cursor = watermarked
+    source = tmp_path / "records.jsonl.gz"
+    with gzip.open(source, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"url": "z1"}) + "\n")
+
+    load_data.main(source, watermark_path=mark)
+    load_data.main(source, watermark_path=mark, batching=load_data.BatchPolicy(workers=2))
+
+    assert [row["url"] for row in cursor.rows] == ["z1", "z1"]
+    assert not mark.exists()
+
+
+@pytest.mark.db
+def test_read_watermark_ignores_missing_or_corrupt_files(tmp_path):
+    '''Unreadable watermark files mean "start from the beginning".'''
+    mark = tmp_path / "mark.json"
+    assert load_data.read_watermark(mark) is None
+    mark.write_text("{not json", encoding="utf-8")
+    assert load_data.read_watermark(mark) is None
+    mark.write_text("[1, 2]", encoding="utf-8")
+    assert load_data.read_watermark(mark) is None
+
+
+@pytest.mark.db
+def test_cli_uses_default_watermark_and_full_resets_it(watermarked):
+    '''The CLI keeps <source>.watermark.json next to the source; --full starts over.'''
+    source, _, cursor = watermarked
+    cli = getattr(load_data, "_cli")
+
+    assert cli([str(source)]) == 0
+    assert Path(f"{source}.watermark.json").exists()
+    assert cli([str(source)]) == 0
+    assert cli([str(source), "--full"]) == 0
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u1", "u2"]
+
+
+@pytest.mark.db
+def test_cli_reports_bad_limit_and_missing_file(monkeypatch, tmp_path, capsys):
+    '''Argument and file errors print a message and return a failure status.'''
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(RecordingCursor()))
+    cli = getattr(load_data, "_cli")
+
+    assert cli([str(tmp_path / "x.jsonl"), "many"]) == 1
+    assert cli([str(tmp_path / "missing.jsonl"), "--watermark", str(tmp_path / "m.json")]) == 1
+
+    out = capsys.readouterr().out
+    assert "Error: limit must be an integer" in out
+    assert "missing.jsonl" in out
+
+
+@pytest.mark.db
+def test_bulk_insert_copies_into_staging_and_merges(monkeypatch):
+    '''bulk_insert should COPY normalised rows, merge once and count the skipped duplicates.'''
+    cursor = RecordingCursor()
+    cursor.rows.append({"url": "u1"})
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+
+    records = [{"url": "u1"}, {"url": "u2", "GPA": "3.25", "date_added": "2025-01-02"},
+               {"url": "u2"}, {"url": "u3"}]
+    inserted, skipped = load_data.bulk_insert(iter(records))
+
+    assert (inserted, skipped) == (2, 2)
+    assert cursor.statements == ["CREATE", "TRUNCATE", "INSERT", "TRUNCATE"]
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3"]
+    assert cursor.rows[1]["gpa"] == pytest.approx(3.25)
+    assert cursor.rows[1]["date_added"] == date(2025, 1, 2)
+    assert set(cursor.rows[2]) == set(load_data.COLUMNS)
+    assert not cursor.staged
+
+
+@pytest.mark.db
+def test_cli_bulk_reports_inserted_and_skipped(watermarked, capsys):
+    '''--bulk loads through the staging table and prints both counts.'''
+    source, mark, cursor = watermarked
+    _write_jsonl(source, ["u1", "u3"], mode="a")
+    cli = getattr(load_data, "_cli")
+
+    assert cli([str(source), "3", "--bulk", "--watermark", str(mark)]) == 0
+
+    out = capsys.readouterr().out
+    assert "Skipped rows (already loaded): 1" in out
+    assert "Inserted rows: 2" in out
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2"]
+    assert load_data.read_watermark(mark)["offset"] < source.stat().st_size
+
+
+@pytest.mark.db
+def test_insert_records_commits_every_n_rows(monkeypatch):
+    '''commit_every should commit after whole batches and report each commit.'''
+    cursor = RecordingCursor()
+    conn = RecordingConnection(cursor)
+    monkeypatch.setattr(load_data, "get_conn", lambda: conn)
+    committed: list[int] = []
+    timings: list[float] = []
+
+    records = ({"url": f"u{i}"} for i in range(7))
+    sent = load_data.insert_records(records, batch_size=2, commit_every=3,
+                                    on_commit=lambda: committed.append(len(cursor.rows)),
+                                    timings=timings)
+
+    assert sent == 7
+    assert cursor.batches == [2, 2, 2, 1]
+    assert conn.commits == committed == [4, 7]
+    assert len(timings) == 4 and all(t >= 0 for t in timings)
+
+
+@pytest.mark.db
+def test_main_keeps_committed_progress_after_a_crash(watermarked, monkeypatch):
+    '''The watermark follows each commit, so a failed batch only replays its own rows.'''
+    source, mark, cursor = watermarked
+    _write_jsonl(source, ["u3", "u4"], mode="a")
+    record_batch = cursor.executemany
+
+    def flaky_executemany(sql, params_seq):
+        if cursor.batches:
+            raise RuntimeError("connection lost")
+        record_batch(sql, params_seq)
+
+    monkeypatch.setattr(cursor, "executemany", flaky_executemany)
+    with pytest.raises(RuntimeError):
+        load_data.main(source, watermark_path=mark, batching=load_data.BatchPolicy(2, 2))
+
+    first_two = len(source.read_text(encoding="utf-8").splitlines(keepends=True)[0]) * 2
+    assert load_data.read_watermark(mark)["offset"] == first_two
+
+    monkeypatch.setattr(cursor, "executemany", record_batch)
+    assert load_data.main(source, watermark_path=mark) == 2
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3", "u4"]
+
+
+@pytest.mark.db
+def test_cli_reports_batch_timings_and_throughput(watermarked, capsys):
+    '''The batch and rows/s lines come before the Inserted rows line the app parses.'''
+    source, mark, cursor = watermarked
+    cli = getattr(load_data, "_cli")
+
+    assert cli([str(source), "--batch-size", "1", "--commit-every", "0",
+                "--watermark", str(mark)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert cursor.batches == [1, 1]
+    assert lines[-3].startswith("Batches: 2, avg ")
+    assert lines[-2].startswith("Throughput: ") and "rows/s" in lines[-2]
+    assert lines[-1] == "Inserted rows: 2"
+
+
+@pytest.mark.db
+def test_line_ranges_end_on_newlines_and_cover_the_tail(tmp_path):
+    '''Byte ranges should split only after a newline and together cover [start, size).'''
+    path = tmp_path / "rows.jsonl"
+    _write_jsonl(path, [f"u{i}" for i in range(10)])
+    size = path.stat().st_size
+    line_ranges = getattr(load_data, "_line_ranges")
+
+    with path.open("rb") as handle:
+        spans = list(line_ranges(handle, 0, size, 50))
+        text = path.read_bytes()
+
+    assert spans[0][0] == 0 and spans[-1][1] == size
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(spans, spans[1:]))
+    assert all(text[end - 1:end] == b"\n" for _, end in spans)
+    assert len(spans) > 1
+
+
+@pytest.mark.db
+def test_normalize_range_builds_payloads_for_its_lines(tmp_path):
+    '''A worker shard should normalise exactly the lines inside its range.'''
+    path = tmp_path / "rows.jsonl"
+    _write_jsonl(path, ["u1", "u2", "u3"])
+    line = len(path.read_text(encoding="utf-8").splitlines(keepends=True)[0])
+    normalize_range = getattr(load_data, "_normalize_range")
+
+    payloads, consumed, date_stats = normalize_range(path, line, 2 * line)
+
+    assert [p["url"] for p in payloads] == ["u2"]
+    assert set(date_stats) == {"hits", "misses", "cache_hits"}
+    assert payloads[0]["gpa"] == pytest.approx(3.5)
+    assert consumed == 2 * line
+
+
+@pytest.mark.db
+def test_parallel_payloads_match_sequential_order(tmp_path):
+    '''Process-pool normalisation should yield the same payloads in file order.'''
+    path = tmp_path / "rows.jsonl"
+    _write_jsonl(path, [f"u{i}" for i in range(40)])
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("\n" + json.dumps({"url": "last"}))
+
+    sequential = list(load_data.JsonlTail(path, None).payloads())
+    tail = load_data.JsonlTail(path, None)
+    parallel = list(tail.payloads(workers=2, shard_bytes=64))
+
+    assert parallel == sequential
+    assert [p["url"] for p in parallel][-2:] == ["u39", "last"]
+    assert tail.offset == path.stat().st_size
+
+
+@pytest.mark.db
+def test_main_with_workers_resumes_from_watermark(watermarked):
+    '''Parallel loads honour the watermark and read JSON arrays whole.'''
+    source, mark, cursor = watermarked
+    policy = load_data.BatchPolicy(workers=2)
+
+    assert load_data.main(source, watermark_path=mark, batching=policy) == 2
+    _write_jsonl(source, ["u3"], mode="a")
+    assert load_data.main(source, watermark_path=mark, batching=policy) == 1
+    assert load_data.read_watermark(mark)["offset"] == source.stat().st_size
+
+    array = source.with_name("array.json")
+    array.write_text(json.dumps([{"url": "a1"}]), encoding="utf-8")
+    assert load_data.main(array, batching=policy) == 1
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3", "a1"]
+
+
+@pytest.mark.db
+def test_select_decoders_falls_back_to_stdlib(monkeypatch):
+    '''Without orjson or msgspec the loader decodes with the json module.'''
+    monkeypatch.setattr(load_data, "orjson", None)
+    monkeypatch.setattr(load_data, "msgspec", None)
+
+    name, loads, decode_applicant, errors = getattr(load_data, "_select_decoders")()
+
+    assert name == "json"
+    assert loads is json.loads and decode_applicant is json.loads
+    assert errors == (ValueError,)
+
+
+@pytest.mark.db
+def test_decode_applicant_keeps_payload_fields():
+    '''Whichever decoder is active, build_payload sees the same values.'''
+    raw = json.dumps({"url": "u1", "GPA": "3.70", "GRE V": 160, "US/International": "American",
+                      "extra": "ignored by typed decoders"})
+
+    payload = load_data.build_payload(load_data.decode_applicant(raw.encode()))
+
+    assert payload == load_data.build_payload(json.loads(raw))
+
+
+@pytest.mark.db
+def test_date_parser_learns_dominant_format_and_caches():
+    '''The most successful format moves to the front and repeats come from the cache.'''
+    parser = load_data.DateParser(cache_size=2)
+
+    assert parser("Sep 14, 2025") == date(2025, 9, 14)
+    assert parser.formats[0] == "%b %d, %Y"
+    assert parser.misses["%Y-%m-%d"] == 1 and parser.misses["%m/%d/%Y"] == 1
+
+    assert parser("Oct 01, 2025") == date(2025, 10, 1)
+    assert parser.misses["%Y-%m-%d"] == 1  # dominant format tried first now
+    assert parser("Oct 01, 2025") == date(2025, 10, 1)
+    assert parser("nonsense") is None and parser("nonsense") is None
+    assert parser.cache_hits == 2
+    assert "Sep 14, 2025" not in getattr(parser, "_cache")  # evicted, cache holds 2
+
+    parser.merge({"hits": {"%Y-%m-%d": 3}, "misses": {"%b %d, %Y": 1}, "cache_hits": 5})
+    assert parser.hits["%Y-%m-%d"] == 3 and parser.cache_hits == 7
+    assert parser.summary().startswith("Dates: 7 cached; format hits/misses: %Y-%m-%d 3/")
+
+    parser.reset()
+    assert parser.formats == list(load_data.DATE_FORMATS)
+    assert parser.summary() == "Dates: 0 cached; format hits/misses: none"
+
+
+@pytest.mark.db
+def test_main_reports_date_parser_stats(watermarked, capsys):
+    '''main starts a fresh parser per file and prints its counters before the row count.'''
+    source, _, _ = watermarked
+    source.write_text("".join(
+        json.dumps({"url": f"u{i}", "date_added": "September 14, 2025"}) + "\n" for i in range(3)
+    ), encoding="utf-8")
+
+    load_data.main(source, batching=load_data.BatchPolicy(workers=2))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-4] == "Dates: 2 cached; format hits/misses: %Y-%m-%d 0/1, %m/%d/%Y 0/1, " \
+        "%b %d, %Y 0/1, %B %d, %Y 1/0"
+
+
+@pytest.mark.db
+def test_check_ranges_mirrors_schema_constraints():
+    '''check_ranges should name the violated CHECK constraint, treating None as allowed.'''
+    assert load_data.check_ranges({"gpa": 3.9, "gre": 170.0, "gre_v": None, "gre_aw": 0.0}) is None
+    assert load_data.check_ranges({"gpa": 4.5}) == "gpa_range"
+    assert load_data.check_ranges({"gre": 171.0}) == "gre_q_range"
+    assert load_data.check_ranges({"gre_v": 100.0}) == "gre_v_range"
+    assert load_data.check_ranges({"gre_aw": float("nan")}) == "gre_aw_range"
+
+
+@pytest.mark.db
+def test_insert_records_prevalidates_without_a_round_trip(monkeypatch):
+    '''Out-of-range rows are dropped in Python, so the batch reaches the DB once.'''
+    cursor = RecordingCursor()
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+
+    records = [{"url": "u1", "GPA": "3.9"}, {"url": "u2", "GPA": "39"}, {"url": "u3"}]
+    assert load_data.insert_records(records, batch_size=10) == 2
+
+    assert cursor.batches == [2]
+    assert [row["url"] for row in cursor.rows] == ["u1", "u3"]
+
+
+@pytest.mark.db
+def test_main_bisects_database_rejects_into_dead_letter(watermarked, monkeypatch, capsys):
+    '''Rows the database refuses go to the dead-letter file; the rest still commit.'''
+    source, mark, cursor = watermarked
+    _write_jsonl(source, ["u3", "bad4", "u5", "u6", "u7"], mode="a")
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"url": "u8", "GRE": "175"}) + "\n")
+    record_batch = cursor.executemany
+    attempts: list[int] = []
+
+    def strict_executemany(sql, params_seq):
+        attempts.append(len(params_seq))
+        if any(params["url"].startswith("bad") for params in params_seq):
+            raise psycopg.errors.NotNullViolation("null value violates not-null constraint")
+        record_batch(sql, params_seq)
+
+    monkeypatch.setattr(cursor, "executemany", strict_executemany)
+    rejects = source.with_name("rejects.jsonl")
+    policy = load_data.BatchPolicy(size=4, dead_letter=rejects)
+
+    assert load_data.main(source, watermark_path=mark, batching=policy) == 6
+
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3", "u5", "u6", "u7"]
+    assert attempts == [4, 2, 2, 1, 1, 3]
+    dead = [json.loads(line) for line in rejects.read_text(encoding="utf-8").splitlines()]
+    assert [d["row"]["url"] for d in dead] == ["bad4", "u8"]
+    assert "not-null" in dead[0]["error"]
+    assert dead[1]["error"] == "violates check constraint 'gre_q_range'"
+    assert "Rejected rows: 2 (written to" in capsys.readouterr().out
+    assert load_data.read_watermark(mark)["offset"] == source.stat().st_size
+
+
+@pytest.mark.db
+def test_insert_payloads_dead_letters_rows_postgres_refuses(monkeypatch, tmp_path):
+    '''Against the real database, a refused row is rolled back to its savepoint and dead-lettered.
+
+    The Python range screen is disabled so the ``gpa_range`` CHECK constraint
+    has to refuse the row inside the pipeline; the other rows must commit.
+    '''
+    monkeypatch.setattr(load_data, "check_ranges", lambda payload: None)
+    prefix = f"https://example.com/savepoint-{uuid4().hex}/"
+    records = [{"url": f"{prefix}{i}", "GPA": "9.9" if i == 2 else "3.5"} for i in range(5)]
+    rejects = load_data.DeadLetter(tmp_path / "rejects.jsonl")
+    policy = load_data.BatchPolicy(size=5, commit_every=None)
+
+    try:
+        sent = load_data.insert_payloads(map(load_data.build_payload, records), policy,
+                                         rejects=rejects)
+        with load_data.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT url FROM applicants WHERE url LIKE %s ORDER BY url",
+                        (prefix + "%",))
+            stored = [row["url"] for row in cur.fetchall()]
+    finally:
+        with load_data.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url LIKE %s", (prefix + "%",))
+
+    assert sent == 4
+    assert stored == [f"{prefix}{i}" for i in (0, 1, 3, 4)]
+    dead = [json.loads(line) for line in rejects.path.read_text(encoding="utf-8").splitlines()]
+    assert [d["row"]["url"] for d in dead] == [f"{prefix}2"]
+    assert "gpa_range" in dead[0]["error"]
+
+
+@pytest.mark.db
+def test_bulk_mode_keeps_out_of_range_rows_out_of_staging(watermarked):
+    '''--bulk screens rows before COPY; rejects are counted even without a file.'''
+    _, _, cursor = watermarked
+    rejects = load_data.DeadLetter()
+
+    records = [{"url": "u1", "GPA": "9.0"}, {"url": "u2", "GPA": "3.0"}]
+    inserted, skipped = load_data.copy_payloads(map(load_data.build_payload, records), rejects)
+
+    assert (inserted, skipped) == (1, 0)
+    assert rejects.count == 1 and rejects.path is None
+    assert [row["url"] for row in cursor.rows] == ["u2"]
+
+
+@pytest.mark.db
+def test_content_hash_tracks_applicant_fields_only():
+    '''The hash changes with any applicant field and ignores keys outside the schema.'''
+    base = load_data.build_payload({"url": "u1", "status": "Interview", "date_added": "2025-01-02"})
+    same = load_data.build_payload({"url": "u1", "status": "Interview", "date_added": "2025-01-02",
+                                    "extra": "not stored"})
+    moved = load_data.build_payload({"url": "u1", "status": "Accepted", "date_added": "2025-01-02"})
+
+    assert base["content_hash"] == same["content_hash"]
+    assert base["content_hash"] != moved["content_hash"]
+    assert len(base["content_hash"]) == 32
+
+
+@pytest.mark.db
+def test_cli_upsert_reports_inserted_updated_unchanged(watermarked, capsys):
+    '''--upsert inserts new URLs, rewrites changed rows and leaves identical rows alone.'''
+    source, _, cursor = watermarked
+    cli = getattr(load_data, "_cli")
+    assert cli([str(source), "--upsert", "--full"]) == 0
+
+    source.write_text("".join(json.dumps(record) + "\n" for record in [
+        {"url": "u1", "GPA": "3.5"},
+        {"url": "u2", "GPA": "3.5", "status": "Accepted on 01/02/2025"},
+        {"url": "u3", "GPA": "3.1"},
+    ]), encoding="utf-8")
+    assert cli([str(source), "--upsert"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert "Upserted rows: 2 inserted, 0 updated, 0 unchanged" in lines
+    assert "Upserted rows: 1 inserted, 1 updated, 1 unchanged" in lines
+    assert lines[-1] == "Inserted rows: 1"
+    assert [row["url"] for row in cursor.rows] == ["u1", "u2", "u3"]
+    assert cursor.rows[1]["status"] == "Accepted on 01/02/2025"
+
+
+@pytest.mark.db
+def test_upsert_backfilling_a_missing_hash_counts_as_unchanged(monkeypatch):
+    '''Rows stored before content hashes existed get one filled in, not an "updated".'''
+    cursor = RecordingCursor()
+    legacy = load_data.build_payload({"url": "u1", "GPA": "3.5"})
+    cursor.rows.append({**legacy, "content_hash": None})
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+    stats = load_data.LoadStats()
+
+    load_data.insert_payloads([legacy], load_data.BatchPolicy(upsert=True), stats=stats)
+
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 0, 1)
+    assert cursor.rows[0]["content_hash"] == legacy["content_hash"]
+
+
+@pytest.mark.db
+def test_upsert_hashless_row_with_changed_columns_counts_as_updated(monkeypatch):
+    '''A row without a stored hash whose columns differ is an update, not a backfill.'''
+    cursor = RecordingCursor()
+    legacy = load_data.build_payload({"url": "u1", "GPA": "3.5"})
+    cursor.rows.append({**legacy, "content_hash": None})
+    changed = load_data.build_payload({"url": "u1", "GPA": "3.9"})
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+    stats = load_data.LoadStats()
+
+    load_data.insert_payloads([changed], load_data.BatchPolicy(upsert=True), stats=stats)
+
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 1, 0)
+    assert cursor.rows[0]["gpa"] == 3.9
+
+
+@pytest.mark.db
+def test_upsert_backfill_counts_postgres():
+    '''Against the real database, hashless rows are unchanged only if their columns match.'''
+    prefix = f"https://example.com/backfill-{uuid4().hex}/"
+    same = load_data.build_payload({"url": f"{prefix}same", "GPA": "3.5"})
+    changed = load_data.build_payload({"url": f"{prefix}changed", "GPA": "3.5"})
+    legacy = [{**same, "content_hash": None}, {**changed, "content_hash": None, "gpa": 3.1}]
+    stats = load_data.LoadStats()
+
+    try:
+        with load_data.get_conn() as conn, conn.cursor() as cur:
+            cur.executemany(load_data.INSERT_SQL, legacy)
+        load_data.insert_payloads([same, changed], load_data.BatchPolicy(upsert=True),
+                                  stats=stats)
+        with load_data.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT gpa, content_hash FROM applicants WHERE url = %s",
+                        (changed["url"],))
+            stored = cur.fetchone()
+    finally:
+        with load_data.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM applicants WHERE url LIKE %s", (prefix + "%",))
+
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 1, 1)
+    assert stored["gpa"] == pytest.approx(3.5)
+    assert stored["content_hash"] == changed["content_hash"]
+
+
+@pytest.mark.db
+def test_upsert_bisection_counts_only_committed_rows(monkeypatch):
+    '''A refused row in an upsert batch is dead-lettered; the rest are still tallied.'''
+    cursor = RecordingCursor()
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+    record_batch = cursor.executemany
+
+    def strict_executemany(sql, params_seq, *, returning=False):
+        if any(params["url"] is None for params in params_seq):
+            raise psycopg.errors.NotNullViolation("url is required")
+        record_batch(sql, params_seq, returning=returning)
+
+    monkeypatch.setattr(cursor, "executemany", strict_executemany)
+    stats = load_data.LoadStats()
+    rejects = load_data.DeadLetter()
+    payloads = map(load_data.build_payload, [{"url": "u1"}, {"url": None}, {"url": "u2"}])
+
+    sent = load_data.insert_payloads(payloads, load_data.BatchPolicy(size=3, upsert=True),
+                                     stats=stats, rejects=rejects)
+
+    assert sent == 2 and rejects.count == 1
+    assert (stats.inserted, stats.updated, stats.unchanged) == (2, 0, 0)
+
+
+@pytest.mark.db
+def test_cli_rejects_bulk_with_upsert(tmp_path):
+    '''--bulk and --upsert are alternative write modes.'''
+    with pytest.raises(SystemExit):
+        getattr(load_data, "_cli")([str(tmp_path / "x.jsonl"), "--bulk", "--upsert"])
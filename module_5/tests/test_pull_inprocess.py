@@ -0,0 +1,220 @@
+"""Tests for the in-process scrape-to-database pull (``PULL_MODE=inprocess``)."""
+
+from __future__ import annotations
+
+import json
+import sys
+import types
+from datetime import date
+from typing import Any
+
+import psycopg
+import pytest
+
+from tests._app_import import import_app_module
+from tests.fakes import RecordingConnection, RecordingCursor
+
+APP_MODULE = import_app_module("app")
+load_data = import_app_module("load_data")
+
+JSON_HEADERS = {"Accept": "application/json"}
+
+RECORDS = [
+    {"program": "CS, Test U", "url": "https://example.com/result/2", "date_added": "2025-09-02",
+     "GPA": "3.80", "GRE": 165.0},
+    {"program": "Math, Test U", "url": "https://example.com/result/1", "date_added": "2025-09-01",
+     "GPA": None, "GRE": None},
+]
+
+
+def _fake_scraper(calls: dict[str, Any]) -> types.SimpleNamespace:
+    """Build a scraper module double exposing the library API the app uses."""
+
+    known = types.SimpleNamespace(save=lambda path: calls.setdefault("known_saved", path))
+    calls["known"] = known
+
+    def iter_new_records(since: date, *, stats: dict[str, Any], **options: Any):
+        calls["since"], calls["options"] = since, options
+        try:
+            for record in calls.get("records", RECORDS):
+                stats["appended"] = stats.get("appended", 0) + 1
+                yield record
+        finally:
+            calls["closed"] = True
+        stats["max_date"] = date(2025, 9, 2)
+
+    return types.SimpleNamespace(
+        DEFAULT_SLEEP=0.5,
+        CACHE_DIR_DEFAULT="cache-dir",
+        KNOWN_INDEX_DEFAULT="known.bin",
+        HttpCache=lambda root: ("cache", root),
+        load_known_ids=lambda path, jsonl_paths: known,
+        resolve_since=lambda cli_since: date(2025, 9, 1),
+        iter_new_records=iter_new_records,
+        save_last_run=lambda max_date: calls.setdefault("last_run", max_date),
+    )
+
+
+@pytest.fixture(name="inprocess")
+def inprocess_fixture(monkeypatch, tmp_path):
+    """Route /pull-data through the in-process path with fake scraper and DB."""
+
+    calls: dict[str, Any] = {}
+    cursor = RecordingCursor()
+    monkeypatch.setenv("PULL_MODE", "inprocess")
+    monkeypatch.setattr(APP_MODULE, "is_running", lambda: False)
+    monkeypatch.setattr(APP_MODULE, "set_lock", lambda pid: None)
+    monkeypatch.setattr(APP_MODULE, "PULL_OK_FILE", tmp_path / "ok.txt")
+    monkeypatch.setattr(APP_MODULE, "JSONL_PATH", tmp_path / "tee.jsonl")
+    monkeypatch.setattr(APP_MODULE, "_load_scraper", lambda: _fake_scraper(calls))
+    monkeypatch.setattr(load_data, "get_conn", lambda: RecordingConnection(cursor))
+    return calls, cursor, tmp_path
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_streams_records_into_db(client, inprocess):
+    """Records from iter_new_records go straight to the batched writer."""
+    calls, cursor, tmp_path = inprocess
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok", "scraped": 2, "inserted": 2, "rejected": 0}
+    assert [row["url"] for row in cursor.rows] == [r["url"] for r in RECORDS]
+    assert cursor.batches == [2]
+    assert cursor.rows[0]["gpa"] == pytest.approx(3.8)
+    assert calls["since"] == date(2025, 9, 1)
+    assert calls["options"]["rps"] == pytest.approx(2.0)
+    assert calls["known_saved"] == "known.bin"
+    assert calls["last_run"] == date(2025, 9, 2)
+    assert (tmp_path / "ok.txt").exists()
+    assert not (tmp_path / "tee.jsonl").exists()
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_commits_each_batch_during_the_crawl(client, inprocess, monkeypatch):
+    """Batches are committed as they fill, not in one transaction spanning the crawl."""
+    calls, cursor, _ = inprocess
+    conn = RecordingConnection(cursor)
+    monkeypatch.setattr(load_data, "get_conn", lambda: conn)
+    monkeypatch.setattr(APP_MODULE, "PULL_BATCH_SIZE", 1)
+    commits_seen: list[list[int]] = []
+
+    def crawl():
+        for record in RECORDS:
+            commits_seen.append(list(conn.commits))
+            yield record
+
+    calls["records"] = crawl()
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.get_json()["inserted"] == 2
+    assert commits_seen == [[], [1]]
+    assert conn.commits == [1, 2]
+    assert cursor.batches == [1, 1]
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_tees_jsonl_when_enabled(client, inprocess, monkeypatch):
+    """PULL_JSONL_TEE=1 keeps an audit copy of every pulled record."""
+    _, cursor, tmp_path = inprocess
+    monkeypatch.setenv("PULL_JSONL_TEE", "1")
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.status_code == 200
+    lines = (tmp_path / "tee.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+    assert len(cursor.rows) == 2
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_dead_letters_rejected_rows(client, inprocess, monkeypatch):
+    """Rows failing the range checks land next to the JSONL file and are reported."""
+    calls, cursor, tmp_path = inprocess
+    calls["records"] = RECORDS + [{"url": "https://example.com/result/3", "GPA": "9.9"}]
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.get_json() == {"status": "ok", "scraped": 3, "inserted": 2, "rejected": 1}
+    assert len(cursor.rows) == 2
+    dead = (tmp_path / "tee.jsonl.rejects.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["row"]["url"] for line in dead] == ["https://example.com/result/3"]
+
+    flashes: list[str] = []
+    monkeypatch.setattr(APP_MODULE, "flash", lambda message, category: flashes.append(message))
+    assert client.post("/pull-data").status_code == 302
+    assert any("rejected rows: 1 (written to" in message for message in flashes)
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_closes_the_scraper_on_errors(client, inprocess, monkeypatch):
+    """A failed batch closes the record generator instead of leaving it suspended."""
+    calls, cursor, _ = inprocess
+    calls["records"] = ({"url": f"https://example.com/result/{n}"} for n in range(10_000))
+
+    def lose_connection(*_args, **_kwargs):
+        raise psycopg.OperationalError("server closed the connection")
+
+    monkeypatch.setattr(cursor, "executemany", lose_connection)
+    report_failure = getattr(APP_MODULE, "_handle_generic_failure")
+
+    def closed_before_reporting(json_response, exc):
+        calls["closed_when_reported"] = calls.get("closed", False)
+        return report_failure(json_response, exc)
+
+    monkeypatch.setattr(APP_MODULE, "_handle_generic_failure", closed_before_reporting)
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.status_code == 500
+    assert calls["closed_when_reported"] is True
+
+
+@pytest.mark.buttons
+def test_inprocess_pull_reports_database_errors(client, inprocess, monkeypatch):
+    """Database failures during an in-process pull surface as error responses."""
+    _, _, tmp_path = inprocess
+
+    def refuse():
+        raise psycopg.OperationalError("connection refused")
+
+    monkeypatch.setattr(load_data, "get_conn", refuse)
+
+    response = client.post("/pull-data", headers=JSON_HEADERS)
+
+    assert response.status_code == 500
+    assert response.get_json() == {
+        "status": "error",
+        "message": "Pull failed: connection refused",
+    }
+    assert not (tmp_path / "ok.txt").exists()
+
+
+@pytest.mark.buttons
+def test_load_scraper_imports_module2_scrape(monkeypatch, tmp_path):
+    """`_load_scraper` puts module_2 on sys.path and imports scrape.py from it."""
+    (tmp_path / "scrape.py").write_text("MARKER = 'module_2 scraper'\n", encoding="utf-8")
+    monkeypatch.setattr(APP_MODULE, "MODULE2_ROOT", tmp_path)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, "scrape", raising=False)
+
+    scraper = getattr(APP_MODULE, "_load_scraper")()
+
+    assert scraper.MARKER == "module_2 scraper"
+    assert sys.path[0] == str(tmp_path)
+    monkeypatch.delitem(sys.modules, "scrape")
+
+
+@pytest.mark.buttons
+def test_scrape_options_mirror_cli_defaults():
+    """The in-process pull uses the scraper's default rate, cache and known index."""
+    calls: dict[str, Any] = {}
+    scraper = _fake_scraper(calls)
+
+    options = getattr(APP_MODULE, "_scrape_options")(scraper)
+
+    assert options["rps"] == pytest.approx(2.0)
+    assert options["cache"] == ("cache", "cache-dir")
+    assert options["known"] is calls["known"]
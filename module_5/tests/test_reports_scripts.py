@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 from typing import Callable
 import types
+from uuid import uuid4
 import pytest
 
 from tests._app_import import import_app_module
@@ -144,6 +145,11 @@ def test_create_schema_script_entry(monkeypatch, capsys):
         def cursor(self) -> Cursor:
             '''Return a dummy cursor.'''
             return Cursor()
+        def add_notice_handler(self, handler) -> None:
+            '''Deliver a migration notice straight away.'''
+            handler(types.SimpleNamespace(
+                message_primary='relation "applicants" already exists, skipping'))
+            handler(types.SimpleNamespace(message_primary="Created applicants_url_uniq"))
 
     def build_conn() -> Conn:
         return Conn()
@@ -154,9 +160,40 @@ def test_create_schema_script_entry(monkeypatch, capsys):
     runpy.run_path(Path("src/create_schema.py"), run_name="__main__")
     out = capsys.readouterr().out
     assert "Schema created/verified." in out
+    assert "Created applicants_url_uniq" in out
+    assert "already exists" not in out
     assert executed and "CREATE TABLE" in executed[0]
 
 
+def _migration_notices(create_schema, notices: list[str]) -> list[str]:
+    '''Keep the URL migration's notice; IF NOT EXISTS DDL also raises "skipping" notices.'''
+    return [n for n in notices if n.startswith(create_schema.MIGRATION_NOTICE)]
+
+
+@pytest.mark.db
+def test_create_schema_url_migration_runs_once_postgres():
+    '''Against the real database, the URL dedupe only runs while its index is missing.'''
+
+    create_schema = import_app_module("create_schema")
+    url = f"https://example.com/migration-{uuid4().hex}"
+    notices: list[str] = []
+    with db.get_conn() as conn, conn.cursor() as cur:
+        conn.add_notice_handler(lambda diag: notices.append(diag.message_primary))
+        with conn.transaction(force_rollback=True):
+            cur.execute("DROP INDEX applicants_url_uniq")
+            cur.execute("INSERT INTO applicants (program, url) VALUES ('old', %s), ('new', %s)",
+                        (url, url))
+            cur.execute(create_schema.DDL)
+            cur.execute("SELECT program FROM applicants WHERE url = %s", (url,))
+            kept = [row["program"] for row in cur.fetchall()]
+            migrated = _migration_notices(create_schema, notices)
+            cur.execute(create_schema.DDL)
+
+    assert kept == ["new"]
+    assert migrated == ["Created applicants_url_uniq; removed 1 duplicate URL rows"]
+    assert _migration_notices(create_schema, notices) == migrated
+
+
 @pytest.mark.db
 def test_date_added_report_main(monkeypatch, tmp_path):
     '''Test date_added_report.main with scripted DB responses.'''